@@ -0,0 +1,27 @@
+"""
+Cache statistics API.
+
+Exposes the counters of the in-process caches so their behaviour can be
+watched under load.
+"""
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.api.internal import require_stats_access
+from app.core.fragment_cache import fragment_cache
+from app.services.project_search import project_search
+
+router = APIRouter(prefix='/api/cache', tags=['cache'], dependencies=[Depends(require_stats_access)])
+
+
+@router.get('/fragments')
+async def fragment_cache_stats() -> Dict[str, int]:
+    """Hit, miss and eviction counters and current size of the fragment cache."""
+    return fragment_cache.stats()
+
+
+@router.get('/projects')
+async def project_search_stats() -> Dict[str, int]:
+    """Size of the project index and hit and miss counters of the search response cache."""
+    return project_search.stats()
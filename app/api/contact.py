@@ -0,0 +1,58 @@
+"""
+Contact form API.
+
+Accepts a message, screens it for spam and rate limits, then queues it for
+storage and delivery; the response never waits for the database or the mail
+server. Clients fetch a signed form token first and send it back with the
+message, so the minimum time to fill in the form applies here as well.
+Submissions caught by the honeypot or as too fast get the normal response so
+bots learn nothing.
+"""
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.api.internal import require_stats_access
+from app.models.contact import ContactSubmission
+from app.services.contact import QueueFullError, contact_service
+from app.services.rate_limit import client_ip, contact_form_timestamps, contact_guard
+
+router = APIRouter(prefix='/api/contact', tags=['contact'])
+
+
+@router.get('/form')
+async def contact_form_token() -> JSONResponse:
+    """A token marking when the form was shown, to be sent back as ``form_token``."""
+    return JSONResponse({'form_token': contact_form_timestamps.issue()}, headers={'Cache-Control': 'no-store'})
+
+
+@router.post('', status_code=202)
+async def submit_contact_message(submission: ContactSubmission, request: Request) -> JSONResponse:
+    """
+    Queue a contact message.
+
+    Answers 202 once accepted, 400 without a valid form token, 429 when rate limited and 503 while the
+    queue is full.
+    """
+    decision = await contact_guard.check(client_ip(request), honeypot=submission.website,
+                                         fill_seconds=contact_form_timestamps.fill_seconds(submission.form_token),
+                                         require_fill_time=True)
+    if decision.reason == 'no_form_token':
+        raise HTTPException(status_code=400, detail='Missing or expired form token, please reload the form')
+    if decision.outcome == 'throttled':
+        raise HTTPException(status_code=429, detail='Too many messages, please try again later',
+                            headers={'Retry-After': str(max(1, round(decision.retry_after)))})
+    if decision.accepted:
+        try:
+            contact_service.submit(submission.form())
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '5'})
+    return JSONResponse({'status': 'queued'}, status_code=202)
+
+
+@router.get('/stats', dependencies=[Depends(require_stats_access)])
+async def contact_stats() -> Dict[str, int]:
+    """Counters of accepted, throttled and rejected submissions and of the delivery pipeline."""
+    return {**contact_guard.stats(), 'queued': contact_service.queue.qsize(), 'stored': contact_service.stored,
+            'notified': contact_service.notified, 'failed_notifications': contact_service.failed_notifications}
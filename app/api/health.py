@@ -0,0 +1,76 @@
+"""
+Liveness and readiness API.
+
+``/health`` only proves the process answers HTTP and never touches page
+rendering. ``/ready`` reports whether the render and asset caches are warm and
+only succeeds once the warm-up has finished, so a cold machine is not handed
+traffic. Both are answered from in-memory state, keeping probes cheap.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+
+router = APIRouter(tags=['health'])
+
+NO_STORE = {'Cache-Control': 'no-store'}
+
+# Cache name -> callable telling whether that cache is warm
+readiness_checks: Dict[str, Callable[[], bool]] = {}
+
+# Set when the warm-up finished (or was skipped), None while it is still running
+warmed_up_at: Optional[float] = None
+
+
+def register_check(name: str, check: Callable[[], bool]) -> None:
+    """
+    Report a cache in the readiness response.
+
+    Args:
+        name: Name shown in the response
+        check: Returns whether the cache is warm; must be cheap and must not fill the cache
+    """
+    readiness_checks[name] = check
+
+
+async def warm_up(steps: List[Callable[[], None]]) -> None:
+    """
+    Fill the caches in a worker thread, then flip readiness to true.
+
+    Args:
+        steps: Blocking callables that fill the caches, run in order
+    """
+    global warmed_up_at
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    for step in steps:
+        try:
+            await loop.run_in_executor(None, step)
+        except Exception as e:  # a failed step leaves its cache cold, it is filled on first use instead
+            logging.error(f'Warm-up step {getattr(step, "__qualname__", step)} failed: {e}')
+    warmed_up_at = time.time()
+    logging.info(f'Warm-up finished in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+
+def skip_warm_up() -> None:
+    """Report ready without warming the caches; they fill on first use."""
+    global warmed_up_at
+    warmed_up_at = time.time()
+
+
+@router.get('/health')
+async def health() -> Response:
+    """Liveness: the process is up and serving requests."""
+    return Response(b'{"status":"ok"}', media_type='application/json', headers=NO_STORE)
+
+
+@router.get('/ready')
+async def ready() -> Response:
+    """Readiness: the warm-up finished; also reports which caches are warm."""
+    caches = {name: check() for name, check in readiness_checks.items()}
+    is_ready = warmed_up_at is not None
+    return JSONResponse({'ready': is_ready, 'warm': all(caches.values()), 'caches': caches},
+                        status_code=200 if is_ready else 503, headers=NO_STORE)
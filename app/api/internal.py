@@ -0,0 +1,27 @@
+"""
+Access control for the internal statistics endpoints.
+
+Cache, session, contact queue and Prometheus metrics reveal how the instance
+behaves and how its visitors are classified, so they are only served to
+requests carrying ``Authorization: Bearer <STATS_TOKEN>``. Without a token
+configured they answer 404, unless ``STATS_PUBLIC=1`` serves them openly,
+e.g. on a development machine.
+"""
+import hmac
+import os
+
+from fastapi import HTTPException, Request
+
+STATS_TOKEN = os.getenv('STATS_TOKEN', '')
+STATS_PUBLIC = os.getenv('STATS_PUBLIC', '0') != '0'
+
+
+def require_stats_access(request: Request) -> None:
+    """Dependency rejecting requests that may not read the internal statistics."""
+    if STATS_PUBLIC:
+        return
+    if not STATS_TOKEN:
+        raise HTTPException(status_code=404, detail='Not Found')
+    scheme, _, supplied = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(supplied.strip().encode(), STATS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail='Not authenticated', headers={'WWW-Authenticate': 'Bearer'})
@@ -0,0 +1,20 @@
+"""
+Metrics API.
+
+Serves request latencies, response sizes, NiceGUI client and socket.io
+counts, section render times and cache counters in the Prometheus text
+exposition format.
+"""
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from app.api.internal import require_stats_access
+from app.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=['metrics'], dependencies=[Depends(require_stats_access)])
+
+
+@router.get('/metrics', include_in_schema=False)
+async def metrics() -> Response:
+    """Every registered metric, rendered on each scrape."""
+    return Response(registry.expose(), media_type=CONTENT_TYPE, headers={'Cache-Control': 'no-store'})
@@ -0,0 +1,57 @@
+"""
+Project search API.
+
+Searches the project catalogue by text and tags through the inverted index
+of ``app.services.project_search`` and returns one page of results. Responses
+are serialized once per normalized query and content version and then served
+from the search cache.
+"""
+import json
+from typing import List
+
+from fastapi import APIRouter, Query, Response
+
+from app.core.assets import AssetManager
+from app.services.project_search import ProjectIndex, normalize_query, project_search
+
+router = APIRouter(prefix='/api/projects', tags=['projects'])
+
+MAX_PER_PAGE = 50
+
+
+def _render_results(index: ProjectIndex, query: str, tags: tuple, page: int, per_page: int) -> bytes:
+    results = index.search(query, tags, page, per_page)
+    return json.dumps({
+        'query': query,
+        'tags': list(tags),
+        'total': results.total,
+        'page': results.page,
+        'per_page': results.per_page,
+        'pages': results.pages,
+        'items': [{
+            'id': position,
+            'title': project.title,
+            'description': project.description,
+            'tags': project.tags,
+            'link': project.link,
+            'image': AssetManager.get_project_asset(project.image_type).src,
+        } for position, project in results.projects],
+    }).encode('utf-8')
+
+
+@router.get('')
+def search_projects(q: str = '', tag: List[str] = Query(default=[]), page: int = Query(default=1, ge=1),
+                    per_page: int = Query(default=12, ge=1, le=MAX_PER_PAGE)) -> Response:
+    """Projects matching all words of ``q`` (the last one also as a prefix) and carrying every ``tag``, best first."""
+    query, tags = normalize_query(q, tag)
+    body = project_search.cached(('json', query, tags, page, per_page),
+                                 lambda index: _render_results(index, query, tags, page, per_page))
+    return Response(body, media_type='application/json')
+
+
+@router.get('/tags')
+def project_tags() -> Response:
+    """Every project tag with the number of projects carrying it, most used first."""
+    body = project_search.cached(('tags',), lambda index: json.dumps(
+        [{'name': name, 'count': count} for name, count in index.tags]).encode('utf-8'))
+    return Response(body, media_type='application/json')
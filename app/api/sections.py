@@ -0,0 +1,70 @@
+"""
+Page section API.
+
+The dynamic page only ships navigation and hero in its first response; the
+sections below the fold are placeholders that fetch their markup from here
+when they near the viewport or the browser is idle. Responses are the cached
+fragments, addressed by a hash of their markup so browsers keep them until
+the markup changes, whether through a content edit or a deploy.
+"""
+import gzip
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.profiler import render_profiler
+from app.core.static_files import pick_encoding
+
+router = APIRouter(prefix='/api/sections', tags=['sections'])
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Section name -> (callable returning its current version, callable returning its HTML)
+section_sources: Dict[str, Tuple[Callable[[], str], Callable[[], str]]] = {}
+
+
+def register_section(name: str, version: Callable[[], str], render: Callable[[], str]) -> None:
+    """
+    Serve a page section at ``/api/sections/<name>``.
+
+    Args:
+        name: Section name used in the URL
+        version: Returns an identifier that changes whenever the rendered section does
+        render: Returns the section's HTML; should be served from a cache
+    """
+    section_sources[name] = (version, render)
+
+
+def section_url(name: str) -> str:
+    """URL of the current version of a registered section."""
+    version, _ = section_sources[name]
+    return f'{router.prefix}/{name}?v={version()}'
+
+
+@lru_cache(maxsize=32)
+def _gzipped(name: str, version: str, html: str) -> bytes:
+    return gzip.compress(html.encode('utf-8'), compresslevel=9, mtime=0)
+
+
+@router.get('/{name}', include_in_schema=False)
+def page_section(name: str, request: Request, v: str = '') -> Response:
+    """HTML of a page section; immutable when requested with its current version."""
+    source = section_sources.get(name)
+    if source is None:
+        raise HTTPException(status_code=404, detail='Unknown section')
+    version = source[0]()
+    headers = {
+        'ETag': f'"{version}"',
+        # An outdated ?v= still gets the current markup, but must not be cached under the old URL
+        'Cache-Control': IMMUTABLE if v == version else 'no-cache',
+        'Vary': 'Accept-Encoding',
+    }
+    if request.headers.get('if-none-match') == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+    with render_profiler.profile(request):
+        html = source[1]()
+    if pick_encoding(request.headers.get('accept-encoding', ''), ('gzip',)):
+        return Response(_gzipped(name, version, html), media_type='text/html',
+                        headers={**headers, 'Content-Encoding': 'gzip'})
+    return Response(html, media_type='text/html', headers=headers)
@@ -0,0 +1,20 @@
+"""
+NiceGUI session statistics API.
+
+Reports live clients, their estimated memory and eviction counters, so the
+VM can be sized from measurements.
+"""
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.api.internal import require_stats_access
+from app.core.sessions import session_manager
+
+router = APIRouter(prefix='/api/sessions', tags=['sessions'], dependencies=[Depends(require_stats_access)])
+
+
+@router.get('')
+async def session_stats() -> Dict[str, int]:
+    """Client count, estimated bytes per client and eviction counters."""
+    return session_manager.stats()
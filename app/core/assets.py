@@ -1,15 +1,21 @@
 """
 Professional visual asset management system for the AI Engineer Portfolio.
 
-This module provides functionality for fetching and managing professional
-images for the portfolio website.
+This module provides functionality for resolving and managing professional
+images for the portfolio website. Images are served locally from the
+pipeline in ``app.core.images``. Images missing from the manifest are built
+in a background thread, never by the caller: until they are ready, lookups
+return a placeholder of the same size, and subscribers are told once the
+real images exist so pages rendered meanwhile can be rendered again.
 """
-import requests
-from typing import List, Dict, Optional
-import random
+import argparse
+from typing import Callable, List, Dict, Optional, Tuple
 import sys
 import codecs
 import logging
+import threading
+
+from app.core.images import ImageAsset, build_images, load_manifest, placeholder_asset, write_manifest
 
 # Force UTF-8 encoding for reliability
 if sys.stdout.encoding != 'utf-8':
@@ -19,42 +25,156 @@ if sys.stdout.encoding != 'utf-8':
 class AssetManager:
     """Manages professional visual assets for the AI Engineer Portfolio"""
     
-    # AI and technology focused image categories
-    IMAGE_CATEGORIES = [
-        "artificial intelligence", 
-        "machine learning", 
-        "data science", 
-        "neural networks", 
-        "technology", 
-        "coding", 
-        "algorithms",
-        "robotics"
+    # Image keys for the project types used in the portfolio data
+    PROJECT_IMAGE_TYPES = [
+        "nlp",
+        "computer_vision",
+        "reinforcement_learning",
+        "generative_ai",
+        "data_science",
+        "mlops"
     ]
+    DEFAULT_IMAGE = "default"
+    HERO_IMAGE = "hero"
+    
+    # Precomputed manifest, loaded once at import so lookups are plain dict reads
+    _assets: Dict[str, ImageAsset] = load_manifest()
+    
+    # Held while images are built, so the warm-up, a background build and the CLI never encode the same image twice
+    _build_lock = threading.Lock()
+    _background_lock = threading.Lock()
+    _building = False  # a background build is queued or running
+    _requested: Dict[str, str] = {}  # keys outside image_keys() asked for by lookups, with their kind
+    _on_built: List[Callable[[], None]] = []
+    
+    @staticmethod
+    def image_keys() -> List[Tuple[str, str]]:
+        """
+        List every known image key with its kind.
+        
+        Returns:
+            Pairs of (image key, image kind)
+        """
+        keys = [(AssetManager.HERO_IMAGE, 'hero'), (AssetManager.DEFAULT_IMAGE, 'project')]
+        return keys + [(image_type, 'project') for image_type in AssetManager.PROJECT_IMAGE_TYPES]
+    
+    @staticmethod
+    def build() -> Dict[str, ImageAsset]:
+        """
+        Build the local variants of every known image and rewrite the manifest.
+        
+        Returns:
+            Mapping of image key to its asset
+        """
+        with AssetManager._build_lock:
+            AssetManager._assets.update(build_images(AssetManager.image_keys()))
+            write_manifest(AssetManager._assets)
+        return AssetManager._assets
+    
+    @staticmethod
+    def is_built() -> bool:
+        """Whether every known image is in the manifest."""
+        return all(key in AssetManager._assets for key, _ in AssetManager.image_keys())
+    
+    @staticmethod
+    def on_built(callback: Callable[[], None]) -> None:
+        """
+        Register a callback run after missing images were built, in the thread that built them.
+        
+        Args:
+            callback: Called without arguments, e.g. to re-render pages that used placeholders
+        """
+        AssetManager._on_built.append(callback)
+    
+    @staticmethod
+    def ensure_built() -> None:
+        """Build only the images missing from the manifest, e.g. on a fresh checkout. Blocks while building."""
+        with AssetManager._build_lock:
+            keys = {**AssetManager._requested, **dict(AssetManager.image_keys())}
+            missing = [(key, kind) for key, kind in keys.items() if key not in AssetManager._assets]
+            if not missing:
+                return
+            logging.info(f"Image manifest is missing {len(missing)} entries, building them now")
+            AssetManager._assets.update(build_images(missing))
+            write_manifest(AssetManager._assets)
+        for callback in AssetManager._on_built:
+            try:
+                callback()
+            except Exception as e:
+                logging.error(f"Error after building images: {e}")
+    
+    @staticmethod
+    def _build_in_background() -> None:
+        with AssetManager._background_lock:
+            if AssetManager._building:
+                return
+            AssetManager._building = True
+        
+        def run() -> None:
+            try:
+                AssetManager.ensure_built()
+            except Exception as e:
+                logging.error(f"Error building images: {e}")
+            finally:
+                with AssetManager._background_lock:
+                    AssetManager._building = False
+        
+        threading.Thread(target=run, name='image-build', daemon=True).start()
+    
+    @staticmethod
+    def get_asset(key: str, kind: str = 'project') -> ImageAsset:
+        """
+        Get the built asset for an image key, or a placeholder while it is being built.
+        
+        Args:
+            key: Image key (project type, "hero" or "default")
+            kind: Image kind used when the asset still has to be built
+            
+        Returns:
+            The image asset with all its variants, or a placeholder of the same size
+        """
+        asset = AssetManager._assets.get(key)
+        if asset is None:
+            # Never built by the caller, which may well be the event loop
+            AssetManager._requested.setdefault(key, kind)
+            AssetManager._build_in_background()
+            return placeholder_asset(key, kind)
+        return asset
     
     @staticmethod
     def get_image(category: Optional[str] = None, width: int = 800, height: int = 600) -> str:
         """
-        Fetch a professional image for the specified category.
+        Get a local image for the specified category.
         
         Args:
-            category: Image category (defaults to random AI-related category)
+            category: Image key (defaults to the generic AI image)
             width: Desired image width
             height: Desired image height
             
         Returns:
-            URL to a professional image
+            URL to a content-addressed local image
         """
         try:
-            if not category:
-                category = random.choice(AssetManager.IMAGE_CATEGORIES)
-                
-            # Generate unique URL to avoid caching issues
-            seed = random.randint(1000, 9999)
-            return f"https://source.unsplash.com/{width}x{height}/?{category}&sig={seed}"
+            kind = 'hero' if category == AssetManager.HERO_IMAGE else 'project'
+            return AssetManager.get_asset(category or AssetManager.DEFAULT_IMAGE, kind).url(width)
         except Exception as e:
-            logging.error(f"Error fetching image: {e}")
-            # Fallback to a placeholder if image fetching fails
-            return f"https://via.placeholder.com/{width}x{height}/2563eb/ffffff?text=AI+Engineer"
+            logging.error(f"Error building image: {e}")
+            return AssetManager.get_asset(AssetManager.DEFAULT_IMAGE).url(width)
+    
+    @staticmethod
+    def get_project_asset(project_type: str) -> ImageAsset:
+        """
+        Get the image asset for a specific AI project type.
+        
+        Args:
+            project_type: Type of AI project (e.g., "nlp", "computer_vision")
+            
+        Returns:
+            The project image asset
+        """
+        if project_type not in AssetManager.PROJECT_IMAGE_TYPES:
+            project_type = AssetManager.DEFAULT_IMAGE
+        return AssetManager.get_asset(project_type)
     
     @staticmethod
     def get_project_image(project_type: str) -> str:
@@ -62,25 +182,22 @@ class AssetManager:
         Get an image appropriate for a specific AI project type.
         
         Args:
-            project_type: Type of AI project (e.g., "nlp", "computer vision")
+            project_type: Type of AI project (e.g., "nlp", "computer_vision")
             
         Returns:
             URL to a project-appropriate image
         """
-        project_categories = {
-            "nlp": ["natural language processing", "text analysis", "language ai"],
-            "computer_vision": ["computer vision", "image recognition", "visual ai"],
-            "reinforcement_learning": ["reinforcement learning", "game ai", "robotics"],
-            "generative_ai": ["generative ai", "creative ai", "ai art"],
-            "data_science": ["data science", "data visualization", "big data"],
-            "mlops": ["devops", "cloud computing", "software engineering"]
-        }
-        
-        # Get appropriate categories or default to general AI
-        categories = project_categories.get(project_type, ["artificial intelligence"])
-        category = random.choice(categories)
+        return AssetManager.get_project_asset(project_type).src
+    
+    @staticmethod
+    def get_hero_asset() -> ImageAsset:
+        """
+        Get the image asset for the portfolio header.
         
-        return AssetManager.get_image(category, 600, 400)
+        Returns:
+            The hero image asset
+        """
+        return AssetManager.get_asset(AssetManager.HERO_IMAGE, 'hero')
     
     @staticmethod
     def get_hero_image() -> str:
@@ -90,11 +207,14 @@ class AssetManager:
         Returns:
             URL to a hero image
         """
-        hero_categories = [
-            "artificial intelligence workspace",
-            "futuristic technology",
-            "data visualization",
-            "neural networks visualization"
-        ]
-        category = random.choice(hero_categories)
-        return AssetManager.get_image(category, 1200, 600)
\ No newline at end of file
+        return AssetManager.get_hero_asset().src
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the portfolio image variants and manifest")
+    parser.add_argument("command", nargs="?", default="build", choices=["build"])
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    assets = AssetManager.build()
+    print(f"Built {len(assets)} images, {sum(len(asset.variants) for asset in assets.values())} variants")
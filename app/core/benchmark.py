@@ -0,0 +1,451 @@
+"""
+Load and latency benchmarks for the AI Engineer Portfolio.
+
+``python -m app.core.benchmark run`` starts the server locally the way
+production does, then measures:
+
+- time to first byte of cold starts (median of several fresh processes),
+  optionally without the pre-rendered snapshot so the page renders on request,
+- server memory (RSS) growth per 1000 NiceGUI clients,
+- requests/s, p50/p95/p99 latency, time to first byte and bytes transferred for the home page,
+  the fingerprinted ``/static`` and ``/assets`` files the page references,
+  the health route and contact submissions, at a configurable concurrency.
+
+Results are written as JSON and can be compared with a stored baseline,
+either right away (``--baseline``) or later with ``python -m
+app.core.benchmark compare``; both exit non-zero on a regression beyond the
+tolerance.
+
+Everything runs offline: the load generator only talks to the local server,
+outgoing HTTP(S) from the server is pointed at an unreachable local proxy so
+image or font hosts are never contacted, SMTP and Redis are disabled, and
+the contact database lives in a temporary directory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.startup import ROOT_DIR, free_port, measure_cold_start
+from app.services.rate_limit import FormTimestamps
+
+SCENARIOS = ['page', 'static', 'health', 'contact']
+
+# Sent with every request, like a browser; bot user agents would get the static page instead of a client
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) portfolio-benchmark'
+
+# Server environment: no outgoing network, local contact storage and limits that never throttle the load
+OFFLINE_ENV = {
+    'HTTP_PROXY': 'http://127.0.0.1:9', 'HTTPS_PROXY': 'http://127.0.0.1:9',
+    'http_proxy': 'http://127.0.0.1:9', 'https_proxy': 'http://127.0.0.1:9',
+    'NO_PROXY': '127.0.0.1,localhost', 'no_proxy': '127.0.0.1,localhost',
+    'SMTP_HOST': '', 'RATE_LIMIT_REDIS_URL': '', 'CONTENT_WATCH': '0',
+    'CONTACT_IP_LIMIT': '1e9', 'CONTACT_GLOBAL_LIMIT': '1e9', 'CONTACT_QUEUE_SIZE': '100000',
+    'CONTACT_MIN_FILL_SECONDS': '0', 'CONTACT_FORM_SECRET': 'portfolio-benchmark',
+    'SESSION_MAX_CLIENTS': '1000000', 'SESSION_MEMORY_BUDGET': str(1 << 40), 'SESSION_BOT_STRIKES': '0',
+}
+
+CONTACT_MESSAGE = {
+    'name': 'Benchmark', 'email': 'benchmark@example.com', 'subject': 'Load test',
+    'message': 'A message sent by the benchmark harness.',
+}
+
+# Result metrics compared with a baseline, and whether higher values are better
+METRICS = {'rps': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False, 'bytes_per_request': False,
+           'ttfb_ms': False, 'ttfb_p50_ms': False, 'ttfb_p95_ms': False, 'rss_kb_per_1000_clients': False}
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client, so the load generator costs as little as possible"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.first_byte_at = 0.0  # perf_counter() when the status line of the last response arrived
+
+    async def request(self, method: str, path: str, body: bytes = b'',
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, int]:
+        """
+        Send a request and read the complete response.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            body: Request body
+            headers: Extra request headers
+
+        Returns:
+            Status code and number of body bytes received
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.port)
+        lines = [f'{method} {path} HTTP/1.1', f'Host: 127.0.0.1:{self.port}', f'User-Agent: {USER_AGENT}',
+                 'Accept-Encoding: gzip, br', f'Content-Length: {len(body)}']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+        status_line = await self.reader.readline()
+        self.first_byte_at = time.perf_counter()
+        status = int(status_line.split()[1])
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        size = 0
+        if response_headers.get('transfer-encoding') == 'chunked':
+            while True:
+                chunk = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(chunk + 2)
+                size += chunk
+                if chunk == 0:
+                    break
+        elif method != 'HEAD' and status not in (204, 304):
+            size = int(response_headers.get('content-length', 0))
+            await self.reader.readexactly(size)
+        if response_headers.get('connection') == 'close':
+            self.close()
+        return status, size
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+def _rss_kb(pid: int) -> int:
+    """Resident memory of a process and its children (the workers), in kB."""
+    total = 0
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as file:
+            total += next(int(line.split()[1]) for line in file if line.startswith('VmRSS:'))
+        with open(f'/proc/{pid}/task/{pid}/children', encoding='ascii') as file:
+            total += sum(_rss_kb(int(child)) for child in file.read().split())
+    except (OSError, StopIteration):
+        pass
+    return total
+
+
+def _get(port: int, path: str, timeout: float = 10.0) -> Tuple[int, bytes]:
+    request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', headers={'User-Agent': USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, b''
+
+
+@contextmanager
+def running_server(env: Dict[str, str], timeout: float = 60.0) -> Iterator[Tuple[int, subprocess.Popen]]:
+    """
+    Start the server offline and wait until it reports ready.
+
+    Args:
+        env: Extra environment variables for the server
+        timeout: Seconds to wait for readiness
+
+    Yields:
+        The server's port and process
+    """
+    port = free_port()
+    server_env = {**os.environ, **OFFLINE_ENV, 'HOST': '127.0.0.1', 'PORT': str(port), **env}
+    process = subprocess.Popen([sys.executable, 'main.py'], cwd=ROOT_DIR, env=server_env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        started = time.perf_counter()
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'Server exited with code {process.returncode} before it was ready')
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f'Server not ready within {timeout:.0f} s')
+            try:
+                if _get(port, '/ready')[0] == 200:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.05)
+        yield port, process
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _requests(scenario: str, page_path: str, static_paths: List[str]) -> List[Tuple[str, str, bytes, Dict[str, str]]]:
+    """Requests a scenario cycles through: (method, path, body, headers)."""
+    if scenario == 'page':
+        return [('GET', page_path, b'', {})]
+    if scenario == 'static':
+        return [('GET', path, b'', {}) for path in static_paths]
+    if scenario == 'health':
+        return [('GET', '/health', b'', {})]
+    # Signed with the server's benchmark secret, as if the form had been fetched from /api/contact/form
+    token = FormTimestamps(OFFLINE_ENV['CONTACT_FORM_SECRET'].encode('utf-8')).issue()
+    body = json.dumps({**CONTACT_MESSAGE, 'form_token': token}).encode('utf-8')
+    return [('POST', '/api/contact', body, {'Content-Type': 'application/json'})]
+
+
+async def _load(port: int, requests: List[Tuple[str, str, bytes, Dict[str, str]]], concurrency: int,
+                duration: float, warmup: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    first_bytes: List[float] = []
+    received = 0
+    errors = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    async def client(offset: int) -> None:
+        nonlocal received, errors
+        connection = HttpConnection(port)
+        index = offset
+        try:
+            while True:
+                method, path, body, headers = requests[index % len(requests)]
+                index += 1
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    status, size = await connection.request(method, path, body, headers)
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    status, size = 0, 0
+                    connection.close()
+                if sent >= measure_from:
+                    latencies.append(time.perf_counter() - sent)
+                    if status:
+                        first_bytes.append(connection.first_byte_at - sent)
+                    received += size
+                    errors += status == 0 or status >= 400
+        finally:
+            connection.close()
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    latencies.sort()
+    count = len(latencies)
+    if count < 2:
+        return {'requests': count, 'errors': errors, 'rps': 0.0}
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    first_byte_percentiles = statistics.quantiles(first_bytes, n=100, method='inclusive') \
+        if len(first_bytes) > 1 else [0.0] * 99
+    return {
+        'requests': count,
+        'errors': errors,
+        'rps': round(count / duration, 1),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2),
+        'p50_ms': round(percentiles[49] * 1000, 2),
+        'p95_ms': round(percentiles[94] * 1000, 2),
+        'p99_ms': round(percentiles[98] * 1000, 2),
+        'ttfb_p50_ms': round(first_byte_percentiles[49] * 1000, 2),
+        'ttfb_p95_ms': round(first_byte_percentiles[94] * 1000, 2),
+        'bytes': received,
+        'bytes_per_request': round(received / count),
+    }
+
+
+def measure_client_memory(port: int, pid: int, page_path: str, clients: int) -> Dict[str, float]:
+    """
+    Measure how much server memory NiceGUI clients cost.
+
+    Args:
+        port: Server port
+        pid: Server process
+        page_path: Page that creates a NiceGUI client per request
+        clients: Number of clients to create
+
+    Returns:
+        RSS before and after creating the clients and the growth per 1000 clients
+    """
+    async def create_clients() -> None:
+        connections = [HttpConnection(port) for _ in range(min(16, clients))]
+
+        async def load(connection: HttpConnection, count: int) -> None:
+            for _ in range(count):
+                await connection.request('GET', page_path)
+            connection.close()
+
+        share, rest = divmod(clients, len(connections))
+        await asyncio.gather(*(load(c, share + (i < rest)) for i, c in enumerate(connections)))
+
+    before = _rss_kb(pid)
+    asyncio.run(create_clients())
+    after = _rss_kb(pid)
+    return {'clients': clients, 'rss_before_kb': before, 'rss_after_kb': after,
+            'rss_kb_per_1000_clients': round((after - before) * 1000 / clients, 1)}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def run_benchmark(scenarios: List[str], render_mode: str = 'static', workers: int = 1, concurrency: int = 32,
+                  duration: float = 10.0, warmup: float = 1.0, clients: int = 1000,
+                  cold_starts: int = 3, cold_render: bool = False) -> Dict[str, Any]:
+    """
+    Run the benchmark suite against a freshly started local server.
+
+    Args:
+        scenarios: Load scenarios to run, out of ``SCENARIOS``
+        render_mode: ``RENDER_MODE`` of the server
+        workers: ``WEB_CONCURRENCY`` of the server
+        concurrency: Concurrent keep-alive connections per scenario
+        duration: Measured seconds per scenario
+        warmup: Seconds of load before measuring each scenario
+        clients: NiceGUI clients created for the memory measurement (0 to skip)
+        cold_starts: Cold starts to measure (0 to skip)
+        cold_render: Cold start without the pre-rendered snapshot, so the first request renders the page
+
+    Returns:
+        The results, ready to be written as JSON
+    """
+    directory = tempfile.TemporaryDirectory()
+    env = {**OFFLINE_ENV, 'RENDER_MODE': render_mode, 'WEB_CONCURRENCY': str(workers),
+           'CONTACT_DATABASE': str(Path(directory.name) / 'contact.sqlite3')}
+    results: Dict[str, Any] = {
+        'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'commit': _commit(),
+                 'python': platform.python_version(), 'cpus': os.cpu_count(), 'render_mode': render_mode,
+                 'workers': workers, 'concurrency': concurrency, 'duration': duration, 'cold_render': cold_render},
+    }
+    if cold_starts:
+        cold_env = {**env, 'LOAD_SNAPSHOT': '0', 'WARM_UP': '0'} if cold_render else env
+        runs = [measure_cold_start(env=cold_env) for _ in range(cold_starts)]
+        results['cold_start'] = {'runs': cold_starts,
+                                 'ttfb_ms': round(statistics.median(run['ttfb'] for run in runs), 1),
+                                 'wall_ms': round(statistics.median(run['wall'] for run in runs), 1)}
+
+    # In static mode only the embedded contact form is a NiceGUI page
+    client_page = '/' if render_mode == 'dynamic' else '/contact-form'
+    with directory, running_server(env) as (port, process):
+        if clients:
+            results['memory'] = measure_client_memory(port, process.pid, client_page, clients)
+        # Every local file the page references: stylesheets, scripts, fonts and image variants
+        page = _get(port, '/')[1].decode('utf-8', 'replace')
+        static_paths = sorted(set(re.findall(r'["\s,(](/(?:static|assets)/[^"\s,)]+)', page)))
+        results['scenarios'] = {}
+        for scenario in scenarios:
+            requests = _requests(scenario, '/', static_paths)
+            if requests:
+                results['scenarios'][scenario] = asyncio.run(_load(port, requests, concurrency, duration, warmup))
+    return results
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Comparable metrics keyed by their path, e.g. ``scenarios.page.p95_ms``."""
+    metrics = {}
+    for scenario, values in results.get('scenarios', {}).items():
+        metrics.update({f'scenarios.{scenario}.{name}': values[name] for name in METRICS if name in values})
+    if 'cold_start' in results:
+        metrics['cold_start.ttfb_ms'] = results['cold_start']['ttfb_ms']
+    if 'memory' in results:
+        metrics['memory.rss_kb_per_1000_clients'] = results['memory']['rss_kb_per_1000_clients']
+    return metrics
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.1) -> bool:
+    """
+    Compare results with a baseline and print the changes.
+
+    Args:
+        results: Current results
+        baseline: Stored results to compare with
+        tolerance: Relative change accepted before a metric counts as a regression
+
+    Returns:
+        Whether no metric regressed beyond the tolerance
+    """
+    for setting in ('render_mode', 'workers', 'concurrency', 'cpus', 'cold_render'):
+        if results['meta'].get(setting) != baseline['meta'].get(setting):
+            print(f'Warning: {setting} differs from the baseline '
+                  f'({results["meta"].get(setting)} vs {baseline["meta"].get(setting)})')
+    current, previous = _flatten(results), _flatten(baseline)
+    ok = True
+    for name in sorted(current.keys() & previous.keys()):
+        value, reference = current[name], previous[name]
+        change = (value - reference) / reference if reference else 0.0
+        higher_is_better = METRICS[name.rsplit('.', 1)[1]]
+        regressed = (change < -tolerance) if higher_is_better else (change > tolerance)
+        ok = ok and not regressed
+        print(f'{name:<40} {reference:>12.1f} {value:>12.1f} {change:>+8.1%}{"  REGRESSION" if regressed else ""}')
+    return ok
+
+
+def _print_results(results: Dict[str, Any]) -> None:
+    if 'cold_start' in results:
+        print(f'Cold start: TTFB {results["cold_start"]["ttfb_ms"]:.0f} ms (median of {results["cold_start"]["runs"]})')
+    if 'memory' in results:
+        print(f'Memory: {results["memory"]["rss_kb_per_1000_clients"]:.0f} kB RSS per 1000 clients')
+    for scenario, values in results.get('scenarios', {}).items():
+        if values['requests'] < 2:
+            print(f'{scenario:>8}: too few requests')
+            continue
+        print(f'{scenario:>8}: {values["rps"]:>9.1f} req/s  p50 {values["p50_ms"]:.2f} ms  p95 {values["p95_ms"]:.2f} ms  '
+              f'p99 {values["p99_ms"]:.2f} ms  TTFB p50 {values["ttfb_p50_ms"]:.2f} ms  '
+              f'{values["bytes_per_request"]} B/req  {values["errors"]} errors')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline load and latency benchmarks for the portfolio server')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('run', help='start the server locally and benchmark it')
+    run.add_argument('--scenarios', default=','.join(SCENARIOS), help=f'comma-separated, out of {SCENARIOS}')
+    run.add_argument('--render-mode', choices=['static', 'dynamic'], default='static')
+    run.add_argument('--workers', type=int, default=1)
+    run.add_argument('--concurrency', type=int, default=32)
+    run.add_argument('--duration', type=float, default=10.0, help='measured seconds per scenario')
+    run.add_argument('--warmup', type=float, default=1.0, help='seconds of load before measuring')
+    run.add_argument('--clients', type=int, default=1000, help='NiceGUI clients for the memory measurement')
+    run.add_argument('--cold-starts', type=int, default=3)
+    run.add_argument('--cold-render', action='store_true',
+                     help='cold start without the pre-rendered snapshot, so the first request renders the page')
+    run.add_argument('--output', type=Path, help='write the results to this JSON file')
+    run.add_argument('--baseline', type=Path, help='compare with these stored results')
+    run.add_argument('--tolerance', type=float, default=0.1)
+    check = subparsers.add_parser('compare', help='compare stored results with a baseline')
+    check.add_argument('results', type=Path)
+    check.add_argument('baseline', type=Path)
+    check.add_argument('--tolerance', type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        unknown = set(args.scenarios.split(',')) - set(SCENARIOS)
+        if unknown:
+            parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+        results = run_benchmark(args.scenarios.split(','), render_mode=args.render_mode, workers=args.workers,
+                                concurrency=args.concurrency, duration=args.duration, warmup=args.warmup,
+                                clients=args.clients, cold_starts=args.cold_starts, cold_render=args.cold_render)
+        _print_results(results)
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+            print(f'Results written to {args.output}')
+        if args.baseline:
+            sys.exit(0 if compare(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+                     else 1)
+    else:
+        results = json.loads(args.results.read_text(encoding='utf-8'))
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        sys.exit(0 if compare(results, baseline, args.tolerance) else 1)
@@ -0,0 +1,167 @@
+"""
+Critical CSS extraction for the AI Engineer Portfolio.
+
+Splits ``main.css`` against the rendered page: rules whose selectors never
+match the page are pruned, rules needed by the first viewport (navigation and
+hero) are inlined in the head, and the pruned stylesheet is loaded without
+blocking rendering.
+"""
+import re
+from dataclasses import dataclass
+from html import escape
+from pathlib import PurePosixPath
+from typing import Iterable, List, Optional, Set
+
+from app.core.static_files import minify_css, write_asset
+
+CLASS_ATTRIBUTE = re.compile(r'class="([^"]*)"')
+ID_ATTRIBUTE = re.compile(r'id="([^"]*)"')
+# Classes toggled by page scripts never appear in the rendered markup
+SCRIPT_CLASSES = re.compile(r'classList\.(?:add|toggle)\(\s*[\'"]([\w-]+)[\'"]')
+SELECTOR_CLASSES = re.compile(r'\.([\w-]+)')
+SELECTOR_IDS = re.compile(r'#([\w-]+)')
+
+
+@dataclass(frozen=True)
+class CssRule:
+    """A top-level rule, optionally nested in a media query"""
+    selector: str
+    body: str
+    media: Optional[str] = None
+
+    @property
+    def is_at_rule(self) -> bool:
+        return self.selector.startswith('@')
+
+    def css(self) -> str:
+        return f'{self.selector}{{{self.body}}}'
+
+
+@dataclass(frozen=True)
+class PageStyles:
+    """Result of splitting the stylesheet for one page"""
+    critical_css: str
+    stylesheet_url: str
+    original_bytes: int
+    pruned_bytes: int
+
+    def head_html(self) -> str:
+        """Inline the critical rules and load the full stylesheet asynchronously."""
+        url = escape(self.stylesheet_url)
+        return (
+            f'<style>{self.critical_css}</style>'
+            f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{url}"></noscript>'
+        )
+
+
+def _blocks(css: str) -> Iterable[tuple]:
+    """Yield (prelude, body) pairs for the top-level blocks of minified CSS."""
+    position = 0
+    while True:
+        start = css.find('{', position)
+        if start == -1:
+            return
+        depth, end = 1, start + 1
+        while depth and end < len(css):
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        yield css[position:start].strip(), css[start + 1:end - 1]
+        position = end
+
+
+def parse_rules(css: str) -> List[CssRule]:
+    """
+    Parse a stylesheet into top-level rules, flattening media queries.
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        Rules in source order
+    """
+    rules = []
+    for prelude, body in _blocks(minify_css(css)):
+        if prelude.startswith('@media'):
+            media = prelude[len('@media'):].strip()
+            rules.extend(CssRule(selector, inner, media) for selector, inner in _blocks(body))
+        else:
+            rules.append(CssRule(prelude, body))
+    return rules
+
+
+def serialize_rules(rules: Iterable[CssRule]) -> str:
+    """
+    Write rules back as CSS, regrouping consecutive rules of the same media query.
+
+    Args:
+        rules: Rules in source order
+
+    Returns:
+        The stylesheet
+    """
+    parts, media, group = [], None, []
+    for rule in list(rules) + [CssRule('', '', '\0')]:
+        if rule.media != media and group:
+            parts.append(f'@media {media}{{{"".join(group)}}}' if media else ''.join(group))
+            group = []
+        media = rule.media
+        group.append(rule.css())
+    return ''.join(parts)
+
+
+def used_names(html: str) -> Set[str]:
+    """
+    Collect the class and id names a page can match.
+
+    Args:
+        html: Rendered markup, including inline scripts
+
+    Returns:
+        Class names and ``#``-prefixed ids
+    """
+    names = {name for match in CLASS_ATTRIBUTE.findall(html) for name in match.split()}
+    names.update(SCRIPT_CLASSES.findall(html))
+    names.update(f'#{name}' for name in ID_ATTRIBUTE.findall(html))
+    return names
+
+
+def _matches(selector: str, names: Set[str]) -> bool:
+    # A selector can only match if every class and id it requires is present on the page
+    for part in selector.split(','):
+        part = re.sub(r'::?[\w-]+(\([^)]*\))?', '', part)
+        if all(name in names for name in SELECTOR_CLASSES.findall(part)) and \
+                all(f'#{name}' in names for name in SELECTOR_IDS.findall(part)):
+            return True
+    return False
+
+
+def split_styles(css: str, page_html: str, above_the_fold_html: str, name: str = 'css/main.pruned.css') -> PageStyles:
+    """
+    Prune a stylesheet for a page and extract its critical rules.
+
+    Args:
+        css: Stylesheet source
+        page_html: Markup of the whole page
+        above_the_fold_html: Markup of the first viewport
+        name: Logical asset path used for the pruned stylesheet; its earlier versions are deleted
+
+    Returns:
+        The critical CSS and the URL of the pruned stylesheet
+    """
+    page_names = used_names(page_html)
+    fold_names = used_names(above_the_fold_html)
+    rules = parse_rules(css)
+
+    kept = [rule for rule in rules if not rule.is_at_rule and _matches(rule.selector, page_names)]
+    # Keep at-rules unless they are keyframes no remaining rule animates with
+    declarations = ''.join(rule.body for rule in kept)
+    kept = [rule for rule in rules if rule in kept or rule.is_at_rule and (
+        not rule.selector.startswith('@keyframes') or rule.selector.split()[-1] in declarations)]
+    critical = [rule for rule in kept if not rule.is_at_rule and _matches(rule.selector, fold_names)]
+
+    pruned_css = serialize_rules(kept)
+    # Rewritten whenever the content changes, so the outputs of older content are cleaned up
+    url = write_asset(PurePosixPath(name), pruned_css.encode('utf-8'), prune=True)
+    return PageStyles(serialize_rules(critical), url,
+                      len(minify_css(css).encode('utf-8')), len(pruned_css.encode('utf-8')))
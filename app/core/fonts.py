@@ -0,0 +1,227 @@
+"""
+Self-hosted web fonts for the AI Engineer Portfolio.
+
+The build step subsets the Inter and JetBrains Mono source fonts to the
+glyphs the portfolio content actually uses, limits their weight axes to the weights
+the stylesheet needs and writes fingerprinted WOFF2 files to
+``app/static/build/fonts``. At runtime the pages read the resulting manifest
+and emit ``@font-face`` rules with ``font-display: swap`` plus preload links,
+so no request leaves the site before first text paint.
+
+Source fonts are looked up in ``app/static/fonts`` and downloaded from the
+Google Fonts repository when missing (build time only).
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import string
+from dataclasses import asdict, dataclass
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.images import ASSETS_URL, BUILD_DIR, STATIC_DIR
+
+SOURCE_DIR = STATIC_DIR / 'fonts'
+FONT_BUILD_DIR = BUILD_DIR / 'fonts'
+FONT_MANIFEST_PATH = FONT_BUILD_DIR / 'fonts.json'
+
+# Characters always kept, on top of the ones found in the portfolio content
+BASE_CHARACTERS = string.printable.strip() + ' ©•–—‘’“”…→'
+
+
+@dataclass(frozen=True)
+class FontSource:
+    """A font family to self-host"""
+    family: str
+    filename: str
+    url: str
+    weights: Tuple[int, int]
+    preload: bool
+
+
+FONT_SOURCES = [
+    FontSource('Inter', 'Inter.ttf',
+               'https://github.com/google/fonts/raw/main/ofl/inter/Inter%5Bopsz,wght%5D.ttf',
+               (300, 700), preload=True),
+    FontSource('JetBrains Mono', 'JetBrainsMono.ttf',
+               'https://github.com/google/fonts/raw/main/ofl/jetbrainsmono/JetBrainsMono%5Bwght%5D.ttf',
+               (400, 500), preload=False),
+]
+
+
+@dataclass(frozen=True)
+class BuiltFont:
+    """A subsetted WOFF2 font ready to be served"""
+    family: str
+    url: str
+    weight: str
+    unicode_range: str
+    preload: bool
+
+
+def collect_text(data: Any) -> str:
+    """
+    Gather every character that can appear on the page.
+
+    Args:
+        data: Portfolio content (nested dicts, lists and strings)
+
+    Returns:
+        The set of characters as a string
+    """
+    characters = set(BASE_CHARACTERS)
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            characters.update(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return ''.join(sorted(characters))
+
+
+def _unicode_range(codepoints: Iterable[int]) -> str:
+    ranges: List[Tuple[int, int]] = []
+    for codepoint in sorted(codepoints):
+        if ranges and codepoint == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], codepoint)
+        else:
+            ranges.append((codepoint, codepoint))
+    return ', '.join(f'U+{start:X}' if start == end else f'U+{start:X}-{end:X}' for start, end in ranges)
+
+
+def _source_path(source: FontSource) -> Optional[Path]:
+    path = SOURCE_DIR / source.filename
+    if path.exists():
+        return path
+    try:
+        import requests
+        logging.info(f'Downloading {source.family} from {source.url}')
+        response = requests.get(source.url, timeout=60)
+        response.raise_for_status()
+    except Exception as e:
+        logging.warning(f'Could not fetch source font for {source.family}: {e}')
+        return None
+    SOURCE_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(response.content)
+    return path
+
+
+def subset_font(source: FontSource, path: Path, text: str) -> BuiltFont:
+    """
+    Subset one source font to the given text and write it as WOFF2.
+
+    Args:
+        source: Font family description
+        path: Source font file (static or variable TTF/OTF)
+        text: Characters to keep
+
+    Returns:
+        The built font
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    font = TTFont(path)
+    weight = str(font['OS/2'].usWeightClass)
+    if 'fvar' in font:
+        # Keep only the weight range in use and pin every other axis (e.g. optical size) to its default
+        limits: Dict[str, Any] = {axis.axisTag: None for axis in font['fvar'].axes}
+        limits['wght'] = source.weights
+        font = instancer.instantiateVariableFont(font, limits)
+        weight = f'{source.weights[0]} {source.weights[1]}'
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.desubroutinize = True
+    options.name_IDs = ['*']
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    font.flavor = 'woff2'
+    font.save(buffer)
+    data = buffer.getvalue()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    filename = f'{source.filename.rsplit(".", 1)[0].lower()}.{digest}.woff2'
+    FONT_BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    (FONT_BUILD_DIR / filename).write_bytes(data)
+    logging.info(f'Built {source.family}: {path.stat().st_size} -> {len(data)} bytes')
+    return BuiltFont(source.family, f'{ASSETS_URL}/fonts/{filename}', weight,
+                     _unicode_range(font.getBestCmap().keys()), source.preload)
+
+
+def build_fonts(text: str) -> List[BuiltFont]:
+    """
+    Build every self-hosted font and write the manifest.
+
+    Args:
+        text: Characters to keep in the subsets
+
+    Returns:
+        The built fonts
+    """
+    fonts = []
+    for source in FONT_SOURCES:
+        path = _source_path(source)
+        if path is not None:
+            fonts.append(subset_font(source, path, text))
+    FONT_BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    FONT_MANIFEST_PATH.write_text(json.dumps([asdict(font) for font in fonts], indent=2), encoding='utf-8')
+    return fonts
+
+
+def load_fonts() -> List[BuiltFont]:
+    """
+    Read the fonts recorded by the last build.
+
+    Returns:
+        The built fonts, empty if the build step has not run
+    """
+    try:
+        return [BuiltFont(**entry) for entry in json.loads(FONT_MANIFEST_PATH.read_text(encoding='utf-8'))]
+    except FileNotFoundError:
+        logging.info('No self-hosted fonts built, falling back to system fonts')
+    except (ValueError, TypeError) as e:
+        logging.warning(f'Ignoring invalid font manifest {FONT_MANIFEST_PATH}: {e}')
+    return []
+
+
+def font_head_html(fonts: Optional[List[BuiltFont]] = None) -> str:
+    """
+    Render preload links and ``@font-face`` rules for the built fonts.
+
+    Args:
+        fonts: Fonts to declare (defaults to the built manifest)
+
+    Returns:
+        Markup for the document head
+    """
+    fonts = load_fonts() if fonts is None else fonts
+    preloads = ''.join(
+        f'<link rel="preload" href="{escape(font.url)}" as="font" type="font/woff2" crossorigin>'
+        for font in fonts if font.preload
+    )
+    faces = ''.join(
+        f'@font-face{{font-family:"{font.family}";font-style:normal;font-weight:{font.weight};'
+        f'font-display:swap;src:url({font.url}) format("woff2");unicode-range:{font.unicode_range}}}'
+        for font in fonts
+    )
+    return preloads + (f'<style>{faces}</style>' if faces else '')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the self-hosted, subsetted portfolio fonts')
+    parser.add_argument('command', nargs='?', default='build', choices=['build'])
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    from app.services.content_store import ContentStore
+    built = build_fonts(collect_text(ContentStore().load().model_dump()))
+    print(f'Built {len(built)} fonts')
@@ -0,0 +1,122 @@
+"""
+Rendered fragment cache for the AI Engineer Portfolio.
+
+Page sections are rendered to HTML fragments once per content version and
+theme, so assembling a page is a concatenation of cached strings. The cache
+is a byte-bounded LRU and counts hits, misses and evictions.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class FragmentCache:
+    """LRU cache of rendered HTML fragments, bounded by entry count and size"""
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of fragments kept
+            max_bytes: Maximum total size of the kept fragments (UTF-8 encoded)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Membership tests (e.g. readiness checks) neither count as hits nor refresh recency
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Look up a fragment and mark it as recently used.
+
+        Args:
+            key: Fragment key, e.g. ``(section, version, theme)``
+
+        Returns:
+            The fragment, or None if it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, fragment: str) -> None:
+        """
+        Store a fragment, evicting the least recently used ones over the limits.
+
+        Args:
+            key: Fragment key
+            fragment: Rendered HTML
+        """
+        size = len(fragment.encode('utf-8'))
+        if size > self.max_bytes:
+            logging.warning(f'Not caching fragment {key!r}: {size} bytes exceeds the {self.max_bytes} byte limit')
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (fragment, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """
+        Return the cached fragment for a key, rendering and storing it on a miss.
+
+        Args:
+            key: Fragment key
+            render: Callable producing the fragment
+
+        Returns:
+            The fragment
+        """
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = render()
+            self.put(key, fragment)
+        return fragment
+
+    def clear(self) -> None:
+        """Drop every fragment, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and current usage of the cache."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
+
+
+# Shared cache of the rendered page sections
+fragment_cache = FragmentCache(
+    max_entries=int(os.getenv('FRAGMENT_CACHE_ENTRIES', 64)),
+    max_bytes=int(os.getenv('FRAGMENT_CACHE_BYTES', 1024 * 1024)),
+)
@@ -0,0 +1,328 @@
+"""
+Local image pipeline for the AI Engineer Portfolio.
+
+Source images live in ``app/static/images`` and are named after the image key
+they illustrate (``hero.jpg``, ``nlp.png``, ...). Each source is resized with
+Pillow into responsive AVIF/WebP/JPEG variants, written to
+``app/static/build/images`` under content-hash filenames and served from
+``/assets`` with immutable caching. Keys without a source image get a
+deterministic generated artwork so the site never depends on a remote host.
+
+The result of a build is recorded in a JSON manifest (variant URLs,
+dimensions, dominant colour and an inline blurred placeholder) so a running
+server only has to read it back instead of re-encoding images.
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import random
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from html import escape
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+if TYPE_CHECKING:  # Pillow is only imported when images are built, not when a server reads the manifest
+    from PIL import Image
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / 'static'
+SOURCE_DIR = STATIC_DIR / 'images'
+BUILD_DIR = STATIC_DIR / 'build'
+IMAGE_BUILD_DIR = BUILD_DIR / 'images'
+MANIFEST_PATH = IMAGE_BUILD_DIR / 'manifest.json'
+ASSETS_URL = '/assets'
+
+SOURCE_EXTENSIONS = ('.avif', '.webp', '.jpg', '.jpeg', '.png')
+
+# Image kind -> (width, height, responsive widths)
+IMAGE_SPECS: Dict[str, Tuple[int, int, Tuple[int, ...]]] = {
+    'hero': (1200, 600, (640, 1200, 1800)),
+    'project': (600, 400, (320, 600, 900)),
+}
+
+# Preferred order: most efficient format first, JPEG last as the universal fallback
+FORMATS: List[Tuple[str, str, Dict]] = [
+    ('avif', 'image/avif', {'quality': 55, 'speed': 6}),
+    ('webp', 'image/webp', {'quality': 80, 'method': 4}),
+    ('jpeg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+]
+
+# Colour pairs for generated artwork, keyed by image key
+PALETTES: Dict[str, Tuple[str, str]] = {
+    'hero': ('#1d4ed8', '#7c3aed'),
+    'computer_vision': ('#0f766e', '#2563eb'),
+    'nlp': ('#7c3aed', '#db2777'),
+    'data_science': ('#0369a1', '#10b981'),
+    'generative_ai': ('#c026d3', '#f59e0b'),
+    'reinforcement_learning': ('#1e40af', '#059669'),
+    'mlops': ('#334155', '#2563eb'),
+}
+DEFAULT_PALETTE = ('#1e3a8a', '#4c1d95')
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """A single encoded rendition of an image"""
+    url: str
+    width: int
+    height: int
+    format: str
+    mime_type: str
+
+
+@dataclass(frozen=True)
+class ImageAsset:
+    """All renditions of one image key"""
+    key: str
+    width: int
+    height: int
+    variants: Tuple[ImageVariant, ...]
+    dominant_color: str = '#1f2937'
+    placeholder: str = ''
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ImageAsset':
+        variants = tuple(ImageVariant(**variant) for variant in data.pop('variants'))
+        return cls(variants=variants, **data)
+
+    def formats(self) -> List[str]:
+        return [name for name, _, _ in FORMATS if any(v.format == name for v in self.variants)]
+
+    def srcset(self, image_format: str) -> str:
+        return ', '.join(f'{v.url} {v.width}w' for v in self.variants if v.format == image_format)
+
+    def url(self, width: Optional[int] = None, image_format: str = 'jpeg') -> str:
+        """
+        Pick the smallest variant at least as wide as requested.
+
+        Args:
+            width: Desired width (defaults to the nominal width)
+            image_format: Encoded format to return
+
+        Returns:
+            URL of the best matching variant
+        """
+        width = width or self.width
+        candidates = sorted((v for v in self.variants if v.format == image_format), key=lambda v: v.width)
+        for variant in candidates:
+            if variant.width >= width:
+                return variant.url
+        return candidates[-1].url
+
+    @cached_property
+    def src(self) -> str:
+        return self.url(self.width, 'jpeg')
+
+    def picture_html(self, *, classes: str = '', alt: str = '', sizes: str = '100vw', lazy: bool = False) -> str:
+        """Render a ``<picture>`` element offering every format and width, deferred until near the viewport if ``lazy``."""
+        sources = ''.join(
+            f'<source type="{mime}" srcset="{self.srcset(name)}" sizes="{escape(sizes)}">'
+            for name, mime, _ in FORMATS if name != 'jpeg' and name in self.formats()
+        )
+        # The blurred placeholder and the intrinsic size keep the layout stable while the image loads
+        placeholder = f'background: {self.dominant_color} url({self.placeholder}) center / cover no-repeat'
+        loading = 'loading="lazy" ' if lazy else ''
+        return (
+            f'<picture>{sources}'
+            f'<img class="{classes}" src="{self.src}" srcset="{self.srcset("jpeg")}" sizes="{escape(sizes)}" '
+            f'width="{self.width}" height="{self.height}" alt="{escape(alt)}" decoding="async" '
+            f'{loading}style="{placeholder}">'
+            '</picture>'
+        )
+
+    def css_background(self) -> str:
+        """CSS declarations using ``image-set()`` with a plain JPEG fallback."""
+        options = ', '.join(
+            f'url({self.url(self.width, name)}) type("{mime}")'
+            for name, mime, _ in FORMATS if name in self.formats()
+        )
+        return (f'background-color: {self.dominant_color}; '
+                f'background-image: url({self.src}); background-image: image-set({options})')
+
+    def preload_html(self) -> str:
+        """
+        Preload link for the image used by ``css_background()``, so it is fetched before the stylesheet applies.
+
+        Only the preferred format is preloaded; browsers that don't support its type skip the link.
+        """
+        image_format = self.formats()[0]
+        mime = next(mime for name, mime, _ in FORMATS if name == image_format)
+        return (f'<link rel="preload" href="{self.url(self.width, image_format)}" as="image" type="{mime}" '
+                'fetchpriority="high">')
+
+
+def _supported_formats() -> List[Tuple[str, str, Dict]]:
+    from PIL import features
+    return [spec for spec in FORMATS if spec[0] == 'jpeg' or features.check(spec[0])]
+
+
+def _find_source(key: str) -> Optional[Path]:
+    for extension in SOURCE_EXTENSIONS:
+        path = SOURCE_DIR / f'{key}{extension}'
+        if path.exists():
+            return path
+    return None
+
+
+def generate_artwork(key: str, width: int, height: int) -> 'Image.Image':
+    """
+    Draw a deterministic abstract "neural network" artwork for an image key.
+
+    Args:
+        key: Image key, used to seed the layout and pick the palette
+        width: Artwork width
+        height: Artwork height
+
+    Returns:
+        The generated RGB image
+    """
+    from PIL import Image, ImageColor, ImageDraw, ImageFilter
+
+    start, end = (ImageColor.getrgb(colour) for colour in PALETTES.get(key, DEFAULT_PALETTE))
+    gradient = Image.linear_gradient('L')
+    image = Image.blend(gradient.resize((width, height)), gradient.rotate(90).resize((width, height)), 0.5)
+    image = Image.composite(Image.new('RGB', (width, height), end), Image.new('RGB', (width, height), start), image)
+
+    rng = random.Random(hashlib.sha256(key.encode('utf-8')).digest())
+    nodes = [(rng.randint(0, width), rng.randint(0, height)) for _ in range(28)]
+    overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for index, (x, y) in enumerate(nodes):
+        for other_x, other_y in nodes[index + 1:index + 4]:
+            draw.line([(x, y), (other_x, other_y)], fill=(255, 255, 255, 60), width=max(1, width // 400))
+    for x, y in nodes:
+        radius = rng.randint(width // 160 + 2, width // 60 + 4)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=(255, 255, 255, 110))
+    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=1))
+    return Image.alpha_composite(image.convert('RGBA'), overlay).convert('RGB')
+
+
+def _load_source(key: str, width: int, height: int) -> 'Image.Image':
+    from PIL import Image, ImageOps
+    source = _find_source(key)
+    if source is None:
+        return generate_artwork(key, width, height)
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+
+
+def build_image(key: str, kind: str) -> ImageAsset:
+    """
+    Build (or reuse) every variant of an image key.
+
+    Args:
+        key: Image key, e.g. "hero" or a project image type
+        kind: Entry of IMAGE_SPECS describing the size and responsive widths
+
+    Returns:
+        The built image asset
+    """
+    from PIL import Image
+
+    width, height, widths = IMAGE_SPECS[kind]
+    master = _load_source(key, max(widths), max(widths) * height // width)
+    IMAGE_BUILD_DIR.mkdir(parents=True, exist_ok=True)
+
+    variants = []
+    dominant = master.resize((1, 1), Image.BOX).getpixel((0, 0))
+    thumbnail = io.BytesIO()
+    master.resize((16, max(1, 16 * height // width)), Image.BOX).save(thumbnail, format='WEBP', quality=40)
+    placeholder = 'data:image/webp;base64,' + base64.b64encode(thumbnail.getvalue()).decode('ascii')
+    for variant_width in widths:
+        variant_height = variant_width * height // width
+        resized = master.resize((variant_width, variant_height), Image.LANCZOS)
+        for name, mime, options in _supported_formats():
+            buffer = io.BytesIO()
+            resized.save(buffer, format=name.upper(), **options)
+            data = buffer.getvalue()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            extension = 'jpg' if name == 'jpeg' else name
+            filename = f'{key}-{variant_width}w.{digest}.{extension}'
+            path = IMAGE_BUILD_DIR / filename
+            if not path.exists():
+                path.write_bytes(data)
+            variants.append(ImageVariant(f'{ASSETS_URL}/images/{filename}', variant_width, variant_height, name, mime))
+    return ImageAsset(key, width, height, tuple(variants), '#{:02x}{:02x}{:02x}'.format(*dominant), placeholder)
+
+
+def placeholder_asset(key: str, kind: str) -> ImageAsset:
+    """
+    Stand-in for an image that is still being built: an inline gradient in the key's palette.
+
+    Args:
+        key: Image key, picks the palette
+        kind: Entry of IMAGE_SPECS giving the size, so the layout doesn't shift once the image is built
+
+    Returns:
+        An asset with a single inline SVG variant, listed as the JPEG fallback so it renders like any other
+    """
+    width, height, _ = IMAGE_SPECS[kind]
+    start, end = PALETTES.get(key, DEFAULT_PALETTE)
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+           f'<linearGradient id="g" x2="1" y2="1"><stop stop-color="{start}"/><stop offset="1" stop-color="{end}"/>'
+           '</linearGradient><rect width="100%" height="100%" fill="url(#g)"/></svg>')
+    # Fully percent-encoded: no commas to break srcset, no quotes or parentheses to break attributes and url()
+    url = 'data:image/svg+xml,' + quote(svg, safe='')
+    return ImageAsset(key, width, height, (ImageVariant(url, width, height, 'jpeg', 'image/svg+xml'),), start)
+
+
+def build_images(keys: Iterable[Tuple[str, str]]) -> Dict[str, ImageAsset]:
+    """
+    Build every requested image.
+
+    Args:
+        keys: Pairs of (image key, image kind)
+
+    Returns:
+        Mapping of image key to its asset
+    """
+    assets = {}
+    for key, kind in keys:
+        assets[key] = build_image(key, kind)
+        logging.info(f'Built image "{key}" with {len(assets[key].variants)} variants')
+    return assets
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, ImageAsset]:
+    """
+    Read a previously built manifest.
+
+    Args:
+        path: Manifest location
+
+    Returns:
+        Mapping of image key to its asset, empty if there is no usable manifest
+    """
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assets = {key: ImageAsset.from_dict(entry) for key, entry in data['images'].items()}
+    except FileNotFoundError:
+        return {}
+    except (ValueError, KeyError, TypeError) as e:
+        logging.warning(f'Ignoring invalid image manifest {path}: {e}')
+        return {}
+    # Drop entries whose files were removed since the manifest was written
+    return {key: asset for key, asset in assets.items()
+            if all((IMAGE_BUILD_DIR / Path(variant.url).name).exists() for variant in asset.variants)}
+
+
+def write_manifest(assets: Dict[str, ImageAsset], path: Path = MANIFEST_PATH) -> None:
+    """
+    Persist built assets so later processes can load them without re-encoding.
+
+    Args:
+        assets: Mapping of image key to its asset
+        path: Manifest location
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'images': {key: asset.to_dict() for key, asset in sorted(assets.items())}}
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    temporary.replace(path)
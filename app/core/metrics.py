@@ -0,0 +1,339 @@
+"""
+Request-level metrics for the AI Engineer Portfolio, in the Prometheus text format.
+
+The hot path only does arithmetic on pre-allocated series: every route gets
+its latency histogram, size histogram and status counters the first time it
+is hit, keyed by the route object itself, so recording a request allocates
+no label tuples or strings. Values that already exist elsewhere (NiceGUI
+clients, cache counters) are read by collectors when ``/metrics`` is scraped.
+
+Updates are not locked; a render timed in a worker thread may rarely lose an
+increment, which is acceptable for metrics.
+"""
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from nicegui import Client, app, core
+
+from app.core.fragment_cache import fragment_cache
+from app.core.sessions import session_manager
+from app.services.project_search import project_search
+
+# Seconds; the same buckets serve requests and section renders
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Response body bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class CounterValue:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class HistogramValue:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A metric family: one series per label combination, created once and reused"""
+
+    type = 'untyped'
+    suffix = ''  # appended to the name of every sample, e.g. _total for counters
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.series: Dict[Tuple[str, ...], object] = {}
+
+    def _new(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The series for these label values; keep the result instead of calling this per event."""
+        series = self.series.get(values)
+        if series is None:
+            series = self.series[values] = self._new()
+        return series
+
+    def expose(self) -> Iterator[str]:
+        yield f'# HELP {self.name}{self.suffix} {self.documentation}'
+        yield f'# TYPE {self.name}{self.suffix} {self.type}'
+        for values, series in self.series.items():
+            yield from self._samples(dict(zip(self.label_names, values)), series)
+
+    def _samples(self, labels: Dict[str, str], series) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = 'counter'
+    suffix = '_total'
+
+    def _new(self) -> CounterValue:
+        return CounterValue()
+
+    def _samples(self, labels: Dict[str, str], series: CounterValue) -> Iterator[str]:
+        yield f'{self.name}{self.suffix}{_labels(labels)} {_number(series.value)}'
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+
+    def _new(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def _samples(self, labels: Dict[str, str], series: HistogramValue) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, '+Inf'), series.counts):
+            cumulative += count
+            le = bound if isinstance(bound, str) else _number(bound)
+            yield f'{self.name}_bucket{_labels({**labels, "le": le})} {cumulative}'
+        yield f'{self.name}_sum{_labels(labels)} {_number(series.sum)}'
+        yield f'{self.name}_count{_labels(labels)} {series.count}'
+
+
+class Collected(Metric):
+    """A metric whose samples are read from elsewhere when scraped"""
+
+    def __init__(self, name: str, documentation: str, type: str, collect: Callable[[], Iterable[Sample]]):
+        super().__init__(name, documentation)
+        self.type = type
+        self.suffix = '_total' if type == 'counter' else ''
+        self.collect = collect
+
+    def expose(self) -> Iterator[str]:
+        yield f'# HELP {self.name}{self.suffix} {self.documentation}'
+        yield f'# TYPE {self.name}{self.suffix} {self.type}'
+        for labels, value in self.collect():
+            yield f'{self.name}{self.suffix}{_labels(labels)} {_number(value)}'
+
+
+class Registry:
+    """Metrics exposed together on ``/metrics``"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def collect(self, name: str, documentation: str, type: str = 'gauge'):
+        """Decorator registering a function that returns ``(labels, value)`` samples at scrape time."""
+        def decorator(function: Callable[[], Iterable[Sample]]) -> Callable[[], Iterable[Sample]]:
+            self.register(Collected(name, documentation, type, function))
+            return function
+        return decorator
+
+    def expose(self) -> str:
+        """All metrics in the text exposition format."""
+        return '\n'.join(line for metric in self.metrics for line in metric.expose()) + '\n'
+
+
+registry = Registry()
+
+request_seconds = registry.histogram(
+    'portfolio_http_request_duration_seconds', 'Time to serve HTTP requests, by route', ['route'])
+response_bytes = registry.histogram(
+    'portfolio_http_response_size_bytes', 'Response body sizes, by route', ['route'], SIZE_BUCKETS)
+responses = registry.counter(
+    'portfolio_http_responses', 'HTTP responses, by route and status class', ['route', 'status'])
+websocket_connections = registry.counter(
+    'portfolio_websocket_connections', 'Websocket connections opened')
+websocket_opened = websocket_connections.labels()
+socket_messages = registry.counter(
+    'portfolio_socketio_messages', 'NiceGUI socket.io messages, by direction and type', ['direction', 'type'])
+render_seconds = registry.histogram(
+    'portfolio_render_duration_seconds', 'Time to render page sections and the static page, by section', ['section'])
+
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+
+
+@registry.collect('portfolio_nicegui_clients', 'NiceGUI clients held in memory, by websocket state')
+def _nicegui_clients() -> Iterable[Sample]:
+    clients = [client for client in Client.instances.values() if not client.shared]
+    connected = sum(client.has_socket_connection for client in clients)
+    return [({'state': 'connected'}, connected), ({'state': 'waiting'}, len(clients) - connected)]
+
+
+@registry.collect('portfolio_nicegui_client_bytes', 'Estimated memory of all NiceGUI clients, as of the last sweep')
+def _nicegui_client_bytes() -> Iterable[Sample]:
+    return [({}, session_manager.stats()['bytes'])]
+
+
+@registry.collect('portfolio_session_evictions', 'NiceGUI clients evicted, by reason', 'counter')
+def _session_evictions() -> Iterable[Sample]:
+    return [({'reason': name[len('evicted_'):]}, value)
+            for name, value in session_manager.counters.items() if name.startswith('evicted_')]
+
+
+@registry.collect('portfolio_fragment_cache_lookups', 'Fragment cache lookups, by result', 'counter')
+def _fragment_cache_lookups() -> Iterable[Sample]:
+    return [({'result': 'hit'}, fragment_cache.hits), ({'result': 'miss'}, fragment_cache.misses)]
+
+
+@registry.collect('portfolio_fragment_cache_hit_ratio', 'Share of fragment cache lookups that were hits')
+def _fragment_cache_hit_ratio() -> Iterable[Sample]:
+    lookups = fragment_cache.hits + fragment_cache.misses
+    return [({}, fragment_cache.hits / lookups if lookups else 0.0)]
+
+
+@registry.collect('portfolio_fragment_cache_evictions', 'Fragments evicted from the cache', 'counter')
+def _fragment_cache_evictions() -> Iterable[Sample]:
+    return [({}, fragment_cache.evictions)]
+
+
+@registry.collect('portfolio_project_search_cache_lookups', 'Project search response cache lookups, by result', 'counter')
+def _project_search_cache_lookups() -> Iterable[Sample]:
+    return [({'result': 'hit'}, project_search.hits), ({'result': 'miss'}, project_search.misses)]
+
+
+class RouteSeries:
+    """Pre-allocated series of one route"""
+    __slots__ = ('latency', 'size', 'statuses')
+
+    def __init__(self, label: str):
+        self.latency: HistogramValue = request_seconds.labels(label)
+        self.size: HistogramValue = response_bytes.labels(label)
+        self.statuses: List[CounterValue] = [responses.labels(label, status) for status in STATUS_CLASSES]
+
+
+def _route_label(scope) -> str:
+    route = scope.get('route')
+    if route is not None and hasattr(route, 'path'):
+        return route.path  # the template, e.g. /_nicegui/{key}/static/{path}, never the raw path
+    return scope.get('root_path') or 'unmatched'  # mounts (static files, socket.io) or no route at all
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, response size and status of every HTTP request, per route"""
+
+    def __init__(self, app):
+        self.app = app
+        # Keyed by the id of the matched route or mounted app (both live as long as the app, and
+        # FastAPI routes are not hashable), so series are looked up without building labels
+        self.routes: Dict[int, RouteSeries] = {}
+        self.unmatched = RouteSeries('unmatched')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            if scope['type'] == 'websocket':
+                websocket_opened.inc()
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_and_measure(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            route = scope.get('route') or scope.get('endpoint')
+            series = self.routes.get(id(route)) if route is not None else self.unmatched
+            if series is None:
+                series = self.routes[id(route)] = RouteSeries(_route_label(scope))
+            series.latency.observe(time.perf_counter() - start)
+            series.size.observe(size)
+            series.statuses[min(max(status // 100, 1), 5) - 1].inc()
+
+
+def timed(section: str) -> Callable[[Callable], Callable]:
+    """Decorator recording the duration of every call of a renderer in ``render_seconds``, labelled ``section``."""
+    series = render_seconds.labels(section)
+
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                series.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def install() -> None:
+    """Add the request middleware and count NiceGUI socket.io messages in both directions."""
+    app.add_middleware(MetricsMiddleware)
+
+    handlers = core.sio.handlers['/']
+    handle_event = handlers['event']
+    incoming = socket_messages.labels('in', 'event')
+
+    def on_event(sid: str, msg: Dict) -> Optional[object]:
+        incoming.inc()
+        return handle_event(sid, msg)
+
+    handlers['event'] = on_event
+
+    emit = core.sio.emit
+    outgoing: Dict[str, CounterValue] = {}
+
+    async def counting_emit(event: str, *args, **kwargs):
+        counter = outgoing.get(event)
+        if counter is None:
+            counter = outgoing[event] = socket_messages.labels('out', event)
+        counter.inc()
+        return await emit(event, *args, **kwargs)
+
+    core.sio.emit = counting_emit
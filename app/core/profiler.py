@@ -0,0 +1,192 @@
+"""
+Opt-in render profiler for the NiceGUI page.
+
+A profiled render records, for every section builder, its wall time, the
+number of elements it created and the bytes those elements add to the page
+payload, and logs the breakdown. Sections the dynamic page defers are
+reported as placeholders; the fragments they are later fetched as are
+rendered without the fragment cache while profiling, so their real cost is
+reported too, both on the page and on ``/api/sections`` requests. A sampled fraction of profiled renders also
+runs under cProfile and writes a ``.prof`` file (open it with ``snakeviz`` or
+turn it into a flame graph with ``flameprof``).
+
+Profiling is enabled for every render with ``RENDER_PROFILE=1`` or for a
+single request with ``?profile=<RENDER_PROFILE_TOKEN>``; admin requests are
+always dumped. Off, a section call costs one context variable lookup.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from nicegui import json, ui
+from starlette.requests import Request
+
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'profiles'
+
+
+@dataclass
+class SectionProfile:
+    """Cost of one section builder call"""
+    name: str
+    milliseconds: float
+    elements: int
+    bytes: int
+    kind: str = 'section'  # "section", "placeholder" for a deferred section, or "fragment" for rendered HTML
+
+
+@dataclass
+class RenderProfile:
+    """Cost of one page render, section by section"""
+    path: str
+    sections: List[SectionProfile] = field(default_factory=list)
+    dump: Optional[Path] = None
+
+    def summary(self) -> str:
+        # Fragments rendered by a section builder are already part of its time
+        timed = [s for s in self.sections if s.kind != 'fragment'] or self.sections
+        total = sum(section.milliseconds for section in timed)
+        parts = ', '.join(f'{s.name}{"" if s.kind == "section" else f" ({s.kind})"} '
+                          f'{s.milliseconds:.1f} ms/{s.elements} el/{s.bytes} B' for s in self.sections)
+        return f'Render profile {self.path}: {total:.1f} ms in sections ({parts})' + \
+            (f', cProfile written to {self.dump}' if self.dump else '')
+
+
+_active: ContextVar[Optional[RenderProfile]] = ContextVar('render_profile', default=None)
+
+
+class RenderProfiler:
+    """Decides which renders are profiled and measures their section builders"""
+
+    def __init__(self, enabled: bool = False, token: str = '', sample_rate: float = 0.1,
+                 directory: Path = DEFAULT_PROFILE_DIR):
+        """
+        Args:
+            enabled: Profile every render
+            token: Secret that enables profiling for a request passing it as ``?profile=``
+            sample_rate: Fraction of profiled renders (besides admin requests) also dumped with cProfile
+            directory: Where cProfile dumps are written
+        """
+        self.enabled = enabled
+        self.token = token
+        self.sample_rate = sample_rate
+        self.directory = Path(directory)
+
+    @classmethod
+    def from_env(cls) -> 'RenderProfiler':
+        return cls(
+            enabled=os.getenv('RENDER_PROFILE', '0') != '0',
+            token=os.getenv('RENDER_PROFILE_TOKEN', ''),
+            sample_rate=float(os.getenv('RENDER_PROFILE_SAMPLE', 0.1)),
+            directory=Path(os.getenv('RENDER_PROFILE_DIR', DEFAULT_PROFILE_DIR)),
+        )
+
+    def _requested(self, request: Request) -> bool:
+        value = request.query_params.get('profile')
+        return bool(self.token and value and hmac.compare_digest(value, self.token))
+
+    def profile(self, request: Request):
+        """
+        Context manager around a page render; profiles it if enabled or requested by an admin.
+
+        Args:
+            request: The page request
+        """
+        if not self.enabled and not self.token:
+            return nullcontext()
+        requested = self._requested(request)
+        if not self.enabled and not requested:
+            return nullcontext()
+        return self._profile(request.url.path, dump=requested or random.random() < self.sample_rate)
+
+    @contextmanager
+    def _profile(self, path: str, dump: bool) -> Iterator[RenderProfile]:
+        report = RenderProfile(path)
+        profiler = cProfile.Profile() if dump else None
+        token = _active.set(report)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield report
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                report.dump = self._dump(profiler)
+            _active.reset(token)
+            logging.info(report.summary())
+
+    def _dump(self, profiler: cProfile.Profile) -> Optional[Path]:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f'render-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{random.randrange(1 << 16):04x}.prof'
+            profiler.dump_stats(path)
+            return path
+        except OSError as e:  # a full or read-only disk must not break the page
+            logging.warning(f'Could not write render profile: {e}')
+            return None
+
+
+def section(function: Optional[Callable] = None, *, placeholder: bool = False) -> Callable:
+    """
+    Measure a section builder while a render is being profiled; a plain call otherwise.
+
+    Use as ``@section``, or as ``@section(placeholder=True)`` for builders that only reserve space
+    for content loaded later, so their timings aren't mistaken for the content's cost.
+    """
+    if function is None:
+        return lambda function: section(function, placeholder=placeholder)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        report = _active.get()
+        if report is None:
+            return function(*args, **kwargs)
+        elements = ui.context.client.elements
+        before = set(elements)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            milliseconds = (time.perf_counter() - start) * 1000
+            created = [element for element_id, element in elements.items() if element_id not in before]
+            size = sum(len(json.dumps(element._to_dict())) for element in created)
+            report.sections.append(SectionProfile(function.__name__, milliseconds, len(created), size,
+                                                  'placeholder' if placeholder else 'section'))
+    return wrapper
+
+
+def is_profiling() -> bool:
+    """Whether the current render is being profiled."""
+    return _active.get() is not None
+
+
+def fragment(name: str, render: Callable[[], str]) -> str:
+    """
+    Render an HTML fragment, recording its time and size while a render is being profiled.
+
+    Args:
+        name: Fragment name shown in the profile
+        render: Produces the fragment
+
+    Returns:
+        The fragment
+    """
+    report = _active.get()
+    if report is None:
+        return render()
+    start = time.perf_counter()
+    html = render()
+    report.sections.append(SectionProfile(name, (time.perf_counter() - start) * 1000, 0,
+                                          len(html.encode('utf-8')), 'fragment'))
+    return html
+
+
+render_profiler = RenderProfiler.from_env()
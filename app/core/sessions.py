@@ -0,0 +1,247 @@
+"""
+NiceGUI client session management for the AI Engineer Portfolio.
+
+Every interactive visit creates a NiceGUI client that keeps its element tree
+in server memory until the browser's websocket goes away. The session
+manager estimates how much memory each client holds, evicts clients that are
+idle, over their own budget or beyond the overall budget (least recently
+active first), and points crawlers at the pre-rendered page instead of
+giving them a client. Bots are recognised by user agent or by repeatedly
+loading the page without ever opening a websocket, counted per address and
+user agent so one scripted client doesn't downgrade everyone sharing its IP.
+"""
+import asyncio
+import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from nicegui import Client, app, core
+from nicegui.element import Element
+from starlette.requests import Request
+
+from app.services.rate_limit import client_ip
+
+# User agents that get the static render: crawlers, link previews and scripted HTTP clients
+BOT_USER_AGENTS = re.compile(
+    r'bot\b|bot/|crawl|spider|slurp|bingpreview|facebookexternalhit|embedly|preview|headless|'
+    r'curl/|wget/|python-|httpx|aiohttp|go-http-client|java/|okhttp|libwww|scrapy',
+    re.IGNORECASE,
+)
+
+# Sent to evicted clients: the page stays readable and reloads on the visitor's next interaction
+RELOAD_ON_RETURN = '''
+    ['visibilitychange', 'pointerdown', 'keydown'].forEach(type => document.addEventListener(type, () => {
+        if (!document.hidden) location.reload();
+    }, {once: true}));
+'''
+
+
+@dataclass(frozen=True)
+class SessionPolicy:
+    """Limits applied to NiceGUI clients"""
+    idle_timeout: float = 900.0  # seconds without any UI event before a connected client is evicted
+    connect_timeout: float = 20.0  # seconds a new client may take to open its websocket
+    max_clients: int = 300
+    max_client_bytes: int = 2 * 1024 * 1024  # estimated memory of a single client
+    memory_budget: int = 128 * 1024 * 1024  # estimated memory of all clients together
+    bot_strikes: int = 2  # clients never connected from one address and user agent before it is a bot (0: never)
+    bot_ttl: float = 3600.0  # seconds an address and user agent stay flagged
+    sweep_interval: float = 15.0
+
+    @classmethod
+    def from_env(cls) -> 'SessionPolicy':
+        return cls(
+            idle_timeout=float(os.getenv('SESSION_IDLE_TIMEOUT', cls.idle_timeout)),
+            max_clients=int(os.getenv('SESSION_MAX_CLIENTS', cls.max_clients)),
+            max_client_bytes=int(os.getenv('SESSION_MAX_CLIENT_BYTES', cls.max_client_bytes)),
+            memory_budget=int(os.getenv('SESSION_MEMORY_BUDGET', cls.memory_budget)),
+            bot_strikes=int(os.getenv('SESSION_BOT_STRIKES', cls.bot_strikes)),
+        )
+
+
+def _deep_size(obj, seen: Set[int]) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif isinstance(obj, Element):
+        size += _deep_size(obj.__dict__, seen)
+    # Anything else (slots, callbacks, shared objects) is counted shallow
+    return size
+
+
+def estimate_client_bytes(client: Client) -> int:
+    """
+    Estimate the memory held by a client's element tree.
+
+    Args:
+        client: NiceGUI client
+
+    Returns:
+        Approximate size in bytes of the client's elements, their props, classes, styles and slots
+    """
+    # References between elements and back to the client are not counted again
+    seen = {id(client), *(id(element) for element in client.elements.values())}
+    total = sys.getsizeof(client) + _deep_size(client.elements, seen)
+    for element in list(client.elements.values()):
+        total += sys.getsizeof(element) + _deep_size(element.__dict__, seen)
+    return total
+
+
+def is_bot_user_agent(user_agent: str) -> bool:
+    return not user_agent or BOT_USER_AGENTS.search(user_agent) is not None
+
+
+class SessionManager:
+    """Measures NiceGUI clients, evicts them according to a policy and downgrades bots"""
+
+    def __init__(self, policy: SessionPolicy = SessionPolicy()):
+        self.policy = policy
+        self.last_active: Dict[str, float] = {}  # client id -> last connect or UI event, for connected clients
+        self.client_bytes: Dict[str, int] = {}
+        # (address, user agent) -> (strikes, last strike), for visitors whose clients never opened a websocket
+        self._strikes: 'OrderedDict[Tuple[str, str], Tuple[int, float]]' = OrderedDict()
+        self.counters: Dict[str, int] = {
+            'evicted_idle': 0, 'evicted_over_budget': 0, 'evicted_memory': 0,
+            'evicted_no_websocket': 0, 'downgraded_bots': 0,
+        }
+
+    def install(self) -> None:
+        """Hook into NiceGUI: track connections and UI events, and sweep clients periodically."""
+        app.on_connect(self._on_connect)
+        handlers = core.sio.handlers['/']
+        handle_event = handlers['event']
+
+        def on_event(sid: str, msg: Dict) -> None:
+            if msg.get('client_id') in self.last_active:
+                self.last_active[msg['client_id']] = time.time()
+            return handle_event(sid, msg)
+
+        handlers['event'] = on_event
+        app.on_startup(self.run)
+
+    def _on_connect(self, client: Client) -> None:
+        self.last_active[client.id] = time.time()
+
+    @staticmethod
+    def _visitor(request: Request) -> Tuple[str, str]:
+        # Browsers behind one NAT or proxy share the address but rarely the exact user agent
+        return client_ip(request), request.headers.get('user-agent', '')[:256]
+
+    def _is_flagged(self, visitor: Tuple[str, str]) -> bool:
+        strikes, last = self._strikes.get(visitor, (0, 0.0))
+        return 0 < self.policy.bot_strikes <= strikes and time.time() - last < self.policy.bot_ttl
+
+    def should_downgrade(self, request: Request) -> bool:
+        """
+        Tell whether a page request should get the static render instead of a NiceGUI client.
+
+        Args:
+            request: Incoming page request
+
+        Returns:
+            Whether the request comes from a bot
+        """
+        if is_bot_user_agent(request.headers.get('user-agent', '')) or self._is_flagged(self._visitor(request)):
+            self.counters['downgraded_bots'] += 1
+            return True
+        return False
+
+    def release(self, client: Client) -> None:
+        """Delete a client that will never connect, once the current page request has finished."""
+        asyncio.get_running_loop().call_soon(self._delete, client)
+
+    def _delete(self, client: Client) -> None:
+        self.last_active.pop(client.id, None)
+        self.client_bytes.pop(client.id, None)
+        if client.id in Client.instances:
+            client.delete()
+
+    def _strike(self, client: Client) -> None:
+        visitor = self._visitor(client.request) if client.request else ('unknown', '')
+        strikes, _ = self._strikes.pop(visitor, (0, 0.0))
+        self._strikes[visitor] = (strikes + 1, time.time())
+        while len(self._strikes) > 10000:
+            self._strikes.popitem(last=False)
+
+    def _select_evictions(self, clients: List[Client], now: float) -> List[Tuple[Client, str]]:
+        evictions: List[Tuple[Client, str]] = []
+        remaining = []
+        for client in clients:
+            if not client.has_socket_connection and client.id not in self.last_active:
+                if now - client.created > self.policy.connect_timeout:
+                    self._strike(client)
+                    evictions.append((client, 'no_websocket'))
+                    continue
+            elif client.has_socket_connection and now - self.last_active.get(client.id, now) > self.policy.idle_timeout:
+                evictions.append((client, 'idle'))
+                continue
+            elif self.client_bytes.get(client.id, 0) > self.policy.max_client_bytes:
+                evictions.append((client, 'over_budget'))
+                continue
+            remaining.append(client)
+
+        # Over the overall limits: evict the least recently active clients first
+        remaining.sort(key=lambda client: self.last_active.get(client.id, client.created))
+        total = sum(self.client_bytes.get(client.id, 0) for client in remaining)
+        while remaining and (len(remaining) > self.policy.max_clients or total > self.policy.memory_budget):
+            client = remaining.pop(0)
+            total -= self.client_bytes.get(client.id, 0)
+            evictions.append((client, 'memory'))
+        return evictions
+
+    async def sweep(self) -> None:
+        """Measure every client and evict the ones the policy rejects."""
+        now = time.time()
+        clients = [client for client in list(Client.instances.values()) if not client.shared]
+        self.client_bytes = {client.id: estimate_client_bytes(client) for client in clients}
+        self.last_active = {client_id: active for client_id, active in self.last_active.items()
+                            if client_id in Client.instances}
+
+        evictions = self._select_evictions(clients, now)
+        for client, reason in evictions:
+            if client.has_socket_connection:
+                client.run_javascript(RELOAD_ON_RETURN)
+        if any(client.has_socket_connection for client, _ in evictions):
+            await asyncio.sleep(1.0)  # let the outbox deliver the reload hook before the client goes away
+        for client, reason in evictions:
+            self._delete(client)
+            self.counters[f'evicted_{reason}'] += 1
+        if evictions:
+            logging.info(f'Evicted {len(evictions)} NiceGUI clients: '
+                         + ', '.join(sorted({reason for _, reason in evictions})))
+
+    async def run(self) -> None:
+        """Sweep clients periodically, until cancelled."""
+        while True:
+            await asyncio.sleep(self.policy.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception:  # the sweep must keep running whatever a client looks like
+                logging.exception('Error while sweeping NiceGUI clients')
+
+    def stats(self) -> Dict[str, int]:
+        """Live client count, estimated memory and eviction counters."""
+        sizes = [size for client_id, size in self.client_bytes.items() if client_id in Client.instances]
+        clients = [client for client in Client.instances.values() if not client.shared]
+        return {
+            'clients': len(clients),
+            'connected': sum(client.has_socket_connection for client in clients),
+            'bytes': sum(sizes),
+            'bytes_per_client': sum(sizes) // len(sizes) if sizes else 0,
+            'max_client_bytes': max(sizes, default=0),
+            'flagged_visitors': sum(self._is_flagged(visitor) for visitor in self._strikes),
+            **self.counters,
+        }
+
+
+session_manager = SessionManager(SessionPolicy.from_env())
@@ -0,0 +1,218 @@
+"""
+Pre-rendered page snapshots for the AI Engineer Portfolio.
+
+A snapshot holds a fully rendered HTML document together with its validators
+(ETag and Last-Modified) and pre-compressed copies, so serving the page is a
+lookup instead of a render. A snapshot can be persisted to disk together
+with a key describing its inputs, so a cold-started server loads the page
+instead of rendering and compressing it. Loaded with ``shared=True`` the
+persisted files are memory-mapped, so worker processes serve one copy from
+the page cache instead of each holding their own.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+from fastapi import Request, Response
+
+from app.core.static_files import pick_encoding
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+Body = Union[bytes, memoryview]
+
+
+def _map(path: Path) -> Body:
+    """Map a file read-only; the mapping stays valid when the file is later replaced."""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''  # empty files can't be mapped
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _write_atomic(path: Path, data: Body) -> None:
+    # Replaced rather than rewritten in place: other processes may have the previous version mapped
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+class SnapshotResponse(Response):
+    """Response whose body may be a memory-mapped buffer"""
+
+    def render(self, content) -> bytes:
+        # Copied per response (middleware expects bytes); the mapping remains the only long-lived copy
+        return bytes(content) if isinstance(content, memoryview) else super().render(content)
+
+
+class PageSnapshot:
+    """Caches a rendered HTML document and serves it with HTTP validators"""
+
+    CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+    def __init__(self, render: Callable[[], str], path: Optional[Path] = None,
+                 key: Optional[Callable[[], str]] = None):
+        """
+        Args:
+            render: Callable returning the full HTML document
+            path: File the snapshot is persisted to after every build (optional)
+            key: Callable describing the render inputs; a persisted snapshot is only
+                 loaded back while its key still matches
+        """
+        self._render = render
+        self.path = Path(path) if path is not None else None
+        self._key = key or (lambda: '')
+        self.body: Body = b''
+        self.gzipped: Body = b''
+        self.brotli: Body = b''
+        self.etag: str = ''
+        self.last_modified: str = ''
+        self.built_at: Optional[float] = None
+        self.shared = False  # serving memory-mapped files instead of an in-memory copy
+        self._build_lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self.built_at is not None
+
+    def build(self) -> None:
+        """Render the document and refresh the validators."""
+        start = time.perf_counter()
+        body = self._render().encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if etag != self.etag:
+            gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+            compressed = brotli.compress(body, quality=11) if brotli is not None else b''
+            built_at = time.time()
+            # Swapped in together, requests served meanwhile from another thread keep seeing a consistent copy
+            self.body, self.gzipped, self.brotli, self.etag = body, gzipped, compressed, etag
+            self.built_at, self.last_modified = built_at, formatdate(built_at, usegmt=True)
+            if self.path is not None:
+                self.save()
+                if self.shared:
+                    self.load(shared=True)
+        logging.info(f'Page snapshot built in {(time.perf_counter() - start) * 1000:.1f} ms '
+                     f'({len(self.body)} bytes, {len(self.gzipped)} gzipped)')
+
+    def ensure_built(self) -> None:
+        """Build the snapshot unless it was already built or loaded from disk."""
+        with self._build_lock:  # the warm-up and the first requests may all ask for it at once
+            if not self.is_built:
+                self.build()
+
+    def _files(self) -> Tuple[Path, Path, Path, Path]:
+        return (self.path, self.path.with_name(self.path.name + '.gz'),
+                self.path.with_name(self.path.name + '.br'), self.path.with_name(self.path.name + '.json'))
+
+    def save(self) -> None:
+        """Persist the snapshot and its validators next to ``path``."""
+        html_path, gzip_path, brotli_path, meta_path = self._files()
+        html_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(html_path, self.body)
+        _write_atomic(gzip_path, self.gzipped)
+        _write_atomic(brotli_path, self.brotli)
+        meta = {'key': self._key(), 'etag': self.etag, 'built_at': self.built_at}
+        # Written last: a snapshot only counts once its metadata exists
+        _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def load(self, shared: bool = False) -> bool:
+        """
+        Load a persisted snapshot if it was built from the current inputs.
+
+        Args:
+            shared: Memory-map the files instead of reading them into this process
+
+        Returns:
+            Whether the snapshot was loaded
+        """
+        if self.path is None:
+            return False
+        html_path, gzip_path, brotli_path, meta_path = self._files()
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            if meta['key'] != self._key():
+                logging.info(f'Ignoring outdated page snapshot {html_path}')
+                return False
+            read = _map if shared else Path.read_bytes
+            body = read(html_path)
+            if '"' + hashlib.sha256(body).hexdigest()[:32] + '"' != meta['etag']:
+                logging.warning(f'Ignoring corrupt page snapshot {html_path}')
+                return False
+            self.body, self.gzipped, self.brotli = body, read(gzip_path), read(brotli_path)
+            self.etag, self.built_at, self.shared = meta['etag'], meta['built_at'], shared
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning(f'Ignoring invalid page snapshot {meta_path}: {e}')
+            return False
+        if brotli is None:
+            self.brotli = b''
+        self.last_modified = formatdate(self.built_at, usegmt=True)
+        logging.info(f'Page snapshot {"mapped" if shared else "loaded"} from {html_path} ({len(self.body)} bytes)')
+        return True
+
+    def share(self) -> None:
+        """Build or load the snapshot, then serve it from memory-mapped files, e.g. before forking workers."""
+        self.ensure_built()
+        if self.path is not None and not self.shared:
+            if not self.load(shared=True):
+                self.save()
+                self.load(shared=True)
+
+    def invalidate(self) -> None:
+        """Rebuild the snapshot, e.g. after the underlying data changed."""
+        with self._build_lock:  # never render twice at once, e.g. alongside a first build
+            self.build()
+
+    def _is_fresh(self, request: Request) -> bool:
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            return self.etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')] \
+                or if_none_match.strip() == '*'
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= int(self.built_at)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def response(self, request: Request) -> Response:
+        """
+        Serve the snapshot, answering conditional requests with 304.
+
+        Builds the snapshot first if needed; on the event loop, run ``ensure_built`` in a
+        thread before calling this instead.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            Response carrying the cached document
+        """
+        self.ensure_built()
+        headers = {
+            'ETag': self.etag,
+            'Last-Modified': self.last_modified,
+            'Cache-Control': self.CACHE_CONTROL,
+            'Vary': 'Accept-Encoding',
+        }
+        if self._is_fresh(request):
+            return SnapshotResponse(status_code=304, headers=headers)
+        available = ('br', 'gzip') if self.brotli else ('gzip',)
+        encoding = pick_encoding(request.headers.get('accept-encoding', ''), available)
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        body = {'br': self.brotli, 'gzip': self.gzipped}.get(encoding, self.body)
+        return SnapshotResponse(body, media_type='text/html; charset=utf-8', headers=headers)
@@ -0,0 +1,201 @@
+"""
+Cold-start instrumentation for the AI Engineer Portfolio.
+
+Machines are stopped when idle, so the first visitor after a pause waits for
+the whole process start. This module times each startup phase (interpreter
+start, imports, data loading, route registration and the first response),
+logs the breakdown once and writes it to ``STARTUP_REPORT`` when that is set.
+
+``python -m app.core.startup check`` starts the server the way a cold machine
+does and exits non-zero when the time to first response exceeds the budget,
+``python -m app.core.startup snapshot`` pre-renders the page snapshot loaded
+at boot in static mode.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Default time-to-first-response budget for the cold start check
+DEFAULT_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 3000))
+
+
+def _process_age() -> float:
+    """Seconds since the process started, 0 where /proc is not available."""
+    try:
+        with open('/proc/self/stat', encoding='ascii') as file:
+            fields = file.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime', encoding='ascii') as file:
+            uptime = float(file.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTimer:
+    """Durations of the startup phases, measured from process start"""
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: ``time.perf_counter()`` value startup is measured from (defaults to process start)
+        """
+        self.origin = time.perf_counter() - _process_age() if origin is None else origin
+        self.phases: Dict[str, float] = {}
+        self.complete = False
+        self._last = self.origin
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(self.phases.values()), 1)
+
+    def mark(self, phase: str) -> None:
+        """
+        Close a phase: record the time since the previous mark.
+
+        Args:
+            phase: Name of the phase that just ended
+        """
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**self.phases, 'total': self.total_ms}
+
+    def finish(self) -> None:
+        """Mark the first response, log the breakdown and write the report file if requested."""
+        self.mark('first_response')
+        self.complete = True
+        logging.info('Startup: ' + ', '.join(f'{phase} {ms:.1f} ms' for phase, ms in self.as_dict().items()))
+        report = os.getenv('STARTUP_REPORT')
+        if report:
+            Path(report).write_text(json.dumps(self.as_dict()), encoding='utf-8')
+
+
+startup_timer = StartupTimer()
+startup_timer.mark('interpreter')
+
+
+class StartupTimingMiddleware:
+    """ASGI middleware that marks the end of startup when the first HTTP response is sent"""
+
+    def __init__(self, app, timer: StartupTimer = startup_timer):
+        self.app = app
+        self.timer = timer
+
+    async def __call__(self, scope, receive, send):
+        if self.timer.complete or scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_mark(message):
+            await send(message)
+            if message['type'] == 'http.response.body' and not message.get('more_body') and not self.timer.complete:
+                self.timer.finish()
+
+        await self.app(scope, receive, send_and_mark)
+
+
+def free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_cold_start(timeout: float = 60.0, env: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """
+    Start the server in a fresh process and time it until the first response.
+
+    Args:
+        timeout: Seconds to wait for the first response
+        env: Extra environment variables for the server
+
+    Returns:
+        The server's phase breakdown plus ``ttfb`` (spawn to the response headers) and ``wall``
+        (spawn to the complete response), both as seen by the client
+    """
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        report = Path(directory) / 'startup.json'
+        server_env = {**os.environ, 'HOST': '127.0.0.1', 'PORT': str(port), 'CONTENT_WATCH': '0',
+                      'STARTUP_REPORT': str(report), **(env or {})}
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, 'main.py'], cwd=ROOT_DIR, env=server_env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f'Server exited with code {process.returncode} before responding')
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(f'No response within {timeout:.0f} s')
+                try:
+                    # A browser user agent, so a dynamic server answers with the page a visitor gets
+                    request = urllib.request.Request(f'http://127.0.0.1:{port}/',
+                                                     headers={'User-Agent': 'Mozilla/5.0 (cold start check)'})
+                    with urllib.request.urlopen(request, timeout=timeout) as response:
+                        ttfb = (time.perf_counter() - started) * 1000
+                        response.read()
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            wall = (time.perf_counter() - started) * 1000
+            while not report.exists() and time.perf_counter() - started < timeout:
+                time.sleep(0.01)
+            phases = json.loads(report.read_text(encoding='utf-8'))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    return {**phases, 'ttfb': round(ttfb, 1), 'wall': round(wall, 1)}
+
+
+def check_budget(budget_ms: float, runs: int = 3) -> bool:
+    """
+    Measure several cold starts and compare the median time to first response with a budget.
+
+    Args:
+        budget_ms: Allowed milliseconds from spawn to first response
+        runs: Number of cold starts to measure
+
+    Returns:
+        Whether the median cold start is within budget
+    """
+    results: List[Dict[str, float]] = [measure_cold_start() for _ in range(runs)]
+    results.sort(key=lambda result: result['wall'])
+    median = results[len(results) // 2]
+    for phase, ms in median.items():
+        print(f'{phase:>16} {ms:8.1f} ms')
+    wall = statistics.median(result['wall'] for result in results)
+    within = wall <= budget_ms
+    print(f'Cold start {wall:.0f} ms (median of {runs}), budget {budget_ms:.0f} ms: {"ok" if within else "OVER BUDGET"}')
+    return within
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cold start tooling for the portfolio server')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    check = subparsers.add_parser('check', help='fail if the time to first response exceeds the budget')
+    check.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    check.add_argument('--runs', type=int, default=3)
+    subparsers.add_parser('snapshot', help='pre-render the page snapshot loaded at boot in static mode')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'check':
+        sys.exit(0 if check_budget(args.budget_ms, args.runs) else 1)
+    else:
+        from app.main import page_snapshot
+        page_snapshot.build()
+        print(f'Page snapshot written to {page_snapshot.path}')
@@ -0,0 +1,179 @@
+"""
+Static file build and serving helpers for the AI Engineer Portfolio.
+
+Generated text assets, such as the stylesheet pruned for the page, are
+fingerprinted with a content hash and written to ``app/static/build``
+together with gzip and Brotli encoded copies. The build output is served
+from ``/assets`` with immutable caching, picking the pre-compressed copy that
+matches the request's ``Accept-Encoding`` so nothing is compressed per
+response.
+"""
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.images import ASSETS_URL, BUILD_DIR
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+# Text assets served with pre-compressed copies; images are handled by app.core.images
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.xml'}
+
+# Encodings in order of preference, with the suffix of their pre-compressed copy
+ENCODINGS: Tuple[Tuple[str, str], ...] = (('br', '.br'), ('gzip', '.gz'))
+
+
+def pick_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """
+    Choose a content coding the client accepts.
+
+    Args:
+        accept_encoding: Value of the request's ``Accept-Encoding`` header
+        available: Codings the response is available in, most preferred first
+
+    Returns:
+        The first available coding the header accepts with a non-zero q-value, or None
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        coding, *params = (part.strip() for part in item.split(';'))
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0  # a malformed weight is no acceptance
+        weights[coding.lower()] = weight
+    for coding in available:
+        if weights.get(coding, weights.get('*', 0.0)) > 0:
+            return coding
+    return None
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from a stylesheet.
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        The minified stylesheet
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def _compress(path: Path, data: bytes) -> None:
+    gz_path = path.with_name(path.name + '.gz')
+    if not gz_path.exists():
+        gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    br_path = path.with_name(path.name + '.br')
+    if brotli is not None and not br_path.exists():
+        br_path.write_bytes(brotli.compress(data, quality=11))
+
+
+def _prune(target: Path, relative: PurePosixPath, keep: int) -> None:
+    # Earlier fingerprints of the same asset, newest first; the most recent ones may still be referenced by open pages
+    fingerprinted = re.compile(re.escape(relative.stem) + r'\.[0-9a-f]{12}' + re.escape(relative.suffix))
+    previous = [path for path in target.parent.iterdir() if path != target and fingerprinted.fullmatch(path.name)]
+    previous.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in previous[keep:]:
+        for stale in (path, *(path.with_name(path.name + suffix) for _, suffix in ENCODINGS)):
+            stale.unlink(missing_ok=True)
+
+
+def write_asset(relative: PurePosixPath, data: bytes, prune: bool = False) -> str:
+    """
+    Write fingerprinted, pre-compressed build output.
+
+    Args:
+        relative: Logical path of the asset, e.g. "css/main.css"
+        data: Asset contents
+        prune: Delete earlier versions of the asset but the previous one, for output rewritten while running
+
+    Returns:
+        The fingerprinted ``/assets`` URL
+    """
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    target = BUILD_DIR / relative.parent / f'{relative.stem}.{digest}{relative.suffix}'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        target.write_bytes(data)
+    elif prune:
+        target.touch()  # current again, e.g. after an edit was reverted
+    _compress(target, data)
+    if prune:
+        _prune(target, relative, keep=1)
+    return f'{ASSETS_URL}/{target.relative_to(BUILD_DIR).as_posix()}'
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Serves content-addressed build output that never changes under a given URL"""
+
+    CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Build output is immutable, so the available encodings of a path never change
+        self._encodings: Dict[str, Tuple[str, ...]] = {}
+
+    def _available_encodings(self, path: str) -> Tuple[str, ...]:
+        if path in self._encodings:
+            return self._encodings[path]
+        encodings = tuple(encoding for encoding, suffix in ENCODINGS if self.lookup_path(path + suffix)[1] is not None)
+        # Only built files are remembered, so requests for missing paths can't grow the cache
+        if self.lookup_path(path)[1] is not None:
+            self._encodings[path] = encodings
+        return encodings
+
+    @staticmethod
+    def _media_type(path: str) -> str:
+        media_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        return f'{media_type}; charset=utf-8' if media_type.startswith('text/') else media_type
+
+    @staticmethod
+    def _pick_encoding(encodings: Tuple[str, ...], scope: Scope) -> Optional[str]:
+        return pick_encoding(Headers(scope=scope).get('accept-encoding', ''), encodings)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if Path(path).suffix in COMPRESSIBLE_SUFFIXES:
+            encodings = self._encodings.get(path)
+            if encodings is None:
+                encodings = await anyio.to_thread.run_sync(self._available_encodings, path)
+            encoding = self._pick_encoding(encodings, scope)
+            if encoding is not None:
+                response = await super().get_response(path + dict(ENCODINGS)[encoding], scope)
+                if response.status_code in (200, 304):
+                    if response.status_code == 200:
+                        response.headers['Content-Type'] = self._media_type(path)
+                        response.headers['Content-Encoding'] = encoding
+                    response.headers['Vary'] = 'Accept-Encoding'
+                    response.headers['Cache-Control'] = self.CACHE_CONTROL
+                    return response
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers['Cache-Control'] = self.CACHE_CONTROL
+            if Path(path).suffix in COMPRESSIBLE_SUFFIXES:
+                response.headers['Vary'] = 'Accept-Encoding'
+        return response
@@ -0,0 +1,295 @@
+"""
+Multi-worker serving for the AI Engineer Portfolio.
+
+NiceGUI runs on a single event loop, so one process uses one core. With
+``WEB_CONCURRENCY`` above 1, ``main.py`` imports the app once, maps the
+pre-rendered page snapshot into memory and forks that many workers, which
+share the imported code and the mapped snapshot instead of each building and
+holding their own.
+
+The supervisor owns the listening socket. It accepts each connection, peeks
+at its first request without consuming it and passes the socket to a worker
+over a Unix socket pair. Connections carrying the worker cookie go to the
+worker that rendered the visitor's NiceGUI page, so the page's websocket
+reaches the client it belongs to; all other connections, including every
+static page request, are spread round-robin. Workers set the cookie on every
+NiceGUI page they render. A websocket that still reaches the wrong worker
+fails its handshake and the page reloads.
+
+On SIGINT (the kill signal ``fly.toml`` sends) or SIGTERM the supervisor stops
+accepting and closes the worker channels; each worker then stops like a
+single server on SIGINT, finishing open requests, closing websockets and
+flushing its contact queue within ``DRAIN_TIMEOUT`` seconds.
+"""
+import asyncio
+import logging
+import os
+import selectors
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+from nicegui import app
+from nicegui.server import Server
+
+WORKER_COOKIE = 'portfolio_worker'
+
+# Seconds the server may take to finish open requests and close websockets on shutdown
+DRAIN_TIMEOUT = float(os.getenv('DRAIN_TIMEOUT', 4))
+
+# Seconds a new connection may take to send its first request before the supervisor drops it
+FIRST_REQUEST_TIMEOUT = 10.0
+
+PEEK_BYTES = 8192
+
+# Workers that exit sooner after starting are failing at startup and are not restarted
+MIN_WORKER_LIFETIME = 5.0
+
+
+class WorkerCookieMiddleware:
+    """ASGI middleware that marks NiceGUI page responses with the worker that holds their client"""
+
+    def __init__(self, app, index: int):
+        self.app = app
+        self.cookie = (b'set-cookie', f'{WORKER_COOKIE}={index}; Path=/; HttpOnly; SameSite=Lax'.encode())
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message['type'] == 'http.response.start' and \
+                    any(name.lower() == b'x-nicegui-content' for name, _ in message.get('headers', [])):
+                message = {**message, 'headers': [*message['headers'], self.cookie]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def sticky_worker(request_head: bytes, workers: int) -> Optional[int]:
+    """
+    Find the worker a connection is pinned to.
+
+    Args:
+        request_head: Beginning of the connection's first request
+        workers: Number of workers
+
+    Returns:
+        Index from the worker cookie, or None if there is no valid one
+    """
+    # Only the headers that arrived with the first segment are seen, which in practice includes the cookie
+    for line in request_head.split(b'\r\n\r\n', 1)[0].split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() != b'cookie':
+            continue
+        for cookie in value.split(b';'):
+            key, _, index = cookie.strip().partition(b'=')
+            if key == WORKER_COOKIE.encode() and index.isdigit() and int(index) < workers:
+                return int(index)
+    return None
+
+
+def _receive_connections(channel: socket.socket) -> None:
+    """Serve the connections the supervisor passes over ``channel`` with this worker's uvicorn server."""
+    server = Server.instance
+    config = server.config
+    loop = asyncio.get_running_loop()
+
+    def create_protocol() -> asyncio.Protocol:
+        return config.http_protocol_class(config=config, server_state=server.server_state,
+                                          app_state=server.lifespan.state)
+
+    def on_readable() -> None:
+        try:
+            message, fds, _, _ = socket.recv_fds(channel, 1, 1)
+        except BlockingIOError:
+            return
+        if not message:  # the supervisor closed the channel: drain and stop
+            loop.remove_reader(channel)
+            server.should_exit = True
+            return
+        for fd in fds:
+            loop.create_task(loop.connect_accepted_socket(create_protocol, socket.socket(fileno=fd)))
+
+    channel.setblocking(False)
+    loop.add_reader(channel, on_readable)
+
+
+def _run_worker(index: int, channel: socket.socket, run: Callable[..., None]) -> None:
+    os.setpgid(0, 0)  # a terminal's Ctrl-C reaches the supervisor only, which then stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # uvicorn needs a listening socket of its own; an abstract Unix socket nobody connects to will do
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(f'\0portfolio-worker-{os.getpid()}')
+    listener.listen()
+    app.add_middleware(WorkerCookieMiddleware, index=index)
+    app.on_startup(lambda: _receive_connections(channel))
+    run(fd=listener.fileno(), workers=1)  # uvicorn would otherwise read WEB_CONCURRENCY itself
+
+
+class Supervisor:
+    """Accepts connections and hands them to forked worker processes"""
+
+    def __init__(self, run: Callable[..., None], workers: int, host: str, port: int):
+        """
+        Args:
+            run: Starts the server in a worker, called with extra uvicorn arguments
+            workers: Number of worker processes
+            host: Address to listen on
+            port: Port to listen on
+        """
+        self.run = run
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.pids: Dict[int, int] = {}  # worker index -> pid
+        self.started: Dict[int, float] = {}  # worker index -> start time
+        self.channels: Dict[int, socket.socket] = {}  # worker index -> supervisor end of its socket pair
+        self.pending: Dict[socket.socket, float] = {}  # accepted connections waiting for their first request
+        self.selector = selectors.DefaultSelector()
+        self.listener: Optional[socket.socket] = None
+        self.stopping = False
+        self._next = 0
+
+    def _spawn(self, index: int) -> None:
+        channel, worker_channel = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self.listener.close()
+                self.selector.close()
+                channel.close()
+                for other in [*self.channels.values(), *self.pending]:
+                    other.close()
+                _run_worker(index, worker_channel, self.run)
+                code = 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                logging.exception(f'Worker {index} failed')
+            finally:
+                os._exit(code)
+        worker_channel.close()
+        self.pids[index] = pid
+        self.started[index] = time.monotonic()
+        self.channels[index] = channel
+        logging.info(f'Started worker {index} (pid {pid})')
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _reap(self) -> None:
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            index = next((i for i, p in self.pids.items() if p == pid), None)
+            if index is None:
+                continue
+            del self.pids[index]
+            channel = self.channels.pop(index, None)
+            if channel is not None:
+                channel.close()
+            if self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if time.monotonic() - self.started[index] < MIN_WORKER_LIFETIME:
+                logging.error(f'Worker {index} failed at startup with status {code}, stopping')
+                self.stopping = True
+            else:
+                logging.warning(f'Worker {index} exited with status {code}, restarting')
+                self._spawn(index)
+
+    def _dispatch(self, connection: socket.socket) -> None:
+        self.selector.unregister(connection)
+        del self.pending[connection]
+        try:
+            head = connection.recv(PEEK_BYTES, socket.MSG_PEEK)
+        except OSError:
+            head = b''
+        if head and self.channels:
+            index = sticky_worker(head, self.workers)
+            if index not in self.channels:
+                alive = sorted(self.channels)
+                index = alive[self._next % len(alive)]
+                self._next += 1
+            try:
+                socket.send_fds(self.channels[index], [b'c'], [connection.fileno()])
+            except OSError as e:
+                logging.warning(f'Could not pass a connection to worker {index}: {e}')
+        connection.close()  # the worker holds its own descriptor now
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            self.pending[connection] = time.monotonic()
+            self.selector.register(connection, selectors.EVENT_READ)
+
+    def _expire_pending(self) -> None:
+        now = time.monotonic()
+        for connection, accepted in list(self.pending.items()):
+            if now - accepted > FIRST_REQUEST_TIMEOUT:
+                self.selector.unregister(connection)
+                del self.pending[connection]
+                connection.close()
+
+    def _drain(self) -> None:
+        logging.info(f'Stopping {len(self.pids)} workers')
+        self.selector.unregister(self.listener)
+        self.listener.close()
+        for connection in list(self.pending):
+            connection.close()
+        self.pending.clear()
+        for channel in self.channels.values():
+            channel.close()  # workers see the channel close and shut down gracefully
+        self.channels.clear()
+        deadline = time.monotonic() + DRAIN_TIMEOUT + 1.0
+        while self.pids and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for index, pid in self.pids.items():
+            logging.warning(f'Worker {index} did not stop in time, killing it')
+            os.kill(pid, signal.SIGKILL)
+
+    def serve(self) -> None:
+        """Start the workers and dispatch connections until SIGINT or SIGTERM."""
+        self.listener = socket.create_server((self.host, self.port), backlog=2048)
+        self.listener.setblocking(False)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for index in range(self.workers):
+            self._spawn(index)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        logging.info(f'Dispatching connections on http://{self.host}:{self.port} to {self.workers} workers')
+        while not self.stopping:
+            for key, _ in self.selector.select(timeout=0.5):
+                if key.fileobj is self.listener:
+                    self._accept()
+                else:
+                    self._dispatch(key.fileobj)
+            self._expire_pending()
+            self._reap()
+        self._drain()
+
+
+def serve(run: Callable[..., None], workers: int, host: str, port: int) -> None:
+    """
+    Serve the app with several worker processes.
+
+    Args:
+        run: Starts the server in a worker, called with extra uvicorn arguments
+        workers: Number of worker processes
+        host: Address to listen on
+        port: Port to listen on
+    """
+    Supervisor(run, workers, host, port).serve()
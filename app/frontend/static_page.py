@@ -0,0 +1,327 @@
+"""
+Static HTML rendering for the AI Engineer Portfolio.
+
+This module renders the page sections of ``app/main.py`` as plain HTML
+strings, so the page can be rendered once and served without creating a
+NiceGUI client per visitor, and the interactive page can reuse the cached
+fragments instead of building their element trees. The markup reuses the same Tailwind utilities and
+``main.css`` classes as the interactive page.
+"""
+from html import escape
+from typing import Callable, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from nicegui import __version__ as nicegui_version
+
+from app.core.images import ImageAsset
+from app.models.portfolio import Portfolio, Project
+from app.services.project_search import SearchPage
+
+NICEGUI_STATIC = f'/_nicegui/{nicegui_version}/static'
+
+# Route of the NiceGUI page that hosts the interactive contact form
+CONTACT_FORM_PATH = '/contact-form'
+
+# Route of the searchable project catalogue
+PROJECTS_PATH = '/projects'
+
+
+def _label(text: str, classes: str = '') -> str:
+    return f'<div class="{classes}">{escape(text)}</div>'
+
+
+def _section_title(text: str, extra: str = '') -> str:
+    return _label(text, f'text-2xl md:text-3xl font-bold section-title {extra}'.strip())
+
+
+def render_navigation(portfolio: Portfolio) -> str:
+    links = [('Home', '#'), ('Projects', '#projects'), ('Skills', '#skills'),
+             ('Experience', '#experience'), ('Contact', '#contact')]
+    items = ''.join(f'<a class="nicegui-link text-white hover:text-blue-300" href="{href}">{text}</a>'
+                    for text, href in links)
+    return (
+        '<header class="nicegui-header bg-gray-900 text-white sticky top-0 z-10">'
+        '<div class="flex justify-between items-center py-2 w-full">'
+        + _label('AI Engineer Portfolio', 'text-xl font-bold')
+        + f'<nav class="nicegui-row gap-4">{items}</nav>'
+        '</div></header>'
+    )
+
+
+def render_hero_section(portfolio: Portfolio, hero_image: ImageAsset) -> str:
+    info = portfolio.personal_info
+    return (
+        '<div class="hero-section">'
+        f'<div class="hero-bg" style=\'{hero_image.css_background()}\'></div>'
+        '<div class="hero-overlay"></div>'
+        '<div class="hero-content text-center">'
+        + _label(info.name, 'text-3xl md:text-4xl font-bold mb-2')
+        + _label(info.title, 'text-xl md:text-2xl mb-6')
+        + f'<div class="nicegui-markdown max-w-2xl mx-auto mb-8"><p>{escape(info.bio)}</p></div>'
+        '<div class="nicegui-row justify-center gap-4">'
+        '<a class="q-btn btn-primary" href="#projects">View Projects</a>'
+        '<a class="q-btn btn-outline" href="#contact">Contact Me</a>'
+        '</div></div></div>'
+    )
+
+
+def render_project_card(project: Project, image: ImageAsset, image_sizes: str) -> str:
+    tags = ''.join(_label(tag, 'project-tag') for tag in project.tags)
+    return (
+        '<div class="q-card nicegui-card project-card">'
+        + image.picture_html(classes='project-image', alt=project.title, sizes=image_sizes, lazy=True) +
+        '<div class="q-card__section q-card__section--vert project-content">'
+        + _label(project.title, 'project-title')
+        + _label(project.description, 'project-description')
+        + f'<div class="project-tags">{tags}</div>'
+        '<div class="nicegui-row justify-between items-center mt-4">'
+        f'<a class="nicegui-link text-blue-400 hover:text-blue-300" href="{escape(project.link)}">View Details</a>'
+        '</div></div></div>'
+    )
+
+
+def _project_grid(cards: Sequence[str]) -> str:
+    return ('<div class="nicegui-grid grid gap-6" style="grid-template-columns: repeat(3, minmax(0, 1fr))">'
+            + ''.join(cards) + '</div>')
+
+
+def render_projects_section(portfolio: Portfolio, project_images: List[ImageAsset], image_sizes: str,
+                            limit: Optional[int] = None) -> str:
+    projects = portfolio.projects[:limit]
+    more = ''
+    if len(portfolio.projects) > len(projects):
+        more = (f'<div class="nicegui-row justify-center mt-8"><a class="q-btn btn-outline" href="{PROJECTS_PATH}">'
+                f'Browse all {len(portfolio.projects)} projects</a></div>')
+    return (
+        '<section class="py-16" id="projects"><div class="portfolio-container">'
+        + _section_title('Featured Projects')
+        + _project_grid([render_project_card(project, image, image_sizes)
+                         for project, image in zip(projects, project_images)])
+        + more
+        + '</div></section>'
+    )
+
+
+def _projects_url(query: str, tags: Sequence[str], page: int = 1) -> str:
+    params = ([('q', query)] if query else []) + [('tag', tag) for tag in tags] + ([('page', page)] if page > 1 else [])
+    return PROJECTS_PATH + (f'?{urlencode(params)}' if params else '')
+
+
+def render_projects_page(results: SearchPage, query: str, selected_tags: Sequence[str],
+                         tags: Sequence[Tuple[str, int]], image: Callable[[Project], ImageAsset],
+                         image_sizes: str) -> str:
+    """
+    Render the searchable project catalogue: search form, tag filters, one page of results and pagination.
+
+    Args:
+        results: The page of matching projects
+        query: Normalized search text
+        selected_tags: Normalized (lowercase) tags the results are filtered by
+        tags: Every tag of the catalogue with its project count
+        image: Returns the image asset of a project
+        image_sizes: ``sizes`` attribute of the project images
+
+    Returns:
+        The page body
+    """
+    selected = set(selected_tags)
+    hidden = ''.join(f'<input type="hidden" name="tag" value="{escape(tag)}">' for tag in selected_tags)
+    form = (
+        f'<form class="nicegui-row items-center gap-4 mb-6" method="get" action="{PROJECTS_PATH}" role="search">'
+        f'<input class="bg-gray-800 text-white rounded-lg px-4 py-2 flex-grow" type="search" name="q" '
+        f'value="{escape(query)}" placeholder="Search projects" aria-label="Search projects">{hidden}'
+        '<button class="q-btn btn-primary" type="submit">Search</button></form>'
+    )
+    chips = []
+    for name, count in tags:
+        key = name.lower()
+        toggled = [tag for tag in selected_tags if tag != key] if key in selected else [*selected_tags, key]
+        active = ' ring-2 ring-blue-400' if key in selected else ''
+        chips.append(f'<a class="project-tag{active}" style="text-decoration: none" '
+                     f'href="{escape(_projects_url(query, sorted(toggled)))}" '
+                     f'aria-pressed="{str(key in selected).lower()}">{escape(name)} ({count})</a>')
+    pages = []
+    if results.page > 1:
+        pages.append(f'<a class="q-btn btn-outline" rel="prev" '
+                     f'href="{escape(_projects_url(query, selected_tags, results.page - 1))}">Previous</a>')
+    pages.append(_label(f'Page {results.page} of {results.pages}', 'text-gray-400'))
+    if results.page < results.pages:
+        pages.append(f'<a class="q-btn btn-outline" rel="next" '
+                     f'href="{escape(_projects_url(query, selected_tags, results.page + 1))}">Next</a>')
+    count = f'{results.total} project{"" if results.total == 1 else "s"}'
+    return (
+        '<header class="nicegui-header bg-gray-900 text-white sticky top-0 z-10">'
+        '<div class="flex justify-between items-center py-2 w-full">'
+        '<a class="nicegui-link text-xl font-bold text-white" href="/">AI Engineer Portfolio</a>'
+        f'<nav class="nicegui-row gap-4"><a class="nicegui-link text-white hover:text-blue-300" href="/">Home</a></nav>'
+        '</div></header>'
+        '<section class="py-16" id="projects"><div class="portfolio-container">'
+        + _section_title('Projects')
+        + form
+        + f'<div class="project-tags mb-6">{"".join(chips)}</div>'
+        + _label(count, 'text-gray-400 mb-4')
+        + _project_grid([render_project_card(project, image(project), image_sizes) for _, project in results.projects])
+        + f'<div class="nicegui-row justify-center items-center gap-4 mt-8">{"".join(pages)}</div>'
+        '</div></section>'
+    )
+
+
+def render_skills_section(portfolio: Portfolio) -> str:
+    cards = ''.join(
+        '<div class="q-card nicegui-card skill-card">'
+        + _label(skill.icon, 'skill-icon')
+        + _label(skill.name, 'skill-name')
+        + f'<div class="skill-level"><div class="skill-level-fill" style="width: {int(skill.level)}%"></div></div>'
+        '</div>'
+        for skill in portfolio.skills
+    )
+    return (
+        '<section class="py-16 bg-gray-900" id="skills"><div class="portfolio-container">'
+        + _section_title('Skills & Expertise')
+        + f'<div class="nicegui-grid grid gap-4" style="grid-template-columns: repeat(5, minmax(0, 1fr))">{cards}</div>'
+        '</div></section>'
+    )
+
+
+def render_experience_section(portfolio: Portfolio) -> str:
+    experience = ''.join(
+        '<div class="timeline-item"><div class="timeline-dot"></div>'
+        + _label(exp.date, 'timeline-date')
+        + _label(exp.title, 'timeline-title')
+        + _label(exp.company, 'timeline-company')
+        + _label(exp.description, 'timeline-description')
+        + '</div>'
+        for exp in portfolio.experience
+    )
+    education = ''.join(
+        '<div class="timeline-item"><div class="timeline-dot"></div>'
+        + _label(edu.date, 'timeline-date')
+        + _label(edu.degree, 'timeline-title')
+        + _label(edu.institution, 'timeline-company')
+        + '</div>'
+        for edu in portfolio.education
+    )
+    certifications = ''.join(
+        '<div class="q-card nicegui-card skill-card">'
+        + _label('🏆', 'skill-icon')
+        + _label(cert.name, 'skill-name')
+        + _label(f"{cert.issuer} • {cert.date}", 'text-sm text-gray-400')
+        + '</div>'
+        for cert in portfolio.certifications
+    )
+    return (
+        '<section class="py-16" id="experience"><div class="portfolio-container">'
+        + _section_title('Work Experience')
+        + f'<div class="timeline">{experience}</div>'
+        + _section_title('Education', 'mt-12')
+        + f'<div class="timeline">{education}</div>'
+        + _section_title('Certifications', 'mt-12')
+        + f'<div class="nicegui-grid grid gap-4" style="grid-template-columns: repeat(3, minmax(0, 1fr))">{certifications}</div>'
+        '</div></section>'
+    )
+
+
+def _contact_item(icon: str, label: str, value: str) -> str:
+    return (
+        '<div class="contact-item">'
+        f'<div class="contact-icon"><i class="q-icon notranslate material-icons">{icon}</i></div>'
+        '<div>' + _label(label, 'text-sm text-gray-400') + _label(value, 'text-white') + '</div>'
+        '</div>'
+    )
+
+
+def render_contact_card(portfolio: Portfolio) -> str:
+    info = portfolio.personal_info
+    social = info.social
+    socials = ''.join(
+        f'<a class="nicegui-link social-link" style="text-decoration: none;" href="{escape(getattr(social, key))}" '
+        f'target="_blank" rel="noopener"><i class="q-icon notranslate material-icons">{icon}</i></a>'
+        for key, icon in [('github', 'github'), ('linkedin', 'linkedin'), ('twitter', 'twitter'), ('medium', 'edit')]
+    )
+    return (
+        '<div class="q-card nicegui-card bg-gray-800 p-6 rounded-lg">'
+        + _label('Contact Information', 'text-xl font-bold mb-6')
+        + '<div class="space-y-4">'
+        + _contact_item('mail', 'Email', info.email)
+        + _contact_item('phone', 'Phone', info.phone)
+        + _contact_item('map_pin', 'Location', info.location)
+        + '</div>'
+        + _label('Connect With Me', 'text-xl font-bold mt-8 mb-4')
+        + f'<div class="social-links">{socials}</div>'
+        '</div>'
+    )
+
+
+def render_contact_section(portfolio: Portfolio) -> str:
+    return (
+        '<section class="py-16 bg-gray-900" id="contact"><div class="portfolio-container">'
+        + _section_title('Get In Touch')
+        + '<div class="nicegui-grid grid gap-8" style="grid-template-columns: repeat(2, minmax(0, 1fr))">'
+        + render_contact_card(portfolio)
+        # The message form is the only interactive piece, so it is the only part backed by NiceGUI
+        + f'<iframe class="rounded-lg w-full" src="{CONTACT_FORM_PATH}" title="Send Me a Message" '
+        'loading="lazy" style="border: 0; min-height: 520px;"></iframe>'
+        '</div></div></section>'
+    )
+
+
+def render_footer_content(portfolio: Portfolio) -> str:
+    return (
+        '<div class="portfolio-container text-center w-full">'
+        + _label(f'© {2023} {portfolio.personal_info.name} • AI Engineer Portfolio', 'text-gray-400')
+        + _label('Built with Python and NiceGUI', 'text-gray-500 text-sm mt-2')
+        + '</div>'
+    )
+
+
+def render_footer(portfolio: Portfolio) -> str:
+    return (
+        '<footer class="nicegui-footer py-8 bg-gray-900 border-t border-gray-800">'
+        + render_footer_content(portfolio)
+        + '</footer>'
+    )
+
+
+# Closes the head and opens the containers the sections are rendered into
+BODY_START = '</head><body class="body--dark dark"><div class="nicegui-layout"><div class="nicegui-content">'
+
+DOCUMENT_END = '</div></div></body></html>'
+
+
+def render_document_start(*, title: str, head_html: str = '') -> str:
+    """
+    Render the beginning of the document, up to and including ``head_html`` but with the head still open.
+
+    Args:
+        title: Document title
+        head_html: Additional markup for the document head
+
+    Returns:
+        The document's beginning, to be followed by more head markup or ``BODY_START``
+    """
+    return (
+        '<!DOCTYPE html><html lang="en"><head>'
+        '<meta charset="utf-8">'
+        f'<title>{escape(title)}</title>'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<link href="{NICEGUI_STATIC}/nicegui.css" rel="stylesheet" type="text/css">'
+        f'<link href="{NICEGUI_STATIC}/fonts.css" rel="stylesheet" type="text/css">'
+        f'<link href="{NICEGUI_STATIC}/quasar.prod.css" rel="stylesheet" type="text/css">'
+        f'<script src="{NICEGUI_STATIC}/tailwindcss.min.js"></script>'
+        f'{head_html}'
+    )
+
+
+def render_document(body: str, *, title: str, head_html: str = '') -> str:
+    """
+    Wrap rendered sections in a complete HTML document.
+
+    Args:
+        body: Rendered page sections
+        title: Document title
+        head_html: Additional markup for the document head
+
+    Returns:
+        The full HTML document
+    """
+    return render_document_start(title=title, head_html=head_html) + BODY_START + body + DOCUMENT_END
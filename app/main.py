@@ -3,9 +3,20 @@ AI Engineer Portfolio - Main Application Module
 
 This module defines the main pages and components of the AI Engineer Portfolio application.
 """
+import os
 import sys
 import codecs
-from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache, partial
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Set, Tuple
+from fastapi import Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from nicegui import ui, app
 from pathlib import Path
 import asyncio
@@ -17,6 +28,34 @@ if sys.stdout.encoding != 'utf-8':
 
 # Import asset manager
 from app.core.assets import AssetManager
+from app.core.fonts import FONT_MANIFEST_PATH, font_head_html
+from app.core.images import ASSETS_URL, BUILD_DIR, MANIFEST_PATH
+from app.core.critical_css import PageStyles, split_styles
+from app.core import metrics, profiler
+from app.core.fragment_cache import fragment_cache
+from app.core.static_files import ImmutableStaticFiles
+from app.core.sessions import session_manager
+from app.core.snapshot import PageSnapshot
+from app.core.startup import StartupTimingMiddleware, startup_timer
+from app.api import cache as cache_api
+from app.api import contact as contact_api
+from app.api import health as health_api
+from app.api import metrics as metrics_api
+from app.api import projects as projects_api
+from app.api import sections as sections_api
+from app.api import sessions as sessions_api
+from app.frontend import static_page
+from app.models.contact import ContactForm
+from app.models.portfolio import Portfolio
+from app.services.contact import QueueFullError, contact_service
+from app.services.rate_limit import client_ip, contact_guard
+from app.services.content_store import DEFAULT_CONTENT_PATH, ContentStore
+from app.services.project_search import ProjectIndex, normalize_query, project_search
+
+startup_timer.mark('import')
+
+# "dynamic" builds a NiceGUI element tree per visit, "static" serves a pre-rendered snapshot
+RENDER_MODE = os.getenv('RENDER_MODE', 'dynamic').lower()
 
 # Ensure static directory exists
 static_dir = Path(__file__).parent / 'static'
@@ -27,134 +66,21 @@ css_dir.mkdir(exist_ok=True)
 # Add static files directory to NiceGUI
 app.add_static_files('/static', str(static_dir))
 
-# Portfolio data
-PORTFOLIO_DATA = {
-    "personal_info": {
-        "name": "Alex Morgan",
-        "title": "AI Engineer & Machine Learning Specialist",
-        "bio": "Passionate AI Engineer with 5+ years of experience developing cutting-edge machine learning solutions. Specialized in computer vision, NLP, and reinforcement learning with a focus on production-ready AI systems.",
-        "location": "San Francisco, CA",
-        "email": "alex@aiportfolio.com",
-        "phone": "+1 (555) 123-4567",
-        "website": "www.aiportfolio.com",
-        "social": {
-            "github": "github.com/alexmorgan-ai",
-            "linkedin": "linkedin.com/in/alexmorgan-ai",
-            "twitter": "twitter.com/alexmorgan_ai",
-            "medium": "medium.com/@alexmorgan-ai"
-        }
-    },
-    "skills": [
-        {"name": "Machine Learning", "level": 95, "icon": "🧠"},
-        {"name": "Deep Learning", "level": 90, "icon": "🔮"},
-        {"name": "Computer Vision", "level": 85, "icon": "👁️"},
-        {"name": "Natural Language Processing", "level": 90, "icon": "💬"},
-        {"name": "Reinforcement Learning", "level": 80, "icon": "🎮"},
-        {"name": "MLOps", "level": 85, "icon": "⚙️"},
-        {"name": "Python", "level": 95, "icon": "🐍"},
-        {"name": "TensorFlow/PyTorch", "level": 90, "icon": "📊"},
-        {"name": "Data Engineering", "level": 80, "icon": "📈"},
-        {"name": "Cloud AI Services", "level": 85, "icon": "☁️"}
-    ],
-    "projects": [
-        {
-            "title": "Computer Vision for Retail Analytics",
-            "description": "Developed a real-time computer vision system that analyzes in-store customer behavior to optimize product placement and store layout.",
-            "image_type": "computer_vision",
-            "tags": ["Computer Vision", "PyTorch", "Real-time Analytics", "Edge AI"],
-            "link": "#project1"
-        },
-        {
-            "title": "Conversational AI Assistant",
-            "description": "Built an advanced NLP-powered conversational agent that handles customer service inquiries with 92% accuracy, reducing support costs by 35%.",
-            "image_type": "nlp",
-            "tags": ["NLP", "Transformers", "BERT", "Cloud Deployment"],
-            "link": "#project2"
-        },
-        {
-            "title": "Predictive Maintenance System",
-            "description": "Created a machine learning system that predicts equipment failures 2 weeks in advance, reducing downtime by 45% for manufacturing clients.",
-            "image_type": "data_science",
-            "tags": ["Time Series", "Anomaly Detection", "IoT", "Predictive Analytics"],
-            "link": "#project3"
-        },
-        {
-            "title": "Generative AI for Product Design",
-            "description": "Implemented a GAN-based system that generates novel product design concepts based on market trends and brand guidelines.",
-            "image_type": "generative_ai",
-            "tags": ["GANs", "Creative AI", "Product Design", "PyTorch"],
-            "link": "#project4"
-        },
-        {
-            "title": "Reinforcement Learning for Supply Chain",
-            "description": "Developed a reinforcement learning system that optimizes inventory management and logistics, reducing costs by 18%.",
-            "image_type": "reinforcement_learning",
-            "tags": ["Reinforcement Learning", "Supply Chain", "Optimization", "Simulation"],
-            "link": "#project5"
-        },
-        {
-            "title": "MLOps Pipeline for Financial Services",
-            "description": "Designed and implemented an end-to-end MLOps pipeline for a financial services company, enabling continuous training and deployment of fraud detection models.",
-            "image_type": "mlops",
-            "tags": ["MLOps", "CI/CD", "Kubernetes", "Model Monitoring"],
-            "link": "#project6"
-        }
-    ],
-    "experience": [
-        {
-            "title": "Senior AI Engineer",
-            "company": "TechInnovate AI",
-            "date": "2021 - Present",
-            "description": "Lead AI engineer for computer vision and NLP projects. Designed and implemented production ML systems for Fortune 500 clients."
-        },
-        {
-            "title": "Machine Learning Engineer",
-            "company": "DataSmart Solutions",
-            "date": "2018 - 2021",
-            "description": "Developed predictive models for retail and healthcare clients. Implemented MLOps practices that reduced model deployment time by 70%."
-        },
-        {
-            "title": "AI Research Intern",
-            "company": "AI Research Lab",
-            "date": "2017 - 2018",
-            "description": "Conducted research in reinforcement learning algorithms. Published 2 papers in top-tier AI conferences."
-        }
-    ],
-    "education": [
-        {
-            "degree": "M.S. in Computer Science, AI Specialization",
-            "institution": "Stanford University",
-            "date": "2015 - 2017"
-        },
-        {
-            "degree": "B.S. in Computer Science",
-            "institution": "University of California, Berkeley",
-            "date": "2011 - 2015"
-        }
-    ],
-    "certifications": [
-        {
-            "name": "Google Cloud Professional Machine Learning Engineer",
-            "issuer": "Google Cloud",
-            "date": "2022"
-        },
-        {
-            "name": "AWS Certified Machine Learning - Specialty",
-            "issuer": "Amazon Web Services",
-            "date": "2021"
-        },
-        {
-            "name": "Deep Learning Specialization",
-            "issuer": "Coursera (Andrew Ng)",
-            "date": "2020"
-        }
-    ]
-}
+# Serve content-addressed build output (image variants, the pruned stylesheet) with immutable caching
+app.mount(ASSETS_URL, ImmutableStaticFiles(directory=BUILD_DIR, check_dir=False), name='assets')
+
+# Portfolio content, loaded from a file and reloaded when it changes
+content_store = ContentStore(Path(os.getenv('PORTFOLIO_CONTENT', DEFAULT_CONTENT_PATH)))
+content_store.load()
+
+# Search index over the project catalogue, rebuilt with the content
+project_search.rebuild(content_store.portfolio.projects, content_store.section_versions['projects'])
 
 # Create navigation component
+@profiler.section
 def create_navigation():
     with ui.header().classes('bg-gray-900 text-white'):
-        with ui.container().classes('flex justify-between items-center py-2'):
+        with ui.element('div').classes('flex justify-between items-center py-2'):
             ui.label('AI Engineer Portfolio').classes('text-xl font-bold')
             with ui.row().classes('gap-4'):
                 ui.link('Home', '#').classes('text-white hover:text-blue-300')
@@ -164,166 +90,155 @@ def create_navigation():
                 ui.link('Contact', '#contact').classes('text-white hover:text-blue-300')
 
 # Create hero section
+@profiler.section
 def create_hero_section():
-    hero_image = AssetManager.get_hero_image()
+    portfolio = content_store.portfolio
+    hero_image = AssetManager.get_hero_asset()
     
     with ui.element('div').classes('hero-section'):
-        ui.element('div').classes('hero-bg').style(f'background-image: url({hero_image})')
+        ui.element('div').classes('hero-bg').style(hero_image.css_background())
         ui.element('div').classes('hero-overlay')
         with ui.element('div').classes('hero-content text-center'):
-            ui.label(PORTFOLIO_DATA["personal_info"]["name"]).classes('text-3xl md:text-4xl font-bold mb-2')
-            ui.label(PORTFOLIO_DATA["personal_info"]["title"]).classes('text-xl md:text-2xl mb-6')
-            ui.markdown(PORTFOLIO_DATA["personal_info"]["bio"]).classes('max-w-2xl mx-auto mb-8')
+            ui.label(portfolio.personal_info.name).classes('text-3xl md:text-4xl font-bold mb-2')
+            ui.label(portfolio.personal_info.title).classes('text-xl md:text-2xl mb-6')
+            ui.markdown(portfolio.personal_info.bio).classes('max-w-2xl mx-auto mb-8')
             with ui.row().classes('justify-center gap-4'):
                 ui.button('View Projects', on_click=lambda: ui.navigate('#projects')).classes('btn-primary')
                 ui.button('Contact Me', on_click=lambda: ui.navigate('#contact')).classes('btn-outline')
 
+# Rendered width of project images in the three-column grid
+PROJECT_IMAGE_SIZES = '(max-width: 768px) 100vw, 400px'
+
+# Projects shown on the home page, the whole catalogue is searchable at /projects
+FEATURED_PROJECTS = 6
+
+# Sections below the fold and the height reserved for them until they are loaded
+LAZY_SECTIONS = {'projects': 1200, 'skills': 640, 'experience': 1600, 'contact': 720}
+
+# Placeholder the page script replaces with the section fetched from /api/sections
+def lazy_section_html(name: str) -> str:
+    return (f'<section id="{name}" class="lazy-section" data-src="{sections_api.section_url(name)}" '
+            f'style="min-height: {LAZY_SECTIONS[name]}px"></section>')
+
 # Create projects section
+@profiler.section(placeholder=True)
 def create_projects_section():
-    with ui.element('section').classes('py-16').id('projects'):
-        with ui.container().classes('portfolio-container'):
-            ui.label('Featured Projects').classes('text-2xl md:text-3xl font-bold section-title')
-            
-            with ui.grid(columns=3).classes('gap-6'):
-                for project in PORTFOLIO_DATA["projects"]:
-                    project_image = AssetManager.get_project_image(project["image_type"])
-                    
-                    with ui.card().classes('project-card'):
-                        ui.element('div').classes('project-image').style(f'background-image: url({project_image})')
-                        with ui.card_section().classes('project-content'):
-                            ui.label(project["title"]).classes('project-title')
-                            ui.label(project["description"]).classes('project-description')
-                            with ui.element('div').classes('project-tags'):
-                                for tag in project["tags"]:
-                                    ui.label(tag).classes('project-tag')
-                            with ui.row().classes('justify-between items-center mt-4'):
-                                ui.link('View Details', project["link"]).classes('text-blue-400 hover:text-blue-300')
+    ui.html(lazy_section_html('projects'))
 
 # Create skills section
+@profiler.section(placeholder=True)
 def create_skills_section():
-    with ui.element('section').classes('py-16 bg-gray-900').id('skills'):
-        with ui.container().classes('portfolio-container'):
-            ui.label('Skills & Expertise').classes('text-2xl md:text-3xl font-bold section-title')
-            
-            with ui.grid(columns=5).classes('gap-4'):
-                for skill in PORTFOLIO_DATA["skills"]:
-                    with ui.card().classes('skill-card'):
-                        ui.label(skill["icon"]).classes('skill-icon')
-                        ui.label(skill["name"]).classes('skill-name')
-                        with ui.element('div').classes('skill-level'):
-                            ui.element('div').classes('skill-level-fill').style(f'width: {skill["level"]}%')
+    ui.html(lazy_section_html('skills'))
 
 # Create experience section
+@profiler.section(placeholder=True)
 def create_experience_section():
-    with ui.element('section').classes('py-16').id('experience'):
-        with ui.container().classes('portfolio-container'):
-            ui.label('Work Experience').classes('text-2xl md:text-3xl font-bold section-title')
-            
-            with ui.element('div').classes('timeline'):
-                for exp in PORTFOLIO_DATA["experience"]:
-                    with ui.element('div').classes('timeline-item'):
-                        ui.element('div').classes('timeline-dot')
-                        ui.label(exp["date"]).classes('timeline-date')
-                        ui.label(exp["title"]).classes('timeline-title')
-                        ui.label(exp["company"]).classes('timeline-company')
-                        ui.label(exp["description"]).classes('timeline-description')
-            
-            ui.label('Education').classes('text-2xl md:text-3xl font-bold section-title mt-12')
-            
-            with ui.element('div').classes('timeline'):
-                for edu in PORTFOLIO_DATA["education"]:
-                    with ui.element('div').classes('timeline-item'):
-                        ui.element('div').classes('timeline-dot')
-                        ui.label(edu["date"]).classes('timeline-date')
-                        ui.label(edu["degree"]).classes('timeline-title')
-                        ui.label(edu["institution"]).classes('timeline-company')
-            
-            ui.label('Certifications').classes('text-2xl md:text-3xl font-bold section-title mt-12')
-            
-            with ui.grid(columns=3).classes('gap-4'):
-                for cert in PORTFOLIO_DATA["certifications"]:
-                    with ui.card().classes('skill-card'):
-                        ui.label('🏆').classes('skill-icon')
-                        ui.label(cert["name"]).classes('skill-name')
-                        ui.label(f"{cert['issuer']} • {cert['date']}").classes('text-sm text-gray-400')
-
-# Create contact section
+    ui.html(lazy_section_html('experience'))
+
+# Create contact section, its form elements are only built once the visitor scrolls near it
+@profiler.section(placeholder=True)
 def create_contact_section():
-    with ui.element('section').classes('py-16 bg-gray-900').id('contact'):
-        with ui.container().classes('portfolio-container'):
-            ui.label('Get In Touch').classes('text-2xl md:text-3xl font-bold section-title')
+    section = ui.element('section').classes('py-16 bg-gray-900 lazy-section') \
+        .props('id=contact').style(f'min-height: {LAZY_SECTIONS["contact"]}px')
+    
+    def build():
+        if section.default_slot.children:  # the page script may ask twice
+            return
+        section.classes(remove='lazy-section').style(remove=f'min-height: {LAZY_SECTIONS["contact"]}px')
+        with section:
+            create_contact_content()
+    
+    section.on('lazyload', build, [])
+
+def create_contact_content():
+    with ui.element('div').classes('portfolio-container'):
+        ui.label('Get In Touch').classes('text-2xl md:text-3xl font-bold section-title')
+        
+        with ui.grid(columns=2).classes('gap-8'):
+            ui.html(render_fragment('contact-card'))
+            create_contact_form()
+
+# Create contact form
+def create_contact_form():
+    with ui.card().classes('bg-gray-800 p-6 rounded-lg'):
+        ui.label('Send Me a Message').classes('text-xl font-bold mb-6')
+        
+        with ui.element('form').classes('space-y-4'):
+            with ui.grid(columns=2).classes('gap-4'):
+                name = ui.input(label='Name').props('outlined dark').classes('col-span-1')
+                email = ui.input(label='Email').props('outlined dark').classes('col-span-1')
+            subject = ui.input(label='Subject').props('outlined dark')
+            message = ui.textarea(label='Message').props('outlined dark rows=5')
+            # Honeypot: moved off-screen and skipped by keyboard navigation, so only bots fill it in
+            website = ui.input(label='Website').props('autocomplete=off tabindex=-1 aria-hidden=true') \
+                .style('position: absolute; left: -10000px; width: 1px; height: 1px; overflow: hidden')
+            fields = {'name': name, 'email': email, 'subject': subject, 'message': message}
+            shown_at = time.monotonic()
             
-            with ui.grid(columns=2).classes('gap-8'):
-                with ui.card().classes('bg-gray-800 p-6 rounded-lg'):
-                    ui.label('Contact Information').classes('text-xl font-bold mb-6')
-                    
-                    with ui.element('div').classes('space-y-4'):
-                        with ui.element('div').classes('contact-item'):
-                            with ui.element('div').classes('contact-icon'):
-                                ui.icon('mail')
-                            with ui.element('div'):
-                                ui.label('Email').classes('text-sm text-gray-400')
-                                ui.label(PORTFOLIO_DATA["personal_info"]["email"]).classes('text-white')
-                        
-                        with ui.element('div').classes('contact-item'):
-                            with ui.element('div').classes('contact-icon'):
-                                ui.icon('phone')
-                            with ui.element('div'):
-                                ui.label('Phone').classes('text-sm text-gray-400')
-                                ui.label(PORTFOLIO_DATA["personal_info"]["phone"]).classes('text-white')
-                        
-                        with ui.element('div').classes('contact-item'):
-                            with ui.element('div').classes('contact-icon'):
-                                ui.icon('map_pin')
-                            with ui.element('div'):
-                                ui.label('Location').classes('text-sm text-gray-400')
-                                ui.label(PORTFOLIO_DATA["personal_info"]["location"]).classes('text-white')
-                    
-                    ui.label('Connect With Me').classes('text-xl font-bold mt-8 mb-4')
-                    
-                    with ui.element('div').classes('social-links'):
-                        ui.link('', PORTFOLIO_DATA["personal_info"]["social"]["github"], new_tab=True).classes('social-link').style('text-decoration: none;').add(ui.icon('github'))
-                        ui.link('', PORTFOLIO_DATA["personal_info"]["social"]["linkedin"], new_tab=True).classes('social-link').style('text-decoration: none;').add(ui.icon('linkedin'))
-                        ui.link('', PORTFOLIO_DATA["personal_info"]["social"]["twitter"], new_tab=True).classes('social-link').style('text-decoration: none;').add(ui.icon('twitter'))
-                        ui.link('', PORTFOLIO_DATA["personal_info"]["social"]["medium"], new_tab=True).classes('social-link').style('text-decoration: none;').add(ui.icon('edit'))
-                
-                with ui.card().classes('bg-gray-800 p-6 rounded-lg'):
-                    ui.label('Send Me a Message').classes('text-xl font-bold mb-6')
-                    
-                    with ui.element('form').classes('space-y-4'):
-                        with ui.grid(columns=2).classes('gap-4'):
-                            ui.input(label='Name').props('outlined dark').classes('col-span-1')
-                            ui.input(label='Email').props('outlined dark').classes('col-span-1')
-                        ui.input(label='Subject').props('outlined dark')
-                        ui.textarea(label='Message', rows=5).props('outlined dark')
-                        ui.button('Send Message', icon='send').classes('btn-primary mt-4')
+            # Screens and queues the message, storage and delivery happen in the background
+            async def send_message():
+                nonlocal shown_at
+                try:
+                    form = ContactForm(**{key: field.value or '' for key, field in fields.items()})
+                except ValidationError as e:
+                    invalid = ', '.join(sorted({str(error['loc'][0]) for error in e.errors()}))
+                    ui.notify(f'Please check: {invalid}', type='warning')
+                    return
+                request = ui.context.client.request
+                decision = await contact_guard.check(client_ip(request) if request else 'unknown',
+                                                     honeypot=website.value or '',
+                                                     fill_seconds=time.monotonic() - shown_at)
+                if decision.outcome == 'throttled':
+                    ui.notify('Too many messages, please try again later.', type='warning')
+                    return
+                if decision.accepted:  # rejected spam gets the same confirmation, so bots learn nothing
+                    try:
+                        contact_service.submit(form)
+                    except QueueFullError as e:
+                        ui.notify(str(e), type='negative')
+                        return
+                for field in fields.values():
+                    field.value = ''
+                shown_at = time.monotonic()
+                ui.notify('Thanks! Your message has been sent.', type='positive')
+            
+            ui.button('Send Message', icon='send', on_click=send_message).classes('btn-primary mt-4')
 
 # Create footer
+@profiler.section
 def create_footer():
     with ui.footer().classes('py-8 bg-gray-900 border-t border-gray-800'):
-        with ui.container().classes('portfolio-container text-center'):
-            ui.label(f'© {2023} {PORTFOLIO_DATA["personal_info"]["name"]} • AI Engineer Portfolio').classes('text-gray-400')
-            ui.label('Built with Python and NiceGUI').classes('text-gray-500 text-sm mt-2')
+        ui.html(render_fragment('footer-content')).classes('w-full')
 
-# Main page
-@ui.page('/')
-def main_page():
-    # Add CSS
-    ui.add_head_html('<link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">')
-    ui.add_head_html('<link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500&display=swap" rel="stylesheet">')
-    ui.add_head_html(f'<link rel="stylesheet" href="/static/css/main.css">')
-    
-    # Create page sections
-    create_navigation()
-    create_hero_section()
-    create_projects_section()
-    create_skills_section()
-    create_experience_section()
-    create_contact_section()
-    create_footer()
-    
-    # Add scroll behavior
-    ui.add_head_html('''
+# Split main.css against the rendered page: inline the rules for the first viewport, defer the rest
+def build_page_styles() -> PageStyles:
+    sections = render_static_sections()
+    css = (css_dir / 'main.css').read_text(encoding='utf-8')
+    styles = split_styles(css, ''.join(sections) + PAGE_SCRIPT, ''.join(sections[:2]))
+    logging.info(f'main.css pruned from {styles.original_bytes} to {styles.pruned_bytes} bytes, '
+                 f'{len(styles.critical_css)} bytes inlined as critical CSS')
+    return styles
+
+# Font preloads and faces, read from the font manifest once
+@lru_cache(maxsize=None)
+def page_fonts_html() -> str:
+    return font_head_html()
+
+# Critical CSS inline, the rest of main.css loaded without blocking rendering
+@lru_cache(maxsize=None)
+def page_styles_html() -> str:
+    return build_page_styles().head_html()
+
+# Head markup that needs no rendering, so fonts and the hero image can be fetched while the page renders
+def page_preload_html() -> str:
+    return page_fonts_html() + AssetManager.get_hero_asset().preload_html()
+
+# Shared head markup for the dynamic and static pages
+def page_head_html() -> str:
+    return page_preload_html() + page_styles_html()
+
+# Scroll behavior
+PAGE_SCRIPT = '''
     <script>
         document.addEventListener('DOMContentLoaded', function() {
             // Smooth scroll for anchor links
@@ -335,9 +250,12 @@ def main_page():
                     
                     const targetElement = document.querySelector(targetId);
                     if (targetElement) {
-                        window.scrollTo({
-                            top: targetElement.offsetTop - 80,
-                            behavior: 'smooth'
+                        window.loadSectionsBefore(targetElement).then(() => {
+                            const target = document.querySelector(targetId);  // a loaded section replaces its placeholder
+                            window.scrollTo({
+                                top: target.offsetTop - 80,
+                                behavior: 'smooth'
+                            });
                         });
                     }
                 });
@@ -352,9 +270,296 @@ def main_page():
                 });
             }, { threshold: 0.1 });
             
-            document.querySelectorAll('section').forEach(section => {
-                observer.observe(section);
-            });
+            // Sections below the fold start as placeholders and are loaded when they near the viewport
+            const lazyObserver = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) loadSection(entry.target);
+                });
+            }, { rootMargin: '600px 0px' });
+            
+            const loading = new Map();
+            function loadSection(section) {
+                if (loading.has(section)) return loading.get(section);
+                lazyObserver.unobserve(section);
+                let loaded = Promise.resolve();
+                if (section.dataset.src) {
+                    loaded = fetch(section.dataset.src)
+                        .then(response => response.ok ? response.text() : Promise.reject(response.status))
+                        .then(html => {
+                            const template = document.createElement('template');
+                            template.innerHTML = html;
+                            section.replaceWith(template.content);
+                        })
+                        .catch(() => {
+                            loading.delete(section);  // retried when it comes into view again
+                            lazyObserver.observe(section);
+                        });
+                } else {
+                    section.dispatchEvent(new CustomEvent('lazyload'));  // built by the server over the websocket
+                    observer.observe(section);
+                }
+                loading.set(section, loaded);
+                return loaded;
+            }
+            
+            function watchSections(root) {
+                root.querySelectorAll('section').forEach(section => {
+                    if (section.classList.contains('lazy-section')) lazyObserver.observe(section);
+                    else observer.observe(section);
+                });
+            }
+            watchSections(document);
+            
+            // The NiceGUI page may mount its elements after this script runs, and loaded sections arrive later
+            new MutationObserver(mutations => mutations.forEach(mutation => mutation.addedNodes.forEach(node => {
+                if (node.nodeType !== Node.ELEMENT_NODE) return;
+                if (node.matches('section')) watchSections(node.parentNode);
+                else watchSections(node);
+            }))).observe(document.body, { childList: true, subtree: true });
+            
+            // Load the rest once the page is idle, so later scrolling doesn't wait on the network
+            window.addEventListener('load', () => setTimeout(() => {
+                const idle = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+                idle(() => document.querySelectorAll('section.lazy-section').forEach(loadSection));
+            }, 3000));
+            
+            // Anchor targets move while the sections above them load, so load those first
+            window.loadSectionsBefore = function(target) {
+                const sections = [...document.querySelectorAll('section.lazy-section')].filter(section =>
+                    section === target || section.compareDocumentPosition(target) & Node.DOCUMENT_POSITION_FOLLOWING);
+                return Promise.all(sections.map(loadSection));
+            };
         });
     </script>
-    ''')
\ No newline at end of file
+'''
+
+# Main page
+def main_page(request: Request):
+    # Crawlers get the pre-rendered page instead of a NiceGUI client they would never use
+    if session_manager.should_downgrade(request):
+        session_manager.release(ui.context.client)
+        if not page_snapshot.is_built:
+            return streamed_page_response()  # a sync page can't wait for the build off the event loop
+        return page_snapshot.response(request)
+    
+    # Add CSS
+    ui.add_head_html(page_head_html())
+    
+    # Create page sections, measured section by section when profiling is on
+    with profiler.render_profiler.profile(request):
+        create_navigation()
+        create_hero_section()
+        create_projects_section()
+        create_skills_section()
+        create_experience_section()
+        create_contact_section()
+        create_footer()
+    
+    # Add scroll behavior
+    ui.add_head_html(PAGE_SCRIPT)
+
+# Contact form page, embedded by the static render as its only interactive piece
+@ui.page(static_page.CONTACT_FORM_PATH)
+def contact_form_page():
+    ui.add_head_html(page_fonts_html() + page_styles_html())
+    ui.query('body').style('background: transparent')
+    create_contact_form()
+
+# Fragment renderers: fragment name -> (content section it depends on, renderer)
+FRAGMENTS: Dict[str, Tuple[str, Callable[[Portfolio], str]]] = {
+    'navigation': ('navigation', static_page.render_navigation),
+    'hero': ('hero', lambda portfolio: static_page.render_hero_section(portfolio, AssetManager.get_hero_asset())),
+    'projects': ('projects', lambda portfolio: static_page.render_projects_section(
+        portfolio, [AssetManager.get_project_asset(project.image_type)
+                    for project in portfolio.projects[:FEATURED_PROJECTS]],
+        PROJECT_IMAGE_SIZES, limit=FEATURED_PROJECTS)),
+    'skills': ('skills', static_page.render_skills_section),
+    'experience': ('experience', static_page.render_experience_section),
+    'contact': ('contact', static_page.render_contact_section),
+    'contact-card': ('contact', static_page.render_contact_card),
+    'footer': ('footer', static_page.render_footer),
+    'footer-content': ('footer', static_page.render_footer_content),
+}
+
+# Sections of the static page, in page order (navigation and hero first)
+STATIC_SECTIONS = ['navigation', 'hero', 'projects', 'skills', 'experience', 'contact', 'footer']
+
+# The page only ships a dark theme, it is part of the fragment key so a second theme can't be served stale markup
+THEME = 'dark'
+
+# Fragments embedded by the dynamic page
+DYNAMIC_FRAGMENTS = ['projects', 'skills', 'experience', 'contact-card', 'footer-content']
+
+def fragment_key(name: str) -> Tuple[str, str, str]:
+    return (name, content_store.section_versions[FRAGMENTS[name][0]], THEME)
+
+# Digest of rendered markup; cached fragments are the same string objects, so repeated lookups are cheap
+@lru_cache(maxsize=64)
+def markup_digest(html: str) -> str:
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()[:16]
+
+# Identifies the rendered markup of a fragment. Hashing the markup itself also catches template,
+# image fingerprint and layout changes between deploys, which the content version alone would miss.
+def fragment_version(name: str) -> str:
+    return markup_digest(render_fragment(name))
+
+# Fragment renderers, timed per fragment; only cache misses get this far
+TIMED_RENDERERS: Dict[str, Callable[[Portfolio], str]] = {
+    name: metrics.timed(name)(render) for name, (_, render) in FRAGMENTS.items()
+}
+
+# Rendered HTML of a fragment, cached per content version of its section and theme.
+# Profiled renders bypass the cache, so the profile shows what the fragment really costs.
+def render_fragment(name: str) -> str:
+    render = TIMED_RENDERERS[name]
+    if profiler.is_profiling():
+        return profiler.fragment(name, lambda: render(content_store.portfolio))
+    return fragment_cache.get_or_render(fragment_key(name), lambda: render(content_store.portfolio))
+
+# Render every page section to HTML, reusing the cached fragments
+def render_static_sections() -> List[str]:
+    return [render_fragment(name) for name in STATIC_SECTIONS]
+
+PAGE_TITLE = 'AI Engineer Portfolio'
+
+# Render the whole page to HTML once instead of building elements per visit
+@metrics.timed('page')
+def render_static_page() -> str:
+    body = ''.join(render_static_sections())
+    return static_page.render_document(body, title=PAGE_TITLE, head_html=page_head_html() + PAGE_SCRIPT)
+
+# Send the page in chunks as it renders: the head with the stylesheet links and preloads goes out before
+# anything is rendered, then navigation and hero with the critical CSS, then the other sections one by one.
+# The chunks add up to exactly the document render_static_page() returns.
+async def stream_static_page() -> AsyncIterator[str]:
+    def render_above_the_fold() -> str:
+        sections = ''.join(render_fragment(name) for name in STATIC_SECTIONS[:2])
+        return page_styles_html() + PAGE_SCRIPT + static_page.BODY_START + sections
+    
+    yield static_page.render_document_start(title=PAGE_TITLE, head_html=page_preload_html())
+    yield await run_in_threadpool(render_above_the_fold)
+    for name in STATIC_SECTIONS[2:]:
+        yield await run_in_threadpool(render_fragment, name)
+    yield static_page.DOCUMENT_END
+
+# The page streamed as it renders, with the snapshot built in a worker thread once it has been sent
+def streamed_page_response() -> Response:
+    return StreamingResponse(stream_static_page(), media_type='text/html; charset=utf-8',
+                             headers={'Cache-Control': 'no-cache'},
+                             background=BackgroundTask(page_snapshot.ensure_built))
+
+# Files whose content shapes the rendered page, besides the portfolio content itself
+SNAPSHOT_INPUTS = [
+    Path(__file__), Path(static_page.__file__), css_dir / 'main.css',
+    MANIFEST_PATH, FONT_MANIFEST_PATH,
+]
+
+# Identifies the inputs of a rendered snapshot, a persisted one is only reused while it matches
+def snapshot_key() -> str:
+    digest = hashlib.sha256(static_page.NICEGUI_STATIC.encode('utf-8'))
+    digest.update(json.dumps(content_store.section_versions, sort_keys=True).encode('utf-8'))
+    for path in SNAPSHOT_INPUTS:
+        digest.update(path.read_bytes() if path.exists() else b'')
+    return digest.hexdigest()
+
+page_snapshot = PageSnapshot(render_static_page, path=BUILD_DIR / 'snapshot' / 'index.html', key=snapshot_key)
+
+# Project catalogue page for one normalized query, rendered from the search index
+def render_projects_document(index: ProjectIndex, query: str, tags: Tuple[str, ...], page: int) -> str:
+    results = index.search(query, tags, page, per_page=FEATURED_PROJECTS * 2)
+    body = static_page.render_projects_page(
+        results, query, tags, index.tags, lambda project: AssetManager.get_project_asset(project.image_type),
+        PROJECT_IMAGE_SIZES) + render_fragment('footer')
+    return static_page.render_document(body, title=f'Projects - {PAGE_TITLE}',
+                                       head_html=page_fonts_html() + page_styles_html())
+
+@app.get(static_page.PROJECTS_PATH, include_in_schema=False)
+def projects_page(q: str = '', tag: List[str] = Query(default=[]), page: int = Query(default=1, ge=1)) -> Response:
+    query, tags = normalize_query(q, tag)
+    # The page also shows the footer and styles of other content sections, hence the content version
+    html = project_search.cached(('html', query, tags, page, content_store.version),
+                                 lambda index: render_projects_document(index, query, tags, page))
+    return HTMLResponse(html, headers={'Cache-Control': 'no-cache'})
+
+# Changed sections get a new version and miss the fragment cache, the others are reused.
+# Called in the content watcher's worker thread, so the re-renders here don't hold up requests.
+def on_content_changed(changed: Set[str]) -> None:
+    if 'projects' in changed:
+        project_search.rebuild(content_store.portfolio.projects, content_store.section_versions['projects'])
+    page_styles_html.cache_clear()  # new content may use classes the pruned stylesheet dropped
+    page_styles_html()  # split again here rather than in the next page request
+    if page_snapshot.is_built:
+        page_snapshot.invalidate()
+
+content_store.subscribe(on_content_changed)
+
+# Markup rendered while images were still being built links placeholders; render it again with the images.
+# Called in the thread that built them.
+def on_images_built() -> None:
+    fragment_cache.clear()
+    project_search.clear()
+    if page_snapshot.is_built:
+        page_snapshot.invalidate()
+
+AssetManager.on_built(on_images_built)
+app.include_router(cache_api.router)
+app.include_router(health_api.router)
+app.include_router(contact_api.router)
+app.include_router(sessions_api.router)
+app.include_router(sections_api.router)
+# The contact section is built by NiceGUI instead, its form needs a client
+for name in ['projects', 'skills', 'experience']:
+    sections_api.register_section(name, partial(fragment_version, name), partial(render_fragment, name))
+app.include_router(metrics_api.router)
+app.include_router(projects_api.router)
+session_manager.install()
+app.on_startup(contact_service.start)
+app.on_shutdown(contact_service.stop)
+if os.getenv('CONTENT_WATCH', '1') != '0':
+    app.on_startup(content_store.watch)
+
+# Boot from the snapshot rendered at build time instead of rendering and compressing the page
+if RENDER_MODE == 'static' and os.getenv('LOAD_SNAPSHOT', '1') != '0':
+    page_snapshot.load()
+startup_timer.mark('data')
+
+app.add_middleware(StartupTimingMiddleware)
+metrics.install()
+
+if RENDER_MODE == 'static':
+    app.remove_route('/')
+
+    PAGE_STREAMING = os.getenv('PAGE_STREAMING', '1') != '0'
+
+    @app.get('/', include_in_schema=False)
+    async def static_main_page(request: Request) -> Response:
+        if not page_snapshot.is_built:
+            # Stream the page as it renders instead of making the visitor wait for the build
+            if PAGE_STREAMING:
+                return streamed_page_response()
+            await run_in_threadpool(page_snapshot.ensure_built)
+        return page_snapshot.response(request)
+
+    WARM_UP_STEPS = [AssetManager.ensure_built, page_snapshot.ensure_built]
+    health_api.register_check('snapshot', lambda: page_snapshot.is_built)
+else:
+    ui.page('/')(main_page)
+
+    # The snapshot is what crawlers get instead of a client
+    WARM_UP_STEPS = [AssetManager.ensure_built, page_head_html] + \
+        [partial(render_fragment, name) for name in DYNAMIC_FRAGMENTS] + [page_snapshot.ensure_built]
+    health_api.register_check('fragments', lambda: all(fragment_key(name) in fragment_cache for name in DYNAMIC_FRAGMENTS))
+    health_api.register_check('styles', lambda: page_styles_html.cache_info().currsize > 0)
+
+health_api.register_check('images', AssetManager.is_built)
+
+# Fill the caches in the background; /ready answers 503 until they are warm
+async def warm_up_caches() -> None:
+    await health_api.warm_up(WARM_UP_STEPS)
+
+if os.getenv('WARM_UP', '1') != '0':
+    app.on_startup(warm_up_caches)
+else:
+    health_api.skip_warm_up()
+
+startup_timer.mark('routes')
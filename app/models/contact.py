@@ -0,0 +1,47 @@
+"""
+Contact form models.
+
+A submission is validated once when it is received, before it is queued, so
+the storage and notification workers only ever see well-formed messages.
+"""
+import re
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+# Line breaks and other control characters, which must never reach an email header
+CONTROL_CHARACTERS = re.compile(r'[\x00-\x1f\x7f]')
+
+
+class ContactForm(BaseModel):
+    """Fields filled in by the visitor"""
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True)
+
+    name: str = Field(min_length=1, max_length=100)
+    email: str = Field(max_length=254, pattern=EMAIL_PATTERN)
+    subject: str = Field(default='', max_length=200)
+    message: str = Field(min_length=1, max_length=5000)
+
+    @field_validator('name', 'subject')
+    @classmethod
+    def _single_line(cls, value: str) -> str:
+        # Both end up in the notification's headers
+        if CONTROL_CHARACTERS.search(value):
+            raise ValueError('must not contain line breaks or control characters')
+        return value
+
+
+class ContactSubmission(ContactForm):
+    """Form fields as posted to the contact API, including the anti-spam fields"""
+    website: str = Field(default='', max_length=200)  # hidden from humans, only bots fill it in
+    form_token: str = Field(default='', max_length=100)  # signed time the form was served, from /api/contact/form
+
+    def form(self) -> ContactForm:
+        return ContactForm(**self.model_dump(exclude={'website', 'form_token'}))
+
+
+class ContactMessage(ContactForm):
+    """A received submission, as queued, stored and notified"""
+    received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
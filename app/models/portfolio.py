@@ -0,0 +1,75 @@
+"""
+Portfolio content models.
+
+These models describe the content file loaded by the content store and are
+validated once per load, so page builders can rely on their shape.
+"""
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ContentModel(BaseModel):
+    """Base model for content: immutable and strict about unknown fields"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+
+class SocialLinks(ContentModel):
+    github: str
+    linkedin: str
+    twitter: str
+    medium: str
+
+
+class PersonalInfo(ContentModel):
+    name: str
+    title: str
+    bio: str
+    location: str
+    email: str
+    phone: str
+    website: str
+    social: SocialLinks
+
+
+class Skill(ContentModel):
+    name: str
+    level: int = Field(ge=0, le=100)
+    icon: str
+
+
+class Project(ContentModel):
+    title: str
+    description: str
+    image_type: str
+    tags: List[str] = []
+    link: str = '#'
+
+
+class Experience(ContentModel):
+    title: str
+    company: str
+    date: str
+    description: str
+
+
+class Education(ContentModel):
+    degree: str
+    institution: str
+    date: str
+
+
+class Certification(ContentModel):
+    name: str
+    issuer: str
+    date: str
+
+
+class Portfolio(ContentModel):
+    """All content shown on the portfolio page"""
+    personal_info: PersonalInfo
+    skills: List[Skill] = []
+    projects: List[Project] = []
+    experience: List[Experience] = []
+    education: List[Education] = []
+    certifications: List[Certification] = []
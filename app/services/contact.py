@@ -0,0 +1,310 @@
+"""
+Contact form submissions.
+
+Submitting a message only validates and enqueues it, so the form answers in
+constant time however many messages arrive at once. A background worker
+drains the queue in batches: every batch is written to SQLite (WAL mode) in
+one transaction and then handed to a notifier. Database and SMTP calls run in
+worker threads, never on the event loop that serves pages and websockets.
+Messages whose notification failed stay flagged in the database and are
+retried with the next batch and on the next start; a message the mail server
+or the notifier rejects on its own is flagged as failed and not retried, so it
+cannot hold up the messages after it.
+"""
+import asyncio
+import logging
+import os
+import smtplib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from email.utils import formataddr
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.models.contact import ContactForm, ContactMessage
+
+DEFAULT_DATABASE_PATH = Path(__file__).resolve().parent.parent.parent / 'data' / 'contact.sqlite3'
+
+
+class QueueFullError(Exception):
+    """Raised when the submission queue is at capacity"""
+
+
+class Notifier:
+    """Delivers stored messages to the site owner; ``send`` is blocking and runs in a worker thread"""
+
+    def send(self, messages: List[ContactMessage]) -> List[int]:
+        """
+        Deliver a batch of messages.
+
+        Args:
+            messages: Messages to deliver
+
+        Returns:
+            Positions in ``messages`` of the messages rejected for good, which must not be retried
+
+        Raises:
+            Exception: The batch could not be delivered right now and should be retried as a whole
+        """
+        raise NotImplementedError
+
+
+class LocalNotifier(Notifier):
+    """Keeps notified messages in memory and logs them, standing in for SMTP locally and in tests"""
+
+    def __init__(self):
+        self.sent: List[ContactMessage] = []
+
+    def send(self, messages: List[ContactMessage]) -> List[int]:
+        self.sent.extend(messages)
+        for message in messages:
+            logging.info(f'Contact message from {message.name} <{message.email}>: {message.subject or "(no subject)"}')
+        return []
+
+
+class SmtpNotifier(Notifier):
+    """Emails every message of a batch over one SMTP connection"""
+
+    def __init__(self, host: str, port: int = 587, username: str = '', password: str = '',
+                 sender: str = '', recipient: str = '', starttls: bool = True, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.recipient = recipient or self.sender
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _email(self, message: ContactMessage) -> EmailMessage:
+        email = EmailMessage()
+        email['From'] = self.sender
+        email['To'] = self.recipient
+        email['Reply-To'] = formataddr((message.name, message.email))
+        email['Subject'] = f'[Portfolio] {message.subject or "New message"}'
+        email.set_content(f'{message.message}\n\n-- \n{message.name} <{message.email}>\n'
+                          f'Received {message.received_at.isoformat()}')
+        return email
+
+    def send(self, messages: List[ContactMessage]) -> List[int]:
+        rejected = []
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for index, message in enumerate(messages):
+                try:
+                    smtp.send_message(self._email(message))
+                except (ValueError, smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                    # This message can't be sent, the connection is fine: skip it and send the others
+                    logging.error(f'Contact message from {message.email} rejected, not retrying: {e}')
+                    rejected.append(index)
+        return rejected
+
+
+def notifier_from_env() -> Notifier:
+    """SMTP when ``SMTP_HOST`` is set, the local stand-in otherwise."""
+    host = os.getenv('SMTP_HOST')
+    if not host:
+        return LocalNotifier()
+    return SmtpNotifier(
+        host,
+        port=int(os.getenv('SMTP_PORT', 587)),
+        username=os.getenv('SMTP_USERNAME', ''),
+        password=os.getenv('SMTP_PASSWORD', ''),
+        sender=os.getenv('SMTP_SENDER', ''),
+        recipient=os.getenv('CONTACT_RECIPIENT', ''),
+        starttls=os.getenv('SMTP_STARTTLS', '1') != '0',
+    )
+
+
+class MessageStore:
+    """SQLite storage for contact messages; every method is blocking and must run on the store's thread"""
+
+    def __init__(self, path: Path = DEFAULT_DATABASE_PATH):
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS messages ('
+                'id INTEGER PRIMARY KEY, received_at TEXT NOT NULL, name TEXT NOT NULL, email TEXT NOT NULL, '
+                'subject TEXT NOT NULL, message TEXT NOT NULL, notified INTEGER NOT NULL DEFAULT 0)'
+            )
+        return self._connection
+
+    def add(self, messages: List[ContactMessage]) -> None:
+        """Store a batch of messages in one transaction."""
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO messages (received_at, name, email, subject, message) VALUES (?, ?, ?, ?, ?)',
+                [(m.received_at.isoformat(), m.name, m.email, m.subject, m.message) for m in messages],
+            )
+
+    def pending(self, limit: int) -> List[Tuple[int, ContactMessage]]:
+        """Stored messages not notified yet, oldest first; rows that no longer validate are marked failed."""
+        rows = self.connection.execute(
+            'SELECT id, received_at, name, email, subject, message FROM messages '
+            'WHERE notified = 0 ORDER BY id LIMIT ?', (limit,)
+        ).fetchall()
+        pending, invalid = [], []
+        for row in rows:
+            try:
+                pending.append((row[0], ContactMessage(received_at=row[1], name=row[2], email=row[3],
+                                                       subject=row[4], message=row[5])))
+            except ValidationError as e:  # stored before a stricter validation, it can't be notified
+                logging.error(f'Skipping invalid stored contact message {row[0]}: {e}')
+                invalid.append(row[0])
+        if invalid:
+            self.mark_failed(invalid)
+        return pending
+
+    def mark_notified(self, ids: List[int]) -> None:
+        with self.connection:
+            self.connection.executemany('UPDATE messages SET notified = 1 WHERE id = ?', [(i,) for i in ids])
+
+    def mark_failed(self, ids: List[int]) -> None:
+        """Flag messages that can never be notified, so they are kept but not retried."""
+        with self.connection:
+            self.connection.executemany('UPDATE messages SET notified = -1 WHERE id = ?', [(i,) for i in ids])
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ContactService:
+    """Queues submissions and stores and notifies them in batches in the background"""
+
+    def __init__(self, store: MessageStore, notifier: Notifier, max_queue: int = 1000,
+                 batch_size: int = 50, batch_delay: float = 0.5):
+        """
+        Args:
+            store: Durable message storage
+            notifier: Delivers stored messages
+            max_queue: Submissions held in memory before new ones are refused
+            batch_size: Largest batch written and notified at once
+            batch_delay: Seconds to wait for more messages after the first one of a batch
+        """
+        self.store = store
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue: 'asyncio.Queue[ContactMessage]' = asyncio.Queue(maxsize=max_queue)
+        # SQLite connections belong to the thread that opened them, so the store gets a thread of its own
+        self._store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='contact-store')
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: List[ContactMessage] = []
+        self.stored = 0
+        self.notified = 0
+        self.failed_notifications = 0
+
+    def submit(self, form: ContactForm) -> ContactMessage:
+        """
+        Enqueue a validated submission without waiting for storage or delivery.
+
+        Args:
+            form: Validated form fields
+
+        Returns:
+            The queued message
+
+        Raises:
+            QueueFullError: The queue is at capacity
+        """
+        message = ContactMessage(**form.model_dump())
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            raise QueueFullError('Too many messages waiting, please try again shortly') from None
+        return message
+
+    async def _next_batch(self) -> List[ContactMessage]:
+        # Messages taken off the queue stay in self._batch until they are stored, so stop() can flush them
+        self._batch = [await self.queue.get()]
+        if self.queue.qsize() < self.batch_size - 1:
+            await asyncio.sleep(self.batch_delay)  # let a burst accumulate into one transaction
+        while len(self._batch) < self.batch_size and not self.queue.empty():
+            self._batch.append(self.queue.get_nowait())
+        return self._batch
+
+    def _add(self, batch: List[ContactMessage]) -> None:
+        self.store.add(batch)
+        self._batch = []
+
+    async def _store(self, batch: List[ContactMessage]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._store_thread, self._add, batch)
+        self.stored += len(batch)
+
+    async def _notify_pending(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await loop.run_in_executor(self._store_thread, self.store.pending, self.batch_size)
+            if not pending:
+                return
+            try:
+                rejected = set(await loop.run_in_executor(None, self.notifier.send, [message for _, message in pending]))
+            except Exception as e:  # delivery failures must not lose messages, they stay pending
+                self.failed_notifications += 1
+                logging.error(f'Could not deliver {len(pending)} contact messages, will retry: {e}')
+                return
+            delivered = [i for index, (i, _) in enumerate(pending) if index not in rejected]
+            failed = [i for index, (i, _) in enumerate(pending) if index in rejected]
+            await loop.run_in_executor(self._store_thread, self.store.mark_notified, delivered)
+            if failed:
+                await loop.run_in_executor(self._store_thread, self.store.mark_failed, failed)
+                self.failed_notifications += len(failed)
+            self.notified += len(delivered)
+
+    async def run(self) -> None:
+        """Store and notify queued messages batch by batch, until cancelled."""
+        await self._notify_pending()  # leftovers from a previous run
+        while True:
+            batch = await self._next_batch()
+            while True:
+                try:
+                    await self._store(batch)
+                    break
+                except Exception as e:  # keep the batch in memory and retry, the queue keeps accepting
+                    logging.error(f'Could not store {len(batch)} contact messages, retrying: {e}')
+                    await asyncio.sleep(max(self.batch_delay, 1.0))
+            await self._notify_pending()
+
+    def start(self) -> None:
+        """Start the background worker on the running event loop."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self.run())
+
+    def stop(self) -> None:
+        """Stop the worker and store what it has not stored yet; blocks, meant for shutdown."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        # The store thread runs one call at a time: wait for an insert in flight before collecting leftovers
+        self._store_thread.submit(lambda: None).result(timeout=10)
+        remaining = self._batch
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        if remaining:
+            self._store_thread.submit(self._add, remaining).result(timeout=10)
+            self.stored += len(remaining)
+            logging.info(f'Stored {len(remaining)} queued contact messages before shutdown')
+        self._store_thread.submit(self.store.close).result(timeout=10)
+
+
+contact_service = ContactService(
+    MessageStore(Path(os.getenv('CONTACT_DATABASE', DEFAULT_DATABASE_PATH))),
+    notifier_from_env(),
+    max_queue=int(os.getenv('CONTACT_QUEUE_SIZE', 1000)),
+)
@@ -0,0 +1,140 @@
+"""
+Portfolio content store.
+
+Loads the portfolio content from a JSON, TOML or YAML file into the typed
+models of ``app.models.portfolio``, watches the file for changes and tells
+subscribers which page sections are affected by an edit, so only those have
+to be re-rendered.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import tomllib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import anyio
+
+from app.models.portfolio import Portfolio
+
+DEFAULT_CONTENT_PATH = Path(__file__).resolve().parent.parent / 'content' / 'portfolio.json'
+
+# Page section -> content fields it renders
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'navigation': (),
+    'hero': ('personal_info',),
+    'projects': ('projects',),
+    'skills': ('skills',),
+    'experience': ('experience', 'education', 'certifications'),
+    'contact': ('personal_info',),
+    'footer': ('personal_info',),
+}
+
+
+def _parse(path: Path) -> dict:
+    text = path.read_text(encoding='utf-8')
+    if path.suffix == '.toml':
+        return tomllib.loads(text)
+    if path.suffix in ('.yaml', '.yml'):
+        import yaml  # optional, only needed for YAML content files
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+class ContentStore:
+    """Holds the validated portfolio content and reloads it when the file changes"""
+
+    def __init__(self, path: Path = DEFAULT_CONTENT_PATH, poll_interval: float = 2.0):
+        """
+        Args:
+            path: Content file (.json, .toml, .yaml or .yml)
+            poll_interval: Seconds between checks when watchfiles is not installed
+        """
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.portfolio: Optional[Portfolio] = None
+        self.version = 0
+        self.section_versions: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+        self._subscribers: List[Callable[[Set[str]], None]] = []
+
+    def load(self) -> Portfolio:
+        """
+        Load and validate the content file.
+
+        Returns:
+            The validated portfolio content
+        """
+        mtime = self.path.stat().st_mtime
+        portfolio = Portfolio.model_validate(_parse(self.path))
+        data = portfolio.model_dump()
+        field_digests = {
+            field: hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+            for field, value in data.items()
+        }
+        section_versions = {
+            section: hashlib.sha256(''.join(field_digests[field] for field in fields).encode('utf-8')).hexdigest()[:16]
+            for section, fields in SECTION_FIELDS.items()
+        }
+        changed = {section for section, digest in section_versions.items()
+                   if self.section_versions.get(section) != digest}
+
+        self.portfolio = portfolio
+        self.section_versions = section_versions
+        self._mtime = mtime
+        if changed:
+            self.version += 1
+            logging.info(f'Loaded content from {self.path} (version {self.version}, '
+                         f'changed sections: {", ".join(sorted(changed))})')
+            if self.version > 1:
+                for callback in self._subscribers:
+                    callback(changed)
+        return portfolio
+
+    def subscribe(self, callback: Callable[[Set[str]], None]) -> None:
+        """
+        Register a callback that receives the names of the sections changed by a reload.
+
+        Callbacks of reloads triggered by ``watch`` run in a worker thread.
+
+        Args:
+            callback: Called with the set of changed section names
+        """
+        self._subscribers.append(callback)
+
+    def reload(self) -> bool:
+        """
+        Reload the file if it changed, keeping the previous content if it is invalid.
+
+        Returns:
+            Whether new content was loaded
+        """
+        try:
+            if self.path.stat().st_mtime == self._mtime:
+                return False
+            version = self.version
+            self.load()
+            return self.version != version
+        except Exception as e:  # a broken edit must never take the site down
+            logging.error(f'Keeping previous content, could not reload {self.path}: {e}')
+            return False
+
+    async def watch(self) -> None:
+        """
+        Reload the content whenever the file changes, until cancelled.
+
+        Reloads run in a worker thread, together with the re-rendering their subscribers do, so
+        the event loop keeps serving requests meanwhile.
+        """
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            awatch = None
+        if awatch is not None:
+            async for _ in awatch(self.path.parent, recursive=False):
+                await anyio.to_thread.run_sync(self.reload)
+        else:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                await anyio.to_thread.run_sync(self.reload)
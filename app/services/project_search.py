@@ -0,0 +1,226 @@
+"""
+Project search for the AI Engineer Portfolio.
+
+The project catalogue is indexed once per content version: every term of a
+project's title, tags and description, and every prefix of those terms, maps
+to the projects containing it and a field-weighted score, and every tag maps
+to its projects. A query then intersects a few posting lists with set
+operations and only scores the projects left, and a single-term query pages
+through a ranking computed once per term, so its cost depends on the number of
+matches rather than the size of the catalogue. Rendered query responses are
+kept in a small LRU cache that is dropped whenever the index is rebuilt.
+"""
+import heapq
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from app.models.portfolio import Project
+
+T = TypeVar('T')
+
+_TOKEN = re.compile(r'\w+')
+
+# Score of a term occurrence, by the field it occurs in
+FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'description': 1.0}
+
+# The last query term also matches longer terms from this length on, so results follow typing
+MIN_PREFIX_LENGTH = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    """One page of search results"""
+    projects: List[Tuple[int, Project]]  # (catalogue position, project), best match first
+    total: int
+    page: int
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+
+class ProjectIndex:
+    """Inverted index over a project catalogue"""
+
+    def __init__(self, projects: Sequence[Project]):
+        """
+        Args:
+            projects: The catalogue, in display order
+        """
+        self.projects = list(projects)
+        postings: Dict[str, Dict[int, float]] = {}
+        tags: Dict[str, List[int]] = {}
+        tag_names: Dict[str, str] = {}
+        for position, project in enumerate(self.projects):
+            fields = {'title': project.title, 'tags': ' '.join(project.tags), 'description': project.description}
+            for field, text in fields.items():
+                for term in tokenize(text):
+                    scores = postings.setdefault(term, {})
+                    scores[position] = scores.get(position, 0.0) + FIELD_WEIGHTS[field]
+            for tag in project.tags:
+                key = tag.lower()
+                tag_names.setdefault(key, tag)
+                if not tags.get(key) or tags[key][-1] != position:
+                    tags.setdefault(key, []).append(position)
+        self.postings = postings
+        self.terms = sorted(postings)
+        # Prefix -> best score of each project among the terms starting with it
+        prefix_terms: Dict[str, List[str]] = {}
+        for term in self.terms:
+            for length in range(MIN_PREFIX_LENGTH, len(term)):
+                prefix_terms.setdefault(term[:length], []).append(term)
+        self.prefix_postings: Dict[str, Dict[int, float]] = {}
+        for prefix, completions in prefix_terms.items():
+            lists = [postings[term] for term in ([prefix] if prefix in postings else []) + completions]
+            if len(lists) == 1:
+                self.prefix_postings[prefix] = lists[0]
+                continue
+            merged: Dict[int, float] = {}
+            for scores in lists:
+                for position, score in scores.items():
+                    if score > merged.get(position, 0.0):
+                        merged[position] = score
+            self.prefix_postings[prefix] = merged
+        self.tag_postings: Dict[str, FrozenSet[int]] = {key: frozenset(ids) for key, ids in tags.items()}
+        # Display name and project count of every tag, most used first
+        self.tags: List[Tuple[str, int]] = sorted(
+            ((tag_names[key], len(ids)) for key, ids in tags.items()), key=lambda item: (-item[1], item[0].lower()))
+        self._rankings: Dict[Tuple[str, bool], List[int]] = {}  # filled on first use of an indexed term
+
+    def _scores(self, term: str, prefix: bool) -> Dict[int, float]:
+        if prefix:
+            return self.prefix_postings.get(term) or self.postings.get(term, {})
+        return self.postings.get(term, {})
+
+    def _ranking(self, term: str, prefix: bool) -> List[int]:
+        ranking = self._rankings.get((term, prefix))
+        if ranking is None:
+            scores = self._scores(term, prefix)
+            if not scores:  # unknown terms are not cached, so junk queries can't grow the index
+                return []
+            ranking = self._rankings[(term, prefix)] = sorted(scores, key=lambda position: (-scores[position], position))
+        return ranking
+
+    def search(self, query: str = '', tags: Sequence[str] = (), page: int = 1, per_page: int = 12) -> SearchPage:
+        """
+        Find the projects matching all query terms and carrying all tags.
+
+        Args:
+            query: Free text matched against title, tags and description; the last term also matches as a prefix
+            tags: Tags the projects must all carry (case-insensitive)
+            page: Page number, starting at 1
+            per_page: Results per page
+
+        Returns:
+            The requested page, ranked by score and then catalogue order
+        """
+        allowed: Optional[FrozenSet[int]] = None
+        for tag in tags:
+            ids = self.tag_postings.get(tag.lower(), frozenset())
+            allowed = ids if allowed is None else allowed & ids
+
+        terms = tokenize(query)
+        start = (page - 1) * per_page
+        if not terms:
+            matches = range(len(self.projects)) if allowed is None else sorted(allowed)
+        else:
+            keys = [(term, index == len(terms) - 1 and len(term) >= MIN_PREFIX_LENGTH) for index, term in enumerate(terms)]
+            if len(keys) == 1:
+                matches = self._ranking(*keys[0])
+                if allowed is not None:
+                    matches = [position for position in matches if position in allowed]
+            else:
+                lists = sorted((self._scores(*key) for key in keys), key=len)
+                common = set(lists[0])
+                for scores in lists[1:]:
+                    common.intersection_update(scores)
+                if allowed is not None:
+                    common &= allowed
+                matches = heapq.nsmallest(start + per_page, common,
+                                          key=lambda position: (-sum(scores[position] for scores in lists), position))
+                return SearchPage([(i, self.projects[i]) for i in matches[start:]], len(common), page, per_page)
+        return SearchPage([(i, self.projects[i]) for i in matches[start:start + per_page]], len(matches), page, per_page)
+
+
+class ProjectSearch:
+    """The current project index and a cache of responses rendered from it"""
+
+    def __init__(self, max_cached: int = 256):
+        """
+        Args:
+            max_cached: Query responses kept in the cache
+        """
+        self.index = ProjectIndex([])
+        self.version = ''
+        self.max_cached = max_cached
+        self._cache: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def rebuild(self, projects: Sequence[Project], version: str) -> None:
+        """
+        Index a new catalogue and drop the responses rendered from the previous one.
+
+        Args:
+            projects: The catalogue, in display order
+            version: Identifier of the catalogue's content, part of every cache key
+        """
+        index = ProjectIndex(projects)
+        with self._lock:
+            self.index, self.version = index, version
+            self._cache.clear()
+
+    def clear(self) -> None:
+        """Drop the rendered responses, e.g. after the images they link to were built."""
+        with self._lock:
+            self._cache.clear()
+
+    def cached(self, key: Hashable, render: Callable[[ProjectIndex], T]) -> T:
+        """
+        Return the cached response for ``key`` or render it from the current index.
+
+        Args:
+            key: Normalized query, including the response format
+            render: Builds the response from the index
+
+        Returns:
+            The response
+        """
+        with self._lock:
+            index, version = self.index, self.version
+            value = self._cache.get((version, key))
+            if value is not None:
+                self._cache.move_to_end((version, key))
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = render(index)
+        with self._lock:
+            if version == self.version:  # not rendered from an index replaced meanwhile
+                self._cache[(version, key)] = value
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'projects': len(self.index.projects), 'terms': len(self.index.terms),
+                    'cached': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
+
+def normalize_query(query: str, tags: Sequence[str]) -> Tuple[str, Tuple[str, ...]]:
+    """Canonical form of a query, so equivalent requests share a cache entry."""
+    return ' '.join(tokenize(query)), tuple(sorted({tag.strip().lower() for tag in tags if tag.strip()}))
+
+
+project_search = ProjectSearch()
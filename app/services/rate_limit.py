@@ -0,0 +1,268 @@
+"""
+Rate limiting and spam throttling for contact submissions.
+
+Submissions pass cheap stateless checks first (an invisible honeypot field
+and a minimum time to fill in the form, proven by a signed timestamp when the
+form is not served by this process), then a per-IP and a global token
+bucket; a submission the global bucket throttles gets its per-IP token back.
+Junk is rejected before any storage or notification work happens.
+
+Buckets live in a bounded in-memory store by default; ``BucketStore`` is the
+interface for a shared backend so limits hold across machines, with a Redis
+implementation used when ``RATE_LIMIT_REDIS_URL`` is set.
+"""
+import hashlib
+import hmac
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from starlette.requests import HTTPConnection
+
+# Header set by the edge proxy with the real client address (Fly.io), trusted over the socket peer
+CLIENT_IP_HEADER = os.getenv('CLIENT_IP_HEADER', 'fly-client-ip').lower()
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Allow bursts of ``capacity`` submissions, refilled evenly over ``period`` seconds"""
+    capacity: float
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+class BucketStore:
+    """Token bucket storage; implementations may be shared between processes and machines"""
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take tokens from a bucket.
+
+        Args:
+            key: Bucket name, e.g. ``ip:203.0.113.7``
+            limit: Capacity and refill of the bucket
+            cost: Tokens to take
+
+        Returns:
+            Whether the tokens were taken and, if not, seconds until they will be available
+        """
+        raise NotImplementedError
+
+    async def refund(self, key: str, limit: Limit, cost: float = 1.0) -> None:
+        """
+        Return tokens taken for a submission that was throttled by another bucket.
+
+        Args:
+            key: Bucket name
+            limit: Capacity and refill of the bucket
+            cost: Tokens to return; a bucket never holds more than its capacity
+        """
+        await self.take(key, limit, -cost)
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process buckets, bounded in number and dropped once idle for ``ttl`` seconds"""
+
+    def __init__(self, max_keys: int = 10000, ttl: float = 3600.0):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        # key -> (tokens, last update), ordered from least to most recently updated
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens = min(limit.capacity, tokens - cost)
+        self._buckets[key] = (tokens, now)
+        # An idle bucket refills completely, so forgetting it after the TTL loses nothing
+        while self._buckets and (len(self._buckets) > self.max_keys
+                                 or now - next(iter(self._buckets.values()))[1] > self.ttl):
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / limit.rate
+
+
+class RedisBucketStore(BucketStore):
+    """Buckets shared by every machine through Redis, updated atomically by a Lua script"""
+
+    SCRIPT = '''
+        local capacity, rate, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        local allowed = 0
+        if tokens >= cost then
+            tokens = math.min(capacity, tokens - cost)
+            allowed = 1
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return {allowed, tostring(tokens)}
+    '''
+
+    def __init__(self, url: str, prefix: str = 'portfolio:ratelimit:'):
+        import redis.asyncio  # optional, only needed when limits are shared between machines
+        self._redis = redis.asyncio.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+        self.prefix = prefix
+
+    async def take(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[self.prefix + key],
+                                             args=[limit.capacity, limit.rate, cost, time.time()])
+        return bool(allowed), 0.0 if allowed else (cost - float(tokens)) / limit.rate
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of checking a submission: ``accepted``, ``throttled`` or ``rejected``"""
+    outcome: str
+    reason: str = ''
+    retry_after: float = 0.0
+
+    @property
+    def accepted(self) -> bool:
+        return self.outcome == 'accepted'
+
+
+class SubmissionGuard:
+    """Decides whether a submission may be processed and counts the outcomes"""
+
+    def __init__(self, store: BucketStore, per_ip: Limit, overall: Limit, min_fill_seconds: float = 3.0):
+        """
+        Args:
+            store: Token bucket storage
+            per_ip: Limit for each client address
+            overall: Limit for all clients together, protecting the instance
+            min_fill_seconds: Submissions sent sooner after the form was shown are treated as bots
+        """
+        self.store = store
+        self.per_ip = per_ip
+        self.overall = overall
+        self.min_fill_seconds = min_fill_seconds
+        # Outcome totals plus one counter per outcome and reason, e.g. "rejected_honeypot"
+        self.counters: Dict[str, int] = {'accepted': 0, 'throttled': 0, 'rejected': 0}
+
+    def _count(self, decision: Decision) -> Decision:
+        self.counters[decision.outcome] += 1
+        if decision.reason:
+            key = f'{decision.outcome}_{decision.reason}'
+            self.counters[key] = self.counters.get(key, 0) + 1
+        return decision
+
+    async def _refund(self, taken: List[Tuple[str, Limit]]) -> None:
+        # A submission the instance had no room for doesn't count against its client
+        for key, limit in taken:
+            try:
+                await self.store.refund(key, limit)
+            except Exception as e:
+                logging.error(f'Rate limit store unavailable, could not refund {key}: {e}')
+
+    async def check(self, client_ip: str, honeypot: str = '', fill_seconds: Optional[float] = None,
+                    require_fill_time: bool = False) -> Decision:
+        """
+        Check a submission, cheapest checks first.
+
+        Args:
+            client_ip: Address of the submitting client
+            honeypot: Value of the hidden field only bots fill in
+            fill_seconds: Seconds between showing the form and submitting it, if known
+            require_fill_time: Reject the submission when ``fill_seconds`` is unknown
+
+        Returns:
+            The decision
+        """
+        if honeypot:
+            return self._count(Decision('rejected', 'honeypot'))
+        if fill_seconds is None and require_fill_time:
+            return self._count(Decision('rejected', 'no_form_token'))
+        if fill_seconds is not None and fill_seconds < self.min_fill_seconds:
+            return self._count(Decision('rejected', 'too_fast'))
+        # Per client first, so a single flooding client can't drain the shared budget
+        taken: List[Tuple[str, Limit]] = []
+        for key, limit in ((f'ip:{client_ip}', self.per_ip), ('global', self.overall)):
+            try:
+                allowed, retry_after = await self.store.take(key, limit)
+            except Exception as e:  # a broken shared backend must not take the contact form down
+                logging.error(f'Rate limit store unavailable, allowing submission: {e}')
+                break
+            if not allowed:
+                await self._refund(taken)
+                return self._count(Decision('throttled', key.split(':')[0], retry_after))
+            taken.append((key, limit))
+        return self._count(Decision('accepted'))
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class FormTimestamps:
+    """Signed timestamps of served forms, so a client can't claim it took longer to fill one in"""
+
+    def __init__(self, secret: bytes, max_age: float = 86400.0):
+        """
+        Args:
+            secret: HMAC key; must be shared by every machine that verifies the tokens
+            max_age: Seconds a token stays valid
+        """
+        self._secret = secret
+        self.max_age = max_age
+
+    def _sign(self, issued: str) -> str:
+        return hmac.new(self._secret, issued.encode('ascii'), hashlib.sha256).hexdigest()[:32]
+
+    def issue(self) -> str:
+        """A token recording the current time, to be sent back with the submission."""
+        issued = str(int(time.time() * 1000))
+        return f'{issued}.{self._sign(issued)}'
+
+    def fill_seconds(self, token: str) -> Optional[float]:
+        """
+        Seconds since a token was issued.
+
+        Args:
+            token: Token as returned by ``issue``
+
+        Returns:
+            The elapsed time, or None if the token is missing, forged or expired
+        """
+        issued, _, signature = token.partition('.')
+        if not issued.isdigit() or not hmac.compare_digest(signature, self._sign(issued)):
+            return None
+        elapsed = time.time() - int(issued) / 1000
+        return elapsed if 0 <= elapsed <= self.max_age else None
+
+
+def client_ip(connection: HTTPConnection) -> str:
+    """Address of the client behind the edge proxy, falling back to the socket peer."""
+    forwarded = connection.headers.get(CLIENT_IP_HEADER)
+    if forwarded:
+        return forwarded.strip()
+    return connection.client.host if connection.client else 'unknown'
+
+
+def _bucket_store() -> BucketStore:
+    url = os.getenv('RATE_LIMIT_REDIS_URL')
+    return RedisBucketStore(url) if url else MemoryBucketStore(max_keys=int(os.getenv('RATE_LIMIT_MAX_KEYS', 10000)))
+
+
+contact_guard = SubmissionGuard(
+    _bucket_store(),
+    per_ip=Limit(float(os.getenv('CONTACT_IP_LIMIT', 5)), float(os.getenv('CONTACT_IP_PERIOD', 600))),
+    overall=Limit(float(os.getenv('CONTACT_GLOBAL_LIMIT', 60)), float(os.getenv('CONTACT_GLOBAL_PERIOD', 60))),
+    min_fill_seconds=float(os.getenv('CONTACT_MIN_FILL_SECONDS', 3)),
+)
+
+# Without a configured secret, tokens are only valid on this machine (workers fork after import and share it)
+contact_form_timestamps = FormTimestamps(os.getenv('CONTACT_FORM_SECRET', '').encode('utf-8') or os.urandom(32))
@@ -4,9 +4,14 @@ AI Engineer Portfolio - Main Application Entry Point
 This file serves as the entry point for the AI Engineer Portfolio application.
 It initializes the NiceGUI framework and starts the web server.
 """
+# Imported first so the startup breakdown separates interpreter start from imports
+from app.core.startup import startup_timer  # noqa: F401
+
 import os
 import sys
 import codecs
+import logging
+from functools import partial
 from dotenv import load_dotenv
 from nicegui import ui
 
@@ -15,22 +20,40 @@ if sys.stdout.encoding != 'utf-8':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
+# Load environment variables from .env file (if present) before the pages read them
+load_dotenv()
+
+# Show the application's own log lines (startup breakdown, warm-up, content reloads) next to uvicorn's
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(levelname)s:     %(message)s')
+
 # Import the page definitions
 import app.main  # noqa: F401
 
-# Load environment variables from .env file (if present)
-load_dotenv()
-
 if __name__ in {"__main__", "__mp_main__"}:
+    from app.core import workers
+
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
+    worker_count = int(os.getenv("WEB_CONCURRENCY", 1))
 
-    ui.run(
+    run = partial(
+        ui.run,
         host=host,
         port=port,
         title="AI Engineer Portfolio",
         favicon="🤖",
         dark=True,
         uvicorn_logging_level='info',
-        reload=False
-    )
\ No newline at end of file
+        reload=False,
+        timeout_graceful_shutdown=workers.DRAIN_TIMEOUT
+    )
+
+    if worker_count > 1:
+        # Render the snapshot once and map it, so the forked workers share one copy
+        app.main.page_snapshot.share()
+        workers.serve(run, worker_count, host, port)
+    else:
+        try:
+            run()
+        except KeyboardInterrupt:
+            pass  # uvicorn re-raises SIGINT once it has drained and shut down
\ No newline at end of file
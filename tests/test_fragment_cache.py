@@ -0,0 +1,66 @@
+"""LRU fragment cache: bounds, recency and counters."""
+from app.core.fragment_cache import FragmentCache
+
+
+def test_get_or_render_renders_once():
+    cache = FragmentCache()
+    calls = []
+
+    def render():
+        calls.append('about')
+        return '<p>about</p>'
+
+    assert cache.get_or_render('about', render) == '<p>about</p>'
+    assert cache.get_or_render('about', render) == '<p>about</p>'
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used_over_entry_limit():
+    cache = FragmentCache(max_entries=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    cache.get('a')
+    cache.put('c', 'C')
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.evictions == 1
+
+
+def test_evicts_over_byte_limit():
+    cache = FragmentCache(max_bytes=10)
+    cache.put('a', 'x' * 6)
+    cache.put('b', 'y' * 6)
+    assert 'a' not in cache and 'b' in cache
+    assert cache.size == 6
+
+
+def test_size_counts_utf8_bytes_and_replacements():
+    cache = FragmentCache()
+    cache.put('a', 'é' * 3)
+    assert cache.size == 6
+    cache.put('a', 'ab')
+    assert (len(cache), cache.size) == (1, 2)
+
+
+def test_oversized_fragment_is_not_cached():
+    cache = FragmentCache(max_bytes=4)
+    cache.put('a', 'small')
+    assert 'a' not in cache and cache.size == 0
+
+
+def test_membership_does_not_count_or_refresh():
+    cache = FragmentCache(max_entries=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert 'a' in cache
+    cache.put('c', 'C')
+    assert 'a' not in cache
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_clear_keeps_counters():
+    cache = FragmentCache()
+    cache.get_or_render('a', lambda: 'A')
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 0, 'bytes': 0,
+                             'max_entries': 64, 'max_bytes': 1024 * 1024}
@@ -0,0 +1,76 @@
+"""Inverted project index and the response cache built on it."""
+from app.models.portfolio import Project
+from app.services.project_search import ProjectIndex, ProjectSearch, normalize_query
+
+
+def project(title, description='', tags=()):
+    return Project(title=title, description=description, image_type='ai', tags=list(tags))
+
+
+PROJECTS = [
+    project('Chatbot', 'Retrieval augmented assistant', ['NLP', 'LLM']),
+    project('Vision Pipeline', 'Image classification with transformers', ['Vision']),
+    project('Transformer Notes', 'Notes on attention', ['NLP']),
+    project('Forecasting', 'Demand forecasting with gradient boosting', ['Tabular']),
+]
+
+
+def titles(page):
+    return [found.title for _, found in page.projects]
+
+
+def test_ranks_by_field_weight_then_catalogue_order():
+    index = ProjectIndex(PROJECTS)
+    # A title match outweighs a description match
+    assert titles(index.search('transformer')) == ['Transformer Notes', 'Vision Pipeline']
+    assert titles(index.search('nlp')) == ['Chatbot', 'Transformer Notes']
+
+
+def test_last_term_matches_as_prefix():
+    index = ProjectIndex(PROJECTS)
+    assert titles(index.search('forec')) == ['Forecasting']
+    assert titles(index.search('fo')) == []
+    # Only the last term is a prefix, earlier ones must match whole
+    assert titles(index.search('demand grad')) == ['Forecasting']
+    assert titles(index.search('dem gradient')) == []
+
+
+def test_all_terms_and_tags_must_match():
+    index = ProjectIndex(PROJECTS)
+    assert titles(index.search('notes attention')) == ['Transformer Notes']
+    assert titles(index.search(tags=['nlp'])) == ['Chatbot', 'Transformer Notes']
+    assert titles(index.search('transformer', tags=['NLP'])) == ['Transformer Notes']
+    assert titles(index.search(tags=['NLP', 'Vision'])) == []
+    assert titles(index.search(tags=['unknown'])) == []
+
+
+def test_pages_through_matches():
+    index = ProjectIndex(PROJECTS)
+    page = index.search(page=2, per_page=3)
+    assert titles(page) == ['Forecasting']
+    assert (page.total, page.pages) == (4, 2)
+    assert index.search('with', page=2, per_page=1).total == 2
+
+
+def test_lists_tags_by_use():
+    assert ProjectIndex(PROJECTS).tags[:2] == [('NLP', 2), ('LLM', 1)]
+
+
+def test_unknown_terms_are_not_cached():
+    index = ProjectIndex(PROJECTS)
+    index.search('nonexistent')
+    index.search('chatbot')
+    assert list(index._rankings) == [('chatbot', True)]
+
+
+def test_rebuild_drops_cached_responses():
+    search = ProjectSearch(max_cached=2)
+    search.rebuild(PROJECTS, 'v1')
+    key = normalize_query(' Chat ', ['NLP', 'nlp'])
+    assert key == ('chat', ('nlp',))
+    render = lambda index: titles(index.search(*key))
+    assert search.cached(key, render) == ['Chatbot']
+    assert search.cached(key, render) == ['Chatbot']
+    search.rebuild(PROJECTS[1:], 'v2')
+    assert search.cached(key, render) == []
+    assert (search.hits, search.misses) == (1, 2)
@@ -0,0 +1,118 @@
+"""Token buckets, submission checks and signed form timestamps."""
+import asyncio
+
+import pytest
+
+from app.services import rate_limit
+from app.services.rate_limit import FormTimestamps, Limit, MemoryBucketStore, SubmissionGuard
+
+
+class Clock:
+    """Stands in for the ``time`` module, advanced by hand"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def take(store, key, limit):
+    return asyncio.run(store.take(key, limit))
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    store, limit = MemoryBucketStore(), Limit(capacity=2, period=60)
+    assert take(store, 'ip:a', limit)[0]
+    assert take(store, 'ip:a', limit)[0]
+    allowed, retry_after = take(store, 'ip:a', limit)
+    assert not allowed and retry_after == pytest.approx(30)
+    clock.now += 30
+    assert take(store, 'ip:a', limit)[0]
+
+
+def test_refund_is_capped_at_capacity(clock):
+    store, limit = MemoryBucketStore(), Limit(capacity=1, period=60)
+    asyncio.run(store.refund('ip:a', limit))
+    assert take(store, 'ip:a', limit)[0]
+    assert not take(store, 'ip:a', limit)[0]
+
+
+def test_store_drops_oldest_and_idle_buckets(clock):
+    store, limit = MemoryBucketStore(max_keys=2, ttl=100), Limit(capacity=1, period=60)
+    for key in ('a', 'b', 'c'):
+        take(store, key, limit)
+    assert len(store) == 2
+    clock.now += 101
+    take(store, 'd', limit)
+    assert len(store) == 1
+
+
+def check(guard, client_ip='203.0.113.7', **kwargs):
+    return asyncio.run(guard.check(client_ip, **kwargs))
+
+
+def test_guard_rejects_bots_before_taking_tokens(clock):
+    store = MemoryBucketStore()
+    guard = SubmissionGuard(store, Limit(5, 60), Limit(50, 60), min_fill_seconds=3)
+    assert check(guard, honeypot='spam').reason == 'honeypot'
+    assert check(guard, fill_seconds=1).reason == 'too_fast'
+    assert check(guard, require_fill_time=True).reason == 'no_form_token'
+    assert len(store) == 0
+    assert check(guard, fill_seconds=5, require_fill_time=True).accepted
+    assert guard.stats() == {'accepted': 1, 'throttled': 0, 'rejected': 3, 'rejected_honeypot': 1,
+                             'rejected_too_fast': 1, 'rejected_no_form_token': 1}
+
+
+def test_guard_throttles_per_client(clock):
+    guard = SubmissionGuard(MemoryBucketStore(), Limit(1, 60), Limit(50, 60))
+    assert check(guard).accepted
+    decision = check(guard)
+    assert (decision.outcome, decision.reason) == ('throttled', 'ip')
+    assert decision.retry_after == pytest.approx(60)
+    assert check(guard, client_ip='198.51.100.1').accepted
+
+
+def test_global_throttle_refunds_client_token(clock):
+    guard = SubmissionGuard(MemoryBucketStore(), Limit(1, 3600), Limit(1, 60))
+    assert check(guard, client_ip='198.51.100.1').accepted
+    assert check(guard).reason == 'global'
+    clock.now += 60
+    # The client's own bucket refills far slower, so only a refunded token lets this through
+    assert check(guard).accepted
+
+
+def test_guard_allows_submissions_when_store_fails(clock):
+    class BrokenStore(MemoryBucketStore):
+        async def take(self, key, limit, cost=1.0):
+            raise ConnectionError('store down')
+
+    assert check(SubmissionGuard(BrokenStore(), Limit(1, 60), Limit(1, 60))).accepted
+
+
+def test_form_timestamps_measure_fill_time(clock):
+    timestamps = FormTimestamps(b'secret', max_age=3600)
+    token = timestamps.issue()
+    clock.now += 4.5
+    assert timestamps.fill_seconds(token) == pytest.approx(4.5)
+    clock.now += 3600
+    assert timestamps.fill_seconds(token) is None
+
+
+def test_form_timestamps_reject_forged_tokens(clock):
+    timestamps = FormTimestamps(b'secret')
+    issued, _, signature = timestamps.issue().partition('.')
+    backdated = str(int(issued) - 60_000)
+    assert timestamps.fill_seconds(f'{backdated}.{signature}') is None
+    assert FormTimestamps(b'other').fill_seconds(f'{issued}.{signature}') is None
+    assert timestamps.fill_seconds('') is None
@@ -0,0 +1,92 @@
+"""Page snapshot validators and content negotiation."""
+import gzip
+from email.utils import formatdate
+
+from fastapi import Request
+
+from app.core.snapshot import PageSnapshot
+
+HTML = '<!DOCTYPE html><html><body>' + 'portfolio ' * 200 + '</body></html>'
+
+
+def request(**headers):
+    return Request({'type': 'http', 'method': 'GET', 'path': '/',
+                    'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()]})
+
+
+def snapshot(html=HTML):
+    renders = []
+
+    def render():
+        renders.append(html)
+        return html
+
+    return PageSnapshot(render), renders
+
+
+def test_builds_once_and_serves_validators():
+    page, renders = snapshot()
+    response = page.response(request())
+    page.response(request())
+    assert len(renders) == 1
+    assert response.status_code == 200
+    assert response.body == HTML.encode()
+    assert response.headers['etag'] == page.etag and page.etag.startswith('"')
+    assert response.headers['last-modified'] == page.last_modified
+    assert response.headers['vary'] == 'Accept-Encoding'
+
+
+def test_etag_follows_content():
+    first, _ = snapshot()
+    second, _ = snapshot(HTML + ' ')
+    first.build()
+    second.build()
+    assert first.etag != second.etag
+    same, _ = snapshot()
+    same.build()
+    assert same.etag == first.etag
+
+
+def test_if_none_match_answers_304():
+    page, _ = snapshot()
+    page.build()
+    for value in (page.etag, f'W/{page.etag}', f'"other", {page.etag}', '*'):
+        response = page.response(request(if_none_match=value))
+        assert response.status_code == 304 and not response.body
+        assert response.headers['etag'] == page.etag
+    assert page.response(request(if_none_match='"other"')).status_code == 200
+
+
+def test_if_modified_since_answers_304():
+    page, _ = snapshot()
+    page.build()
+    assert page.response(request(if_modified_since=page.last_modified)).status_code == 304
+    earlier = formatdate(page.built_at - 60, usegmt=True)
+    assert page.response(request(if_modified_since=earlier)).status_code == 200
+    assert page.response(request(if_modified_since='not a date')).status_code == 200
+
+
+def test_if_none_match_takes_precedence():
+    page, _ = snapshot()
+    page.build()
+    response = page.response(request(if_none_match='"other"', if_modified_since=page.last_modified))
+    assert response.status_code == 200
+
+
+def test_serves_accepted_encoding():
+    page, _ = snapshot()
+    page.build()
+    response = page.response(request(accept_encoding='gzip'))
+    assert response.headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(response.body) == HTML.encode()
+    if page.brotli:
+        assert page.response(request(accept_encoding='gzip, br')).headers['content-encoding'] == 'br'
+    refused = page.response(request(accept_encoding='br;q=0, gzip;q=0'))
+    assert 'content-encoding' not in refused.headers and refused.body == HTML.encode()
+
+
+def test_invalidate_rebuilds():
+    page, renders = snapshot()
+    page.ensure_built()
+    page.invalidate()
+    assert len(renders) == 2
@@ -0,0 +1,13 @@
+"""Cold start of the server, checked against the startup budget."""
+from app.core.startup import DEFAULT_BUDGET_MS, check_budget, measure_cold_start
+
+
+def test_cold_start_reports_every_phase():
+    result = measure_cold_start()
+    for phase in ('interpreter', 'import', 'data', 'routes', 'first_response', 'total'):
+        assert result[phase] >= 0
+    assert 0 < result['ttfb'] <= result['wall']
+
+
+def test_cold_start_is_within_budget():
+    assert check_budget(DEFAULT_BUDGET_MS)
@@ -0,0 +1,27 @@
+"""Content coding negotiation for static files and the page snapshot."""
+import pytest
+
+from app.core.static_files import pick_encoding
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('GZIP', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('br; q=0.0, gzip;q=0.5', 'gzip'),
+    ('gzip;q=0, br;q=0', None),
+    ('*', 'br'),
+    ('*;q=0, gzip', 'gzip'),
+    ('x-gzip, brotli', None),
+    ('gzip;q=abc', None),
+    ('identity', None),
+    ('', None),
+])
+def test_pick_encoding(accept_encoding, expected):
+    assert pick_encoding(accept_encoding, ('br', 'gzip')) == expected
+
+
+def test_pick_encoding_prefers_server_order():
+    assert pick_encoding('br;q=0.1, gzip;q=1', ('br', 'gzip')) == 'br'
+    assert pick_encoding('br, gzip', ('gzip',)) == 'gzip'
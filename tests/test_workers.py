@@ -0,0 +1,51 @@
+"""Routing connections to the worker holding their NiceGUI client."""
+import asyncio
+
+from app.core.workers import WORKER_COOKIE, WorkerCookieMiddleware, sticky_worker
+
+
+def head(*headers: str) -> bytes:
+    return '\r\n'.join(['GET /_nicegui_ws/socket.io/?EIO=4 HTTP/1.1', 'Host: localhost', *headers, '', '']).encode()
+
+
+def test_routes_by_worker_cookie():
+    assert sticky_worker(head(f'Cookie: theme=dark; {WORKER_COOKIE}=2; other=1'), 4) == 2
+    assert sticky_worker(head(f'cookie:{WORKER_COOKIE}=0'), 4) == 0
+
+
+def test_ignores_missing_or_invalid_cookies():
+    assert sticky_worker(head(), 4) is None
+    assert sticky_worker(head('Cookie: theme=dark'), 4) is None
+    assert sticky_worker(head(f'Cookie: {WORKER_COOKIE}=4'), 4) is None
+    assert sticky_worker(head(f'Cookie: {WORKER_COOKIE}=-1'), 4) is None
+    assert sticky_worker(head(f'Cookie: {WORKER_COOKIE}=x'), 4) is None
+    assert sticky_worker(head(f'Cookie: x{WORKER_COOKIE}=1'), 4) is None
+
+
+def test_ignores_cookies_outside_the_headers():
+    request = head('Content-Type: text/plain') + f'Cookie: {WORKER_COOKIE}=1\r\n'.encode()
+    assert sticky_worker(request, 4) is None
+    assert sticky_worker(f'GET /?Cookie: {WORKER_COOKIE}=1 HTTP/1.1\r\n\r\n'.encode(), 4) is None
+
+
+def test_reads_partial_requests():
+    assert sticky_worker(head(f'Cookie: {WORKER_COOKIE}=3')[:-4], 4) == 3
+
+
+def started_headers(response_headers):
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': response_headers})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(WorkerCookieMiddleware(app, 1)({'type': 'http'}, None, send))
+    return sent[0]['headers']
+
+
+def test_middleware_marks_only_nicegui_pages():
+    page = started_headers([(b'X-NiceGUI-Content', b'page')])
+    assert (b'set-cookie', f'{WORKER_COOKIE}=1; Path=/; HttpOnly; SameSite=Lax'.encode()) in page
+    assert started_headers([(b'content-type', b'text/css')]) == [(b'content-type', b'text/css')]